@@ -0,0 +1,70 @@
+/**
+ * eventStream.js - MyCafe Canlı Olay Akışı (SSE)
+ * MyCafe Anayasası Madde 3: UI aptaldır - sadece backend'in bildirdiğini dinler
+ *
+ * Akış: POST /events/ticket (token başlıkta) -> GET /events/stream?ticket=
+ * Bilet tek kullanımlıktır; her yeniden bağlanmada yeni bilet alınır.
+ * Token adres satırına / loglara yazılmaz.
+ */
+
+import axiosInstance from './axiosConfig';
+
+// Bağlantı koparsa yeniden denemeden önce bekleme (ms)
+const RECONNECT_DELAY = 3000;
+
+/**
+ * Canlı akışa bağlanır.
+ *
+ * @param {Object} handlers - { table, invoice, lines, day_state, resync, ready } olay dinleyicileri
+ * @returns {Function} Bağlantıyı kapatan fonksiyon (useEffect cleanup'ında çağrılır)
+ */
+export const connectEventStream = (handlers) => {
+  let source = null;
+  let retryTimer = null;
+  let closed = false;
+
+  const scheduleReconnect = () => {
+    if (closed || retryTimer) return;
+    retryTimer = setTimeout(() => {
+      retryTimer = null;
+      open();
+    }, RECONNECT_DELAY);
+  };
+
+  const open = async () => {
+    try {
+      const response = await axiosInstance.post('/events/ticket');
+      if (closed) return;
+
+      const url = `${axiosInstance.defaults.baseURL}/events/stream?ticket=${encodeURIComponent(response.data.ticket)}`;
+      source = new EventSource(url);
+
+      Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (event) => {
+          handler(event.data ? JSON.parse(event.data) : {});
+        });
+      });
+
+      // Bilet tek kullanımlık: EventSource'un kendi yeniden bağlanması çalışmaz,
+      // akışı kapatıp yeni biletle bağlan
+      source.onerror = () => {
+        source.close();
+        source = null;
+        scheduleReconnect();
+      };
+    } catch (error) {
+      console.error('[MyCafe Events] Akış bileti alınamadı:', error);
+      scheduleReconnect();
+    }
+  };
+
+  open();
+
+  return () => {
+    closed = true;
+    if (retryTimer) clearTimeout(retryTimer);
+    if (source) source.close();
+  };
+};
+
+export default connectEventStream;
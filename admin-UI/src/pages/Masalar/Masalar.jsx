@@ -2,6 +2,7 @@ import React, { useEffect, useState, useCallback, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../../hooks/useAuth";
 import api from "../../api/axiosConfig";
+import { connectEventStream } from "../../api/eventStream";
 
 // MyCafe Premium Tema Renkleri
 const RENK = {
@@ -255,14 +256,26 @@ export default function Masalar({ onOpenAdisyon }) {
     
     loadAllData();
     
-    // Real-time updates için WebSocket veya polling
+    // Canlı akış: masa / adisyon değişince backend bildirir, UI yeniden çeker
+    const disconnect = connectEventStream({
+      ready: () => loadMasaDurumlari(),       // (yeniden) bağlanınca kaçanları al
+      table: () => loadMasaDurumlari(),
+      invoice: () => loadMasaDurumlari(),
+      day_state: () => loadGunDurumu(),
+      resync: () => loadAllData()
+    });
+    
+    // Akış kopuksa yedek olarak seyrek polling
     const interval = setInterval(() => {
       if (document.visibilityState === 'visible') {
         loadMasaDurumlari();
       }
-    }, 10000); // 10 saniyede bir güncelle
+    }, 60000); // 60 saniyede bir güncelle
     
-    return () => clearInterval(interval);
+    return () => {
+      disconnect();
+      clearInterval(interval);
+    };
   }, [user, loadGunDurumu, loadMasalar, loadMasaDurumlari]);
 
   // --------------------------------------------------
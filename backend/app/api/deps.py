@@ -11,14 +11,16 @@ Bu modül:
 from typing import Optional, AsyncGenerator, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from asyncpg import create_pool, Connection
 from jose import JWTError
 import asyncpg
 import logging
 
 from app.core.config import settings
 from app.core.security import decode_access_token
-from app.core.exceptions import PermissionDenied, ResourceNotFound
+from app.core.exceptions import PermissionDenied, ResourceNotFound, ServiceUnavailable
+from app.db.pool import create_db_pool, pooled_connection
+from app.db.lazy import LazyConnection
+from app.cache.user_cache import get_cached_user, cache_user, user_cache_generation
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +35,16 @@ _db_pool = None
 
 
 async def get_db_pool():
-    """Veritabanı bağlantı havuzunu oluşturur veya var olanı döner"""
+    """
+    Veritabanı bağlantı havuzunu oluşturur veya var olanı döner
+    
+    Not:
+        Havuz boyutları ve zaman aşımları Settings'ten gelir (DB_POOL_*)
+    """
     global _db_pool
     if _db_pool is None:
         try:
-            _db_pool = await create_pool(
-                settings.DATABASE_URL,
-                min_size=5,
-                max_size=20,
-                command_timeout=60,
-                max_inactive_connection_lifetime=300
-            )
+            _db_pool = await create_db_pool()
             logger.info("Database connection pool created")
         except Exception as e:
             logger.error(f"Failed to create database pool: {e}")
@@ -51,7 +52,21 @@ async def get_db_pool():
     return _db_pool
 
 
-async def get_db_connection() -> AsyncGenerator[Connection, None]:
+def peek_db_pool():
+    """Havuz oluşturulmuşsa döner, değilse None (oluşturmaz)"""
+    return _db_pool
+
+
+async def close_db_pool() -> None:
+    """Havuzu kapatır (uygulama kapanışında)"""
+    global _db_pool
+    if _db_pool is not None:
+        pool, _db_pool = _db_pool, None
+        await pool.close()
+        logger.info("Database connection pool closed")
+
+
+async def get_db_connection() -> AsyncGenerator[LazyConnection, None]:
     """
     Veritabanı bağlantısı sağlar.
     
@@ -60,41 +75,27 @@ async def get_db_connection() -> AsyncGenerator[Connection, None]:
             # conn kullan
     
     Not:
-        - Her istek için yeni bir bağlantı alınır
-        - İşlem bitince bağlantı havuza geri verilir
-        - Transaction yönetimi repository'de yapılır
+        - Bağlantı tembel alınır: havuzdan ilk SQL çağrısında çekilir
+        - Önbellekten cevaplanan veya yetki hatasıyla biten istek
+          havuzdan bağlantı harcamaz
+        - Havuz DB_POOL_ACQUIRE_TIMEOUT içinde bağlantı veremezse 503 döner
+        - İşlem bitince (alınmışsa) bağlantı havuza geri verilir
+        - Transaction kapsamı service'lerde unit_of_work ile açılır
     """
     pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        try:
-            yield conn
-        finally:
-            # Bağlantı otomatik olarak havuza döner
-            pass
+    conn = LazyConnection(pool)
+    try:
+        yield conn
+    finally:
+        await conn.release()
 
 
-async def get_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    conn: Connection = Depends(get_db_connection)
-) -> Dict[str, Any]:
+def _decode_token(token: Optional[str]) -> Dict[str, Any]:
     """
-    Mevcut kullanıcıyı getirir.
-    
-    Kullanımı:
-        async def endpoint(current_user = Depends(get_current_user)):
-            # current_user['id'] kullan
-    
-    Returns:
-        {
-            'id': int,
-            'username': str,
-            'role': str,  # SYS, ADMIN, GARSON, MUTFAK
-            'full_name': str
-        }
+    Token'ı çözer ve payload'ı döner.
     
     Raises:
-        HTTPException 401: Token yoksa veya geçersizse
-        HTTPException 404: Kullanıcı bulunamazsa
+        HTTPException 401: Token yoksa, geçersizse veya kullanıcı ID'si yoksa
     """
     if not token:
         raise HTTPException(
@@ -112,50 +113,126 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token'da kullanıcı ID'si yok",
         )
     
+    return payload
+
+
+async def get_current_user(
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """
+    Mevcut kullanıcıyı getirir.
+    
+    Kullanımı:
+        async def endpoint(current_user = Depends(get_current_user)):
+            # current_user['id'] kullan
+    
+    Returns:
+        {
+            'id': int,
+            'username': str,
+            'role': str,  # SYS, ADMIN, GARSON, MUTFAK
+            'full_name': str
+        }
+    
+    Raises:
+        HTTPException 401: Token yoksa veya geçersizse
+        HTTPException 404: Kullanıcı bulunamazsa
+    
+    Not:
+        - Kullanıcı satırı önbellekten gelir (bkz. app.cache.user_cache)
+        - Önbellekte yoksa DB'den okunup yazılır (okuma sürerken önbellek
+          temizlendiyse yazılmaz)
+        - Havuzdan bağlantı sadece önbellek ıskalanınca ve token geçerliyse alınır;
+          endpoint'in kendi bağlantısına bağımlı değildir
+    """
+    payload = _decode_token(token)
+    user_id = int(payload["sub"])
+    
+    cached = get_cached_user(user_id)
+    if cached:
+        return cached
+    
+    # Okuma sürerken rol / aktiflik değişirse eski satır önbelleğe yazılmaz
+    generation = user_cache_generation()
+    
     # Kullanıcıyı veritabanından getir
     try:
-        # app_user tablosundan kullanıcı bilgilerini al
-        user_row = await conn.fetchrow(
-            """
-            SELECT 
-                u.id, 
-                u.username, 
-                u.full_name, 
-                r.role_name as role,
-                u.is_active
-            FROM app_user u
-            JOIN role r ON u.role_id = r.id
-            WHERE u.id = $1 AND u.is_active = true
-            """,
-            int(user_id)
-        )
-        
-        if not user_row:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Kullanıcı bulunamadı veya aktif değil"
+        pool = await get_db_pool()
+        async with pooled_connection(pool) as conn:
+            # app_user tablosundan kullanıcı bilgilerini al
+            user_row = await conn.fetchrow(
+                """
+                SELECT 
+                    u.id, 
+                    u.username, 
+                    u.full_name, 
+                    r.role_name as role,
+                    u.is_active
+                FROM app_user u
+                JOIN role r ON u.role_id = r.id
+                WHERE u.id = $1 AND u.is_active = true
+                """,
+                user_id
             )
-        
-        return dict(user_row)
-        
+    except ServiceUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Kullanıcı bilgisi alınamadı"
         )
+    
+    if not user_row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kullanıcı bulunamadı veya aktif değil"
+        )
+    
+    user = dict(user_row)
+    cache_user(user, generation)
+    return user
+
+
+async def get_token_user(
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """
+    Kullanıcıyı token'daki claim'lerden getirir (salt okuma endpoint'leri için).
+    
+    Kullanımı:
+        async def endpoint(current_user = Depends(get_token_user)):
+            # current_user['id'], current_user['role'] kullan
+    
+    Not:
+        - AUTH_TRUST_TOKEN_ROLE açıksa DB'ye hiç gidilmez;
+          rol, create_access_token'ın token'a yazdığı 'role' claim'inden okunur
+        - Rol değişikliği token süresi dolana kadar yansımaz, bu yüzden
+          yazma işlemlerinde get_current_user kullanılmalıdır
+        - Ayar kapalıysa veya token'da rol yoksa get_current_user'a düşer
+    """
+    payload = _decode_token(token)
+    role = payload.get("role")
+    
+    if not settings.AUTH_TRUST_TOKEN_ROLE or not role:
+        return await get_current_user(token)
+    
+    return {
+        'id': int(payload["sub"]),
+        'username': None,
+        'role': role,
+        'full_name': None
+    }
 
 
 async def get_optional_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    conn: Connection = Depends(get_db_connection)
+    token: Optional[str] = Depends(oauth2_scheme)
 ) -> Optional[Dict[str, Any]]:
     """
     Mevcut kullanıcıyı getirir (opsiyonel).
@@ -170,12 +247,12 @@ async def get_optional_current_user(
         return None
     
     try:
-        return await get_current_user(token, conn)
+        return await get_current_user(token)
     except HTTPException:
         return None
 
 
-def require_roles(allowed_roles: list):
+def require_roles(allowed_roles: list, trust_token: bool = False):
     """
     Belirli rolleri zorunlu kılan dependency.
     
@@ -188,12 +265,16 @@ def require_roles(allowed_roles: list):
     
     Args:
         allowed_roles: İzin verilen roller listesi
+        trust_token: True ise kullanıcı get_token_user ile alınır
+            (salt okuma endpoint'leri için, bkz. AUTH_TRUST_TOKEN_ROLE)
     
     Returns:
         Dependency function
     """
+    user_dependency = get_token_user if trust_token else get_current_user
+    
     async def role_checker(
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: Dict[str, Any] = Depends(user_dependency)
     ) -> Dict[str, Any]:
         from app.core.security import check_permission
         
@@ -9,6 +9,11 @@ from . import invoice
 from . import payment
 from . import customer
 from . import report
+from . import system
+from . import health
+from . import events
+from . import dashboard
+from . import catalog
 
 __all__ = [
     "auth",
@@ -16,5 +21,10 @@ __all__ = [
     "invoice",
     "payment",
     "customer",
-    "report"
+    "report",
+    "system",
+    "health",
+    "events",
+    "dashboard",
+    "catalog"
 ]
\ No newline at end of file
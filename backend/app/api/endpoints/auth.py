@@ -2,12 +2,14 @@
 MyCafe - Kimlik Doğrulama Endpoint'leri
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
+from typing import Optional
 from asyncpg import Connection
 
-from app.api.deps import get_db_connection
+from app.api.deps import get_db_connection, require_admin
+from app.cache.user_cache import invalidate_user, notify_user_invalidation
 from app.core.security import create_access_token, verify_password
 from app.core.config import settings
 
@@ -85,4 +87,30 @@ async def test_login():
         "user_id": 1,
         "full_name": "Test Admin",
         "role": "ADMIN"
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/cache/invalidate")
+async def invalidate_user_cache(
+    user_id: Optional[int] = Query(None, description="Kullanıcı ID (boşsa tümü)"),
+    current_user: dict = Depends(require_admin),
+    conn: Connection = Depends(get_db_connection)
+):
+    """
+    Kullanıcı önbelleğini temizler - Sadece ADMIN
+    
+    Kullanıcıya anlatımı:
+        "Rolü veya aktifliği değişen kullanıcı bir sonraki istekte
+        DB'den tekrar okunur."
+    
+    Not:
+        - DB tetikleyicisi (NOTIFY) kuruluysa normalde gerekmez
+        - Bu süreçteki önbelleği temizler, diğer worker'lara NOTIFY ile duyurur
+    """
+    invalidate_user(user_id)
+    await notify_user_invalidation(conn, user_id)
+    return {
+        "success": True,
+        "user_id": user_id,
+        "message": "Kullanıcı önbelleği temizlendi"
+    }
@@ -0,0 +1,57 @@
+"""
+MyCafe - Ürün Kataloğu API Endpoint'leri
+
+Bu endpoint'ler:
+- /catalog: Ürünler, fiyatlar ve kategoriler tek yanıtta, katalog sürümüyle
+- ETag katalog sürümüdür; UI If-None-Match gönderirse değişmemiş katalog
+  için gövdesiz 304 döner
+"""
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.api.deps import get_token_user, get_db_connection
+from app.repositories.catalog_repository import CatalogRepository
+from app.core.etag import conditional_json_response
+
+router = APIRouter()
+
+
+@router.get("", response_model=dict)
+async def get_catalog(
+    request: Request,
+    include_inactive: bool = Query(False, description="Satışa kapalı ürünleri de getir (stok yönetimi için)"),
+    current_user: dict = Depends(get_token_user),
+    conn = Depends(get_db_connection)
+):
+    """
+    Ürün kataloğu - Herkes görebilir
+
+    Kullanıcıya anlatımı:
+        "Sipariş ekranı menüyü sadece değiştiyse yeniden indirir."
+
+    Örnek kullanım:
+        GET /catalog
+        If-None-Match: W/"catalog-42"   ->  304 Not Modified
+
+    Returns:
+        {
+            "version": 42,
+            "products": [
+                {"id": 3, "product_name": "Çay", "category_id": 1,
+                 "category_name": "Sıcak İçecekler", "sale_price": 15.00, "is_active": true}
+            ],
+            "categories": [{"id": 1, "category_name": "Sıcak İçecekler"}]
+        }
+
+    Not:
+        - Katalog bellekteyse bağlantı havuzundan bağlantı bile alınmaz
+    """
+    snapshot = await CatalogRepository(conn).get_catalog()
+    etag = snapshot.etag
+    if include_inactive:
+        etag = etag[:-1] + '-all"'
+    return conditional_json_response(
+        request,
+        snapshot.as_dict(include_inactive=include_inactive),
+        etag=etag
+    )
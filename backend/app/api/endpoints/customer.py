@@ -99,59 +99,59 @@ async def update_customer(
     )
 
 
-@router.get("/customers/{customer_id}", response_model=CustomerResponse)
-async def get_customer(
-    customer_id: int,
+@router.get("/customers/search", response_model=List[CustomerResponse])
+async def search_customers(
+    q: str = Query(..., description="Arama terimi (isim veya telefon)"),
+    include_inactive: bool = Query(False, description="Pasif müşterileri dahil et"),
     current_user: dict = Depends(get_current_user),
     conn = Depends(get_db_connection)
 ):
     """
-    Müşteri detayını getirir.
+    Müşteri ara.
     
     Kullanıcıya anlatımı:
-        "Müşteri #{customer_id} detayını getiriyorum."
+        "{q} ile eşleşen müşterileri arıyorum."
     
-    Returns:
-        - Müşteri bilgileri
-        - Güncel borç durumu
+    Örnek kullanım:
+        GET /customers/search?q=Ahmet
+        GET /customers/search?q=555123
     """
     customer_repo = CustomerRepository(conn)
     day_repo = DayRepository(conn)
     invoice_repo = InvoiceRepository(conn)
     service = CustomerService(customer_repo, day_repo, invoice_repo)
     
-    return await service.get_customer(
-        customer_id=customer_id,
-        current_user_role=current_user['role']
+    return await service.find_customers(
+        search_term=q,
+        current_user_role=current_user['role'],
+        include_inactive=include_inactive
     )
 
 
-@router.get("/customers/search", response_model=List[CustomerResponse])
-async def search_customers(
-    q: str = Query(..., description="Arama terimi (isim veya telefon)"),
-    include_inactive: bool = Query(False, description="Pasif müşterileri dahil et"),
+@router.get("/customers/{customer_id}", response_model=CustomerResponse)
+async def get_customer(
+    customer_id: int,
     current_user: dict = Depends(get_current_user),
     conn = Depends(get_db_connection)
 ):
     """
-    Müşteri ara.
+    Müşteri detayını getirir.
     
     Kullanıcıya anlatımı:
-        "{q} ile eşleşen müşterileri arıyorum."
+        "Müşteri #{customer_id} detayını getiriyorum."
     
-    Örnek kullanım:
-        GET /customers/search?q=Ahmet
-        GET /customers/search?q=555123
+    Returns:
+        - Müşteri bilgileri
+        - Güncel borç durumu
     """
     customer_repo = CustomerRepository(conn)
     day_repo = DayRepository(conn)
     invoice_repo = InvoiceRepository(conn)
     service = CustomerService(customer_repo, day_repo, invoice_repo)
     
-    return await service.find_customers(
-        search_term=q,
-        current_user_role=current_user['role'],
-        include_inactive=include_inactive
+    return await service.get_customer(
+        customer_id=customer_id,
+        current_user_role=current_user['role']
     )
 
 
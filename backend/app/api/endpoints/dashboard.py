@@ -0,0 +1,41 @@
+"""
+MyCafe - Ana Ekran API Endpoint'leri
+
+Bu endpoint'ler:
+- /dashboard: Gün durumu, masalar, açık adisyonlar ve bugünün özeti tek yanıtta
+- ETag taşır; UI If-None-Match gönderirse değişmemiş ekran için gövdesiz 304 döner
+"""
+
+from fastapi import APIRouter, Depends, Request
+
+from app.api.deps import get_token_user, get_db_connection
+from app.repositories.day_repository import DayRepository
+from app.services.dashboard_service import DashboardService
+from app.core.etag import conditional_json_response
+
+router = APIRouter()
+
+
+@router.get("", response_model=dict)
+async def get_dashboard(
+    request: Request,
+    current_user: dict = Depends(get_token_user),
+    conn = Depends(get_db_connection)
+):
+    """
+    Ana ekran verisi - Herkes görebilir (özet sadece ADMIN'e)
+
+    Kullanıcıya anlatımı:
+        "Ana ekranı 30 saniyede bir tek istekle yeniliyorum;
+        hiçbir şey değişmediyse sunucu sadece 'aynı' der."
+
+    Örnek kullanım:
+        GET /dashboard
+        If-None-Match: W/"3f2a..."   ->  304 Not Modified
+
+    Not:
+        - Önbellek güncelse bağlantı havuzundan bağlantı bile alınmaz
+    """
+    service = DashboardService(DayRepository(conn))
+    dashboard = await service.get_dashboard(current_user['role'])
+    return conditional_json_response(request, dashboard)
@@ -9,7 +9,7 @@ from fastapi import APIRouter
 
 router = APIRouter()
 
-from app.api.deps import get_current_user, get_db_connection
+from app.api.deps import get_current_user, get_token_user, get_db_connection
 from app.repositories.day_repository import DayRepository
 from app.services.day_service import DayService
 from app.models.domain import DayMarkerResponse, DaySnapshotResponse, DayStatusResponse
@@ -21,7 +21,7 @@ from app.core.security import check_permission
 
 @router.get("/status", response_model=DayStatusResponse)
 async def get_day_status(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_token_user),
     conn = Depends(get_db_connection)
 ):
     """Gün durumu - Herkes görebilir"""
@@ -68,7 +68,7 @@ async def close_day(
 
 @router.get("/current", response_model=Optional[DayMarkerResponse])
 async def get_current_day(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_token_user),
     conn = Depends(get_db_connection)
 ):
     """Açık olan günü getir"""
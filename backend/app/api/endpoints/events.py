@@ -0,0 +1,154 @@
+"""
+MyCafe - Canlı Olay Akışı API Endpoint'leri
+
+Bu endpoint'ler:
+- /events/ticket: Akışa bağlanmak için kısa ömürlü, tek kullanımlık bilet verir
+- /events/stream: Masa doluluğu, adisyon ve gün durumu değişikliklerini
+  Server-Sent Events (SSE) olarak iter
+
+Tabletler masaları / adisyonları periyodik sorgulamak yerine bu akışa
+bağlanır. Olaylar süreçteki tek LISTEN bağlantısından dağıtılır; bağlı
+tablet sayısı DB'ye ek yük getirmez.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict
+import asyncio
+import hashlib
+import json
+import secrets
+
+from app.api.deps import get_db_connection, get_db_pool, get_token_user
+from app.core.config import settings
+from app.core.events import event_broker, is_closed_event
+from app.db.pool import pooled_connection
+
+router = APIRouter()
+
+# Bağlantıyı proxy'lerde açık tutmak için yorum satırı aralığı (saniye)
+KEEPALIVE_INTERVAL = 15.0
+
+
+def _hash_ticket(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode("utf-8")).hexdigest()
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+async def _event_stream(request: Request, queue: asyncio.Queue) -> AsyncIterator[str]:
+    try:
+        # Bağlanır bağlanmaz: UI ilk durumu REST'ten çekip bundan sonrasını dinler
+        yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            if is_closed_event(event):
+                break
+            yield _format_event(event)
+    finally:
+        event_broker.unsubscribe(queue)
+
+
+@router.post("/ticket")
+async def create_stream_ticket(
+    current_user: dict = Depends(get_token_user),
+    conn = Depends(get_db_connection)
+):
+    """
+    Canlı akış bileti verir (token Authorization başlığında).
+
+    Kullanıcıya anlatımı:
+        "Tarayıcı akışa bağlanırken token'ı adres satırına yazmaz;
+        bunun yerine birkaç saniyelik, tek kullanımlık bir bilet kullanır."
+
+    Returns:
+        {
+            "ticket": "...",          # /events/stream?ticket= ile kullanılır
+            "expires_at": datetime    # EVENT_STREAM_TICKET_TTL saniye sonra
+        }
+
+    Not:
+        - Bilet bir kez kullanılabilir; her (yeniden) bağlanmada yeni bilet alınır
+        - DB'de biletin kendisi değil özeti tutulur
+    """
+    ticket = secrets.token_urlsafe(32)
+    expires_at = await conn.fetchval(
+        "SELECT issue_stream_ticket($1, $2, $3, $4)",
+        _hash_ticket(ticket),
+        current_user['id'],
+        current_user['role'],
+        settings.EVENT_STREAM_TICKET_TTL
+    )
+    return {"ticket": ticket, "expires_at": expires_at}
+
+
+async def _consume_ticket(ticket: str) -> Dict[str, Any]:
+    """
+    Bileti tüketip sahibini döner.
+
+    Not:
+        - Bağlantı akış boyunca tutulmaz; bilet kontrolünden hemen sonra havuza döner
+
+    Raises:
+        HTTPException 401: Bilet geçersiz, süresi dolmuş veya kullanılmışsa
+    """
+    pool = await get_db_pool()
+    async with pooled_connection(pool) as conn:
+        row = await conn.fetchrow(
+            "SELECT * FROM consume_stream_ticket($1)",
+            _hash_ticket(ticket)
+        )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Akış bileti geçersiz veya süresi dolmuş"
+        )
+    return {"id": row['user_id'], "role": row['role']}
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    ticket: str = Query(..., description="POST /events/ticket ile alınan tek kullanımlık bilet")
+):
+    """
+    Canlı olay akışı (SSE).
+
+    Kullanıcıya anlatımı:
+        "Masa açıldı / kapandı, adisyona ürün eklendi, gün kapandı;
+        ekran kendiliğinden güncellenir."
+
+    Olaylar:
+        event: table      data: {"table_id": 4, "occupied": true, "invoice_id": 812}
+        event: invoice    data: {"invoice_id": 812, "table_id": 4, "status": "OPEN",
+                                   "total_amount": 245.00, "line_count": 6}
+        event: lines      data: {"invoice_id": 812}
+        event: day_state  data: {"day_id": 57}
+        event: resync     data: {}   # bildirim kaçmış olabilir, ekranı yeniden yükle
+
+    Not:
+        - JWT adreste taşınmaz: önce POST /events/ticket ile bilet alınır
+        - Bilet tek kullanımlıktır; istemci her yeniden bağlanmada yeni bilet
+          almalıdır (EventSource'un kendi yeniden bağlanması aynı bileti kullanır
+          ve 401 alır)
+        - Yetişemeyen istemcinin akışı kapatılır
+    """
+    await _consume_ticket(ticket)
+
+    queue = event_broker.subscribe()
+    return StreamingResponse(
+        _event_stream(request, queue),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,82 @@
+"""
+MyCafe - Sağlık Kontrolü API Endpoint'leri
+
+Bu endpoint'ler:
+- /health/live: Süreç ayakta mı? (DB'ye gitmez)
+- /health/ready: İstek almaya hazır mı? (ısınma, DB sondası, havuz doluluğu, önbellekler)
+
+Yük dengeleyici /health/ready 503 dönen worker'a istek göndermez.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.api.deps import peek_db_pool
+from app.core.config import settings
+from app.core.lifecycle import warmup_state, get_cache_status
+from app.db.pool import get_pool_stats
+from app.db.probe import database_probe
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def liveness():
+    """
+    Canlılık kontrolü.
+
+    Not:
+        - Hiçbir bağımlılığa bakmaz; süreç cevap veriyorsa 200 döner
+    """
+    return {"status": "alive", "service": "MyCafe"}
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Hazırlık kontrolü.
+
+    Hazır sayılma şartları:
+        - Açılış ısınması bitmiş olmalı
+        - `SELECT 1` sondası zaman aşımı içinde dönmeli (sonuç kısa süre önbellekli)
+        - Havuz doluluğu HEALTH_MAX_POOL_SATURATION'ın altında olmalı
+
+    Returns:
+        200 veya 503, gövde:
+        {
+            "status": "ready" | "not_ready",
+            "checks": {
+                "warmup": {...},
+                "database": {"ok": true, "latency_ms": 1.2, "cached": true},
+                "latency_ms": {"p50": ..., "p95": ..., "p99": ...},
+                "pool": {"in_use": 3, "max_size": 20, "saturation": 0.15, ...},
+                "caches": {"day_state": true, ...}
+            }
+        }
+    """
+    pool = peek_db_pool()
+    pool_stats = get_pool_stats(pool)
+    database = await database_probe.check(pool)
+    pool_saturated = pool_stats["saturation"] >= settings.HEALTH_MAX_POOL_SATURATION
+
+    ready = warmup_state.ready and database["ok"] and not pool_saturated
+
+    body = {
+        "status": "ready" if ready else "not_ready",
+        "service": "MyCafe",
+        "checks": {
+            "warmup": warmup_state.as_dict(),
+            "database": database,
+            "latency_ms": database_probe.latency_percentiles(),
+            "pool": {
+                "in_use": pool_stats["in_use"],
+                "idle": pool_stats["idle"],
+                "max_size": pool_stats["max_size"],
+                "saturation": pool_stats["saturation"],
+                "saturated": pool_saturated,
+                "acquire_timeouts": pool_stats["acquire"]["timeouts"]
+            },
+            "caches": get_cache_status()
+        }
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
@@ -13,12 +13,60 @@ router = APIRouter()
 from app.api.deps import get_current_user, get_db_connection
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.day_repository import DayRepository
+from app.repositories.catalog_repository import CatalogRepository
 from app.services.invoice_service import InvoiceService
 from app.models.domain import (
     InvoiceResponse, 
     InvoiceLineResponse, 
     TableResponse,
-    InvoiceSummaryResponse
+    InvoiceSummaryResponse,
+    InvoiceLinesBatchRequest,
+    InvoiceLinesBatchResponse
 )
 from app.core.exceptions import ResourceNotFound
 
+
+@router.post(
+    "/invoices/{invoice_id}/lines/batch",
+    response_model=InvoiceLinesBatchResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def add_invoice_lines(
+    invoice_id: int,
+    request: InvoiceLinesBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    conn = Depends(get_db_connection)
+):
+    """
+    Adisyona toplu sipariş ekler.
+    
+    Kullanıcıya anlatımı:
+        "Garsonun aldığı siparişin tüm kalemlerini tek istekte ekliyorum."
+    
+    Örnek kullanım:
+        POST /invoices/5/lines/batch
+        {
+            "lines": [
+                {"product_id": 3, "quantity": 2},
+                {"product_id": 7, "quantity": 1, "note": "Şekersiz"}
+            ]
+        }
+    
+    Not:
+        - Gün ve adisyon kontrolü bir kez yapılır
+        - Ürünler bellekteki katalogdan doğrulanır; geçersiz ürün DB'ye gitmeden reddedilir
+        - Tüm satırlar tek sorguda eklenir: biri hata verirse hiçbiri eklenmez
+        - Yanıtta her satırın sonucu ve adisyonun yeni toplamı döner
+    """
+    invoice_repo = InvoiceRepository(conn)
+    day_repo = DayRepository(conn)
+    catalog_repo = CatalogRepository(conn)
+    service = InvoiceService(invoice_repo, day_repo, catalog_repo)
+    
+    return await service.add_lines(
+        invoice_id=invoice_id,
+        lines=request.lines,
+        current_user_id=current_user['id'],
+        current_user_role=current_user['role']
+    )
+
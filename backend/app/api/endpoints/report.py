@@ -13,20 +13,24 @@ UI asla hesap yapmaz, sadece gösterir.
 """
 
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import date, timedelta
 from decimal import Decimal
 
-from app.api.deps import get_current_user, get_db_connection, require_admin
+from app.api.deps import get_current_user, get_db_connection, get_db_pool, require_admin
+from app.db.pool import pooled_connection
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.day_repository import DayRepository
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.customer_repository import CustomerRepository
 from app.services.report_service import ReportService
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
 from app.models.domain import (
     DailySalesReportResponse,
     ProductSalesReportResponse,
-    FinanceTransactionResponse
+    FinanceTransactionPageResponse,
+    CategorySalesReportResponse
 )
 
 router = APIRouter()
@@ -134,7 +138,8 @@ async def get_product_sales_report(
         GET /reports/product-sales?start_date=2024-01-01&end_date=2024-01-31&category_id=5
     
     Not:
-        - Maksimum 1 yıllık rapor alınabilir
+        - Aralık sınırı yok; rapor gün × ürün özetinden toplanır
+        - Kapalı (ödenmiş) adisyonlar sayılır
         - Tarihler ters girilirse otomatik düzeltilir
     """
     payment_repo = PaymentRepository(conn)
@@ -151,10 +156,11 @@ async def get_product_sales_report(
     )
 
 
-@router.get("/reports/category-sales", response_model=List[dict])
+@router.get("/reports/category-sales", response_model=List[CategorySalesReportResponse])
 async def get_category_sales_report(
     start_date: date = Query(..., description="Başlangıç tarihi"),
     end_date: date = Query(..., description="Bitiş tarihi"),
+    top_n: int = Query(5, description="Kategori başına en çok satan ürün sayısı", ge=0, le=50),
     current_user: dict = Depends(require_admin),
     conn = Depends(get_db_connection)
 ):
@@ -163,7 +169,15 @@ async def get_category_sales_report(
     
     Kullanıcıya anlatımı:
         "Kategori bazlı satış raporunu getiriyorum:
-        - Hangi kategoriden ne kadar satılmış"
+        - Hangi kategoriden ne kadar satılmış
+        - Her kategoride en çok satan ürünler"
+    
+    Örnek kullanım:
+        GET /reports/category-sales?start_date=2024-01-01&end_date=2024-01-31
+        GET /reports/category-sales?start_date=2024-01-01&end_date=2024-01-31&top_n=3
+    
+    Not:
+        - Kapanmış günlerden oluşan aralıklar önbellekten döner
     """
     payment_repo = PaymentRepository(conn)
     day_repo = DayRepository(conn)
@@ -174,19 +188,20 @@ async def get_category_sales_report(
     return await service.get_category_sales_report(
         user_role=current_user['role'],
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        top_n=top_n
     )
 
 
 # ==================== FİNANS RAPORLARI ====================
 
-@router.get("/reports/finance-transactions", response_model=List[FinanceTransactionResponse])
+@router.get("/reports/finance-transactions", response_model=FinanceTransactionPageResponse)
 async def get_finance_transactions(
     start_date: Optional[date] = Query(None, description="Başlangıç tarihi"),
     end_date: Optional[date] = Query(None, description="Bitiş tarihi"),
     transaction_type: Optional[str] = Query(None, description="İşlem tipi: SALES, PAYMENT, DEBT, EXPENSE"),
-    limit: int = Query(100, description="Maksimum kayıt", ge=1, le=1000),
-    offset: int = Query(0, description="Atlanacak kayıt", ge=0),
+    limit: int = Query(100, description="Sayfa başına kayıt", ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor"),
     current_user: dict = Depends(require_admin),
     conn = Depends(get_db_connection)
 ):
@@ -203,10 +218,12 @@ async def get_finance_transactions(
     Örnek kullanım:
         GET /reports/finance-transactions?start_date=2024-01-01&end_date=2024-01-31
         GET /reports/finance-transactions?transaction_type=SALES&limit=50
+        GET /reports/finance-transactions?cursor=<next_cursor>
     
     Not:
         - Tarih verilmezse son 30 gün
-        - Sayfalama için limit/offset kullanılır
+        - Sıralama yeniden eskiye; sonraki sayfa için yanıttaki `next_cursor`
+          aynı filtrelerle `cursor` olarak gönderilir (son sayfada None)
     """
     payment_repo = PaymentRepository(conn)
     day_repo = DayRepository(conn)
@@ -220,7 +237,60 @@ async def get_finance_transactions(
         end_date=end_date,
         transaction_type=transaction_type,
         limit=limit,
-        offset=offset
+        cursor=cursor
+    )
+
+
+@router.get("/reports/finance-transactions/export")
+async def export_finance_transactions(
+    start_date: Optional[date] = Query(None, description="Başlangıç tarihi"),
+    end_date: Optional[date] = Query(None, description="Bitiş tarihi"),
+    transaction_type: Optional[str] = Query(None, description="İşlem tipi: SALES, PAYMENT, DEBT, EXPENSE"),
+    format: str = Query("csv", description="Çıktı formatı: csv, ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(False, description="Çıktıyı gzip'le"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Finans hareketlerini dosya olarak indirir (muhasebe için).
+    
+    Kullanıcıya anlatımı:
+        "Seçtiğin aralıktaki tüm finans hareketlerini CSV (veya NDJSON)
+        dosyası olarak hazırlıyorum; dosya indikçe oluşuyor."
+    
+    Örnek kullanım:
+        GET /reports/finance-transactions/export?start_date=2024-01-01&end_date=2024-12-31
+        GET /reports/finance-transactions/export?format=ndjson&gzip=true
+    
+    Not:
+        - Filtreler /reports/finance-transactions ile aynı (tarih yoksa son 30 gün)
+        - Satırlar sunucu taraflı imleçle okunur; aralık ne kadar büyük
+          olursa olsun bellek kullanımı sabittir
+        - Akış kendi bağlantısını havuzdan alır ve bitince bırakır
+    """
+    pool = await get_db_pool()
+    
+    async def body():
+        async with pooled_connection(pool) as conn:
+            service = ExportService(PaymentRepository(conn))
+            async for chunk in service.stream_finance_transactions(
+                start_date=start_date,
+                end_date=end_date,
+                transaction_type=transaction_type,
+                fmt=format,
+                compress=gzip
+            ):
+                yield chunk
+    
+    filename = f"mycafe_finance_{start_date or 'last30'}_{end_date or 'today'}.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
@@ -249,6 +319,9 @@ async def get_cash_flow_report(
             "net_cash_flow": 13000.00,
             "daily_breakdown": [...]
         }
+    
+    Not:
+        - Aralık en fazla 366 gün olabilir (daha uzunu 400 döner)
     """
     payment_repo = PaymentRepository(conn)
     day_repo = DayRepository(conn)
@@ -303,6 +376,7 @@ async def compare_days(
 async def get_period_summary(
     start_date: date = Query(..., description="Başlangıç tarihi"),
     end_date: date = Query(..., description="Bitiş tarihi"),
+    top_n: int = Query(5, description="En çok satan ürün sayısı", ge=0, le=50),
     current_user: dict = Depends(require_admin),
     conn = Depends(get_db_connection)
 ):
@@ -318,6 +392,10 @@ async def get_period_summary(
     
     Örnek kullanım:
         GET /reports/period-summary?start_date=2024-01-01&end_date=2024-01-31
+        GET /reports/period-summary?start_date=2024-01-01&end_date=2024-12-31&top_n=10
+    
+    Not:
+        - Kapanmış dönemler önbellekten döner
     """
     payment_repo = PaymentRepository(conn)
     day_repo = DayRepository(conn)
@@ -328,7 +406,8 @@ async def get_period_summary(
     return await service.get_period_summary(
         user_role=current_user['role'],
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        top_n=top_n
     )
 
 
@@ -384,6 +463,39 @@ async def get_yesterday_report(
     )
 
 
+@router.get("/reports/daily-range", response_model=List[DailySalesReportResponse])
+async def get_daily_range_report(
+    start_date: date = Query(..., description="Başlangıç tarihi"),
+    end_date: date = Query(..., description="Bitiş tarihi"),
+    current_user: dict = Depends(require_admin),
+    conn = Depends(get_db_connection)
+):
+    """
+    Tarih aralığının gün gün satış raporu.
+    
+    Kullanıcıya anlatımı:
+        "Seçtiğin aralıktaki her günün satış raporunu getiriyorum."
+    
+    Örnek kullanım:
+        GET /reports/daily-range?start_date=2024-01-01&end_date=2024-03-31
+    
+    Not:
+        - Tüm aralık tek sorguda okunur; açılmamış günler sıfır satırıdır
+        - Aralık en fazla 366 gün olabilir (daha uzunu 400 döner)
+    """
+    payment_repo = PaymentRepository(conn)
+    day_repo = DayRepository(conn)
+    invoice_repo = InvoiceRepository(conn)
+    customer_repo = CustomerRepository(conn)
+    service = ReportService(payment_repo, day_repo, invoice_repo, customer_repo)
+    
+    return await service.get_daily_sales_range(
+        user_role=current_user['role'],
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
 @router.get("/reports/this-week", response_model=List[DailySalesReportResponse])
 async def get_this_week_report(
     current_user: dict = Depends(require_admin),
@@ -394,6 +506,47 @@ async def get_this_week_report(
     
     Kullanıcıya anlatımı:
         "Bu haftanın günlük satış raporlarını getiriyorum."
+    
+    Not:
+        - Pazartesiden bugüne, her gün bir satır
+    """
+    payment_repo = PaymentRepository(conn)
+    day_repo = DayRepository(conn)
+    invoice_repo = InvoiceRepository(conn)
+    customer_repo = CustomerRepository(conn)
+    service = ReportService(payment_repo, day_repo, invoice_repo, customer_repo)
+    
+    today = date.today()
+    return await service.get_daily_sales_range(
+        user_role=current_user['role'],
+        start_date=today - timedelta(days=today.weekday()),
+        end_date=today
+    )
+
+
+@router.get("/reports/this-month", response_model=List[DailySalesReportResponse])
+async def get_this_month_report(
+    current_user: dict = Depends(require_admin),
+    conn = Depends(get_db_connection)
+):
+    """
+    Bu ayın raporu (günlük).
+    
+    Kullanıcıya anlatımı:
+        "Bu ayın günlük satış raporlarını getiriyorum."
+    
+    Not:
+        - Ayın ilk gününden bugüne, her gün bir satır
     """
-    # TODO: Haftanın günlerini getir
-    return []
\ No newline at end of file
+    payment_repo = PaymentRepository(conn)
+    day_repo = DayRepository(conn)
+    invoice_repo = InvoiceRepository(conn)
+    customer_repo = CustomerRepository(conn)
+    service = ReportService(payment_repo, day_repo, invoice_repo, customer_repo)
+    
+    today = date.today()
+    return await service.get_daily_sales_range(
+        user_role=current_user['role'],
+        start_date=today.replace(day=1),
+        end_date=today
+    )
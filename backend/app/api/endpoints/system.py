@@ -0,0 +1,141 @@
+"""
+MyCafe - Sistem / İzleme API Endpoint'leri
+
+Bu endpoint'ler:
+- Bağlantı havuzu doluluk istatistikleri (sadece ADMIN)
+- Prometheus formatında metrik çıktısı
+- Kapalı gün rapor önbelleğini geçersiz kılma (sadece ADMIN)
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional
+
+from app.api.deps import require_admin, peek_db_pool, get_db_connection
+from app.db.pool import get_pool_stats
+from app.db.statements import get_statement_cache_stats
+from app.cache.report_cache import report_cache, invalidate_reports, notify_report_invalidation
+from app.core.events import event_broker
+from app.cache.dashboard_cache import dashboard_cache
+from app.cache.table_state import table_state
+from app.cache.catalog import catalog_cache
+
+router = APIRouter()
+
+
+def _collect_stats() -> Dict[str, Any]:
+    return {
+        "pool": get_pool_stats(peek_db_pool()),
+        "statements": get_statement_cache_stats(),
+        "report_cache": report_cache.stats(),
+        "events": event_broker.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "table_state": table_state.stats(),
+        "catalog": catalog_cache.stats()
+    }
+
+
+@router.get("/pool-stats", response_model=dict)
+async def get_pool_statistics(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Bağlantı havuzu istatistikleri - Sadece ADMIN
+
+    Kullanıcıya anlatımı:
+        "Havuz ne kadar dolu, bağlantı almak ne kadar bekletiyor?"
+
+    Returns:
+        {
+            "pool": {
+                "in_use": 3, "idle": 2, "saturation": 0.15,
+                "acquire": {"histogram": [...], "timeouts": 0, ...},
+                "churn": {"opened": 5, "closed": 0}
+            },
+            "statements": {"hits": 120, "misses": 8, ...},
+            "report_cache": {"size": 12, "hits": 40, "disk_hits": 2, ...}
+        }
+    """
+    return _collect_stats()
+
+
+def _render_prometheus(stats: Dict[str, Any]) -> str:
+    pool = stats["pool"]
+    acquire = pool["acquire"]
+    statements = stats["statements"]
+    lines: List[str] = [
+        "# HELP mycafe_db_pool_connections Havuzdaki bağlantılar",
+        "# TYPE mycafe_db_pool_connections gauge",
+        f'mycafe_db_pool_connections{{state="in_use"}} {pool["in_use"]}',
+        f'mycafe_db_pool_connections{{state="idle"}} {pool["idle"]}',
+        "# TYPE mycafe_db_pool_max_size gauge",
+        f'mycafe_db_pool_max_size {pool["max_size"]}',
+        "# HELP mycafe_db_pool_acquire_seconds Havuzdan bağlantı alma bekleme süresi",
+        "# TYPE mycafe_db_pool_acquire_seconds histogram",
+    ]
+    for bucket in acquire["histogram"]:
+        lines.append(f'mycafe_db_pool_acquire_seconds_bucket{{le="{bucket["le"]}"}} {bucket["count"]}')
+    lines += [
+        f'mycafe_db_pool_acquire_seconds_sum {acquire["wait_seconds_sum"]}',
+        f'mycafe_db_pool_acquire_seconds_count {acquire["count"]}',
+        "# TYPE mycafe_db_pool_acquire_timeouts_total counter",
+        f'mycafe_db_pool_acquire_timeouts_total {acquire["timeouts"]}',
+        "# TYPE mycafe_db_pool_connections_opened_total counter",
+        f'mycafe_db_pool_connections_opened_total {pool["churn"]["opened"]}',
+        "# TYPE mycafe_db_pool_connections_closed_total counter",
+        f'mycafe_db_pool_connections_closed_total {pool["churn"]["closed"]}',
+        "# TYPE mycafe_db_prepared_statements_total counter",
+        f'mycafe_db_prepared_statements_total{{result="hit"}} {statements["hits"]}',
+        f'mycafe_db_prepared_statements_total{{result="miss"}} {statements["misses"]}',
+        "# TYPE mycafe_report_cache_requests_total counter",
+        f'mycafe_report_cache_requests_total{{result="hit"}} {stats["report_cache"]["hits"]}',
+        f'mycafe_report_cache_requests_total{{result="miss"}} {stats["report_cache"]["misses"]}',
+        "# TYPE mycafe_report_cache_entries gauge",
+        f'mycafe_report_cache_entries {stats["report_cache"]["size"]}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus metrik çıktısı (text exposition formatı).
+
+    Not:
+        - Kimlik doğrulama istemez, sadece sayaç içerir
+        - Scrape yapılandırması: /api/v1/system/metrics
+    """
+    return PlainTextResponse(
+        _render_prometheus(_collect_stats()),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.post("/report-cache/invalidate")
+async def invalidate_report_cache(
+    report_type: Optional[str] = Query(None, description="Rapor tipi (boşsa tümü), örn. daily_sales"),
+    day_id: Optional[int] = Query(None, description="Sadece bu güne dayanan raporlar"),
+    current_user: dict = Depends(require_admin),
+    conn = Depends(get_db_connection)
+):
+    """
+    Kapalı gün rapor önbelleğini temizler - Sadece ADMIN
+
+    Kullanıcıya anlatımı:
+        "Geçmiş bir günde düzeltme yapıldıysa o günün raporları
+        bir sonraki açılışta DB'den yeniden hesaplanır."
+
+    Not:
+        - Kapalı gün raporları süresizdir; düzeltmeden sonra bu uç çağrılmalıdır
+        - Diğer worker'lara NOTIFY ile duyurulur; disk kopyaları da silinir
+        - Tarih aralığı raporları (kategori vb.) her gün temizliğinde silinir
+    """
+    removed = invalidate_reports(report_type, day_id)
+    await notify_report_invalidation(conn, report_type, day_id)
+    return {
+        "success": True,
+        "report_type": report_type,
+        "day_id": day_id,
+        "removed": removed,
+        "message": "Rapor önbelleği temizlendi"
+    }
@@ -3,24 +3,57 @@ MyCafe - Ana API Router'ı
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-# Şimdilik sadece auth ve day'i ekleyelim
 from app.api.endpoints import auth
 from app.api.endpoints import day
-# from app.api.endpoints import invoice  # geçici olarak kapalı
-# from app.api.endpoints import payment  # geçici olarak kapalı
-# from app.api.endpoints import customer  # geçici olarak kapalı
-# from app.api.endpoints import report    # geçici olarak kapalı
+from app.api.endpoints import invoice
+from app.api.endpoints import payment
+from app.api.endpoints import customer
+from app.api.endpoints import report
+from app.api.endpoints import system
+from app.api.endpoints import health
+from app.api.endpoints import events
+from app.api.endpoints import dashboard
+from app.api.endpoints import catalog
 
 api_router = APIRouter()
 
-# Health check
+# Health check - ısınma bitene kadar 503 döner
+# Yük dengeleyici için ayrıntılı kontroller: /health/live ve /health/ready
 @api_router.get("/health")
 async def health_check():
+    from app.core.lifecycle import warmup_state
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "service": "MyCafe"}
+        )
     return {"status": "healthy", "service": "MyCafe"}
 
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
+
 # Auth endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
 # Day endpoints
-api_router.include_router(day.router, prefix="/days", tags=["Days"])
\ No newline at end of file
+api_router.include_router(day.router, prefix="/days", tags=["Days"])
+
+# Adisyon, ödeme, müşteri ve rapor endpoints
+# (yollar modüllerde tam yazılıdır: /invoices/..., /payments, /customers/..., /reports/...)
+api_router.include_router(invoice.router, tags=["Invoices"])
+api_router.include_router(payment.router, tags=["Payments"])
+api_router.include_router(customer.router, tags=["Customers"])
+api_router.include_router(report.router, tags=["Reports"])
+
+# Sistem / izleme endpoints
+api_router.include_router(system.router, prefix="/system", tags=["System"])
+
+# Ana ekran (tek istekte özet, ETag)
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+
+# Ürün kataloğu (sürümlü, ETag)
+api_router.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
+
+# Canlı olay akışı (SSE)
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
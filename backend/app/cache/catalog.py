@@ -0,0 +1,183 @@
+"""
+MyCafe - Ürün Kataloğu Önbelleği
+
+Bu modül:
+- Ürünleri, fiyatları ve kategorileri katalog sürümüyle birlikte tutar
+- Sürüm DB'dedir (catalog_version) ve sadece artar; product / category
+  değişince tetikleyici sürümü artırıp 'mycafe_catalog' kanalına bildirir
+- Bildirimdeki sürüm bellektekinden yeniyse katalog geçersiz kılınır
+- LISTEN bağlantısı yoksa kısa TTL'e düşer (bkz. day_state)
+
+Kullanıcı dili:
+    "Sipariş ekranı ürün listesini sadece menü değiştiyse yeniden indirir."
+"""
+
+from typing import Any, Dict, List, Optional
+from decimal import Decimal
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# product / category değişiklikleri bu kanala bildirilir (payload: yeni sürüm)
+CATALOG_CHANNEL = "mycafe_catalog"
+
+
+class CatalogSnapshot:
+    """
+    Kataloğun değişmez bir kopyası
+
+    Attributes:
+        version: Katalog sürümü
+        products: ürün ID -> ürün satırı (pasifler dahil)
+        categories: Kategori satırları
+    """
+
+    __slots__ = ("version", "products", "categories")
+
+    def __init__(self, version: int, products: List[Dict[str, Any]], categories: List[Dict[str, Any]]):
+        self.version = version
+        self.products: Dict[int, Dict[str, Any]] = {p['id']: p for p in products}
+        self.categories = categories
+
+    @property
+    def etag(self) -> str:
+        return f'W/"catalog-{self.version}"'
+
+    def is_available(self, product_id: int) -> bool:
+        """Ürün katalogda var ve satışa açık mı?"""
+        product = self.products.get(product_id)
+        return bool(product and product['is_active'])
+
+    def price_of(self, product_id: int) -> Optional[Decimal]:
+        product = self.products.get(product_id)
+        return product['sale_price'] if product else None
+
+    def as_dict(self, include_inactive: bool = False) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "products": [
+                p for p in self.products.values()
+                if include_inactive or p['is_active']
+            ],
+            "categories": self.categories
+        }
+
+
+class CatalogCache:
+    """
+    Katalog önbelleği (süreç geneli)
+
+    Not:
+        - Dinleyici aktifken kopya süresiz geçerlidir, değilse TTL uygulanır
+        - Daha eski sürüm hiçbir zaman yenisinin yerine yazılmaz
+        - Yükleme sürerken gelen bildirim kaybolmaz: bildirilen en yüksek
+          sürümden eski veya başladıktan sonra geçersiz kılınmış bir
+          yükleme kopyayı "güncel" işaretlemez (bir sonraki okuma yeniden yükler)
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_at: Optional[float] = None
+        self._notified_version = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        from app.db.listener import notification_listener
+        if notification_listener.is_active:
+            return True
+        return (time.monotonic() - self._loaded_at) < self.ttl
+
+    @property
+    def is_warm(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def generation(self) -> int:
+        """Her geçersiz kılmada artar; yükleme başlamadan önce okunur"""
+        return self._generation
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._snapshot.version if self._snapshot else None
+
+    def get(self) -> Optional[CatalogSnapshot]:
+        """Güncel kopyayı döner, yoksa None (DB'den yüklenmeli)"""
+        if self._snapshot is not None and self._is_fresh():
+            self.hits += 1
+            return self._snapshot
+        self.misses += 1
+        return None
+
+    def load(
+        self,
+        version: int,
+        products: List[Dict[str, Any]],
+        categories: List[Dict[str, Any]],
+        generation: int
+    ) -> CatalogSnapshot:
+        """
+        DB'den okunan kataloğu yazar ve kopyayı döner.
+
+        Args:
+            generation: Yükleme başlamadan önce okunan `generation`
+        """
+        snapshot = CatalogSnapshot(version, products, categories)
+        if self._snapshot is not None and self._snapshot.version > version:
+            # Eşzamanlı bir yükleme daha yeni sürümü yazmış
+            return self._snapshot
+        self._snapshot = snapshot
+        if generation == self._generation and version >= self._notified_version:
+            self._loaded_at = time.monotonic()
+        else:
+            # Okuma sürerken katalog değişti: bu istek eski kopyayı kullanır,
+            # önbellek güncel sayılmaz
+            self._loaded_at = None
+        return snapshot
+
+    def invalidate(self, newer_than: Optional[int] = None) -> None:
+        """
+        Kopyayı geçersiz kılar.
+
+        Args:
+            newer_than: Bildirilen sürüm; bellekteki zaten bu sürümdeyse bir şey yapılmaz
+        """
+        if newer_than is not None:
+            self._notified_version = max(self._notified_version, newer_than)
+            if self.version is not None and self.version >= newer_than:
+                return
+        self._generation += 1
+        self._loaded_at = None
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "warm": self.is_warm,
+            "version": self.version,
+            "products": len(self._snapshot.products) if self._snapshot else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
+
+
+catalog_cache = CatalogCache(ttl=settings.CATALOG_CACHE_TTL)
+
+
+def _on_catalog_notify(channel: str, payload: str) -> None:
+    logger.debug(f"Catalog changed (version={payload}), invalidating cache")
+    catalog_cache.invalidate(int(payload) if payload and payload.isdigit() else None)
+
+
+def register_catalog_listener(listener) -> None:
+    """Katalog kanalını dinleyiciye bağlar"""
+    listener.add_handler(CATALOG_CHANNEL, _on_catalog_notify)
+    listener.on_reconnect(catalog_cache.invalidate)
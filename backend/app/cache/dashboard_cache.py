@@ -0,0 +1,66 @@
+"""
+MyCafe - Ana Ekran (Dashboard) Önbelleği
+
+Bu modül:
+- Ana ekran verisinin son hesaplanan halini süreç belleğinde tutar
+- Girdi, canlı olay akışının sürümüne (event_broker.version) bağlıdır:
+  adisyon / masa / gün bildirimi gelince sürüm artar, girdi geçersizleşir
+- Bildirim üretmeyen değişiklikler (ör. gider kaydı) için kısa TTL uygulanır
+
+Kullanıcı dili:
+    "Yirmi tablet aynı anda ana ekranı yenilese de DB'ye bir kez gidilir."
+"""
+
+from typing import Any, Dict, Optional
+import time
+
+from app.core.config import settings
+
+
+class DashboardCache:
+    """
+    Tek girdili, sürüm + TTL ile geçerlenen önbellek (süreç geneli)
+
+    Args:
+        ttl: Sürüm değişmese de girdinin en fazla geçerli kalacağı süre (saniye)
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[Dict[str, Any]] = None
+        self._version: Optional[int] = None
+        self._loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int) -> Optional[Dict[str, Any]]:
+        """Verilen sürüm için geçerli girdiyi döner, yoksa None"""
+        if (
+            self._value is not None
+            and self._version == version
+            and (time.monotonic() - self._loaded_at) < self.ttl
+        ):
+            self.hits += 1
+            return self._value
+        self.misses += 1
+        return None
+
+    def set(self, version: int, value: Dict[str, Any]) -> None:
+        self._value = value
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._value = None
+        self._version = None
+        self._loaded_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "warm": self._value is not None,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+dashboard_cache = DashboardCache(ttl=settings.DASHBOARD_CACHE_TTL)
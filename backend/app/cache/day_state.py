@@ -0,0 +1,116 @@
+"""
+MyCafe - Gün Durumu Önbelleği
+
+Bu modül:
+- Açık günü (get_current_day sonucu) süreç belleğinde tutar
+- Gün açma/kapama ve DB NOTIFY ile geçersiz kılınır
+- LISTEN bağlantısı yoksa (çok worker'lı kurulumda kopmuşsa) kısa TTL'e düşer
+
+Kullanıcı dili:
+    "Gün açık mı?" sorusu her yazma işleminde DB'ye gitmez, bellekten cevaplanır.
+"""
+
+from typing import Optional, Dict, Any, Tuple
+import time
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# daymarker tablosundaki değişiklikler bu kanala bildirilir
+DAY_STATE_CHANNEL = "mycafe_day_state"
+
+
+class DayStateCache:
+    """
+    Açık gün önbelleği (süreç geneli)
+
+    Not:
+        - None değeri de geçerli bir durumdur: "açık gün yok"
+        - Dinleyici aktifken girdi süresiz geçerlidir, değilse TTL uygulanır
+        - Okuma sürerken gelen geçersiz kılma kaybolmaz: okuyucu `generation`'ı
+          sorgudan önce alır, arada geçersiz kılma olduysa `set` yazmaz
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._day: Optional[Dict[str, Any]] = None
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        from app.db.listener import notification_listener
+        if notification_listener.is_active:
+            return True
+        return (time.monotonic() - self._loaded_at) < self.ttl
+
+    def get(self) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Returns:
+            (bulundu_mu, gün) - bulunamadıysa DB'den yüklenmelidir
+        """
+        if self._is_fresh():
+            self.hits += 1
+            return True, dict(self._day) if self._day else None
+        self.misses += 1
+        return False, None
+
+    @property
+    def generation(self) -> int:
+        """Her geçersiz kılmada artar; DB okumasından önce alınır"""
+        return self._generation
+
+    def set(self, day: Optional[Dict[str, Any]], generation: int) -> bool:
+        """
+        DB'den okunan açık günü (veya None) önbelleğe yazar.
+
+        Args:
+            generation: Okuma başlamadan önce alınan `generation`
+
+        Returns:
+            False: okuma sürerken önbellek geçersiz kılındı, sonuç yazılmadı
+        """
+        if generation != self._generation:
+            return False
+        self._day = dict(day) if day else None
+        self._loaded_at = time.monotonic()
+        return True
+
+    def invalidate(self) -> None:
+        """Önbelleği boşaltır, bir sonraki okuma DB'ye gider"""
+        self._day = None
+        self._loaded_at = None
+        self._generation += 1
+        self.invalidations += 1
+
+    @property
+    def is_warm(self) -> bool:
+        return self._loaded_at is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "warm": self.is_warm,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
+
+
+day_state_cache = DayStateCache(ttl=settings.DAY_STATE_CACHE_TTL)
+
+
+def _on_day_state_notify(channel: str, payload: str) -> None:
+    logger.debug(f"Day state changed (day_id={payload}), invalidating cache")
+    day_state_cache.invalidate()
+
+
+def register_day_state_listener(listener) -> None:
+    """Gün durumu kanalını dinleyiciye bağlar"""
+    listener.add_handler(DAY_STATE_CHANNEL, _on_day_state_notify)
+    listener.on_reconnect(day_state_cache.invalidate)
@@ -0,0 +1,100 @@
+"""
+MyCafe - Sınırlı LRU + TTL Önbellek
+
+Bu modül:
+- Boyutu sınırlı, en eski kullanılanı atan (LRU) bir önbellek sağlar
+- Her girdi için yaşam süresi (TTL) uygular
+- Hit/miss sayaçları tutar
+
+Not:
+    asyncio tek thread'de çalıştığı için kilit gerekmez.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from collections import OrderedDict
+import time
+
+
+class LRUTTLCache:
+    """
+    Sınırlı LRU + TTL önbellek
+
+    Args:
+        maxsize: Maksimum girdi sayısı
+        ttl: Girdi yaşam süresi (saniye), None ise süresiz
+        on_evict: Boyut aşımında atılan her girdi için on_evict(anahtar, değer)
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float],
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Girdiyi döner; yoksa veya süresi dolmuşsa default döner"""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Girdiyi yazar, boyut aşılırsa en eskiyi atar"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, (evicted, _) = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted)
+
+    def peek(self, key: Hashable) -> Any:
+        """Girdiyi sayaçlara ve LRU sırasına dokunmadan döner (süresi dolmuşsa None)"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def keys(self) -> List[Hashable]:
+        """Mevcut anahtarların kopyası (eskiden yeniye)"""
+        return list(self._data)
+
+    def pop(self, key: Hashable) -> None:
+        """Tek girdiyi siler (yoksa sessizce geçer)"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Tüm girdileri siler"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
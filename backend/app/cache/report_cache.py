@@ -0,0 +1,401 @@
+"""
+MyCafe - Kapalı Gün Rapor Önbelleği
+
+Bu modül:
+- Kapanmış günlerin (ve sadece kapanmış günlerden oluşan aralıkların)
+  rapor sonuçlarını tutar
+- Anahtar: (rapor tipi, gün ID'si veya tarih aralığı, parametreler)
+- Kapanmış gün değişmediği için girdiler süre ile dolmaz; sadece admin
+  düzeltme yaptığında açıkça geçersiz kılınır
+- Bellek sınırlıdır (LRU); REPORT_CACHE_SPILL_DIR verilirse bellekten
+  atılan girdi diske JSON olarak yazılır, istenince diskten geri yüklenir
+  (model, Decimal ve tarih tipleri korunur)
+- Disk dizini REPORT_CACHE_SPILL_MAX_FILES dosyayla sınırlıdır (en eskiler silinir)
+- Dosya adı rapor tipini ve dayandığı günleri taşır; geçersiz kılma
+  dosya açmadan, sadece adlara bakarak siler
+- Disk işlemleri event loop'u bekletmez (asyncio.to_thread)
+- Geçersiz kılma NOTIFY ile tüm worker'lara yayılır
+
+Kullanıcı dili:
+    "Admin geçen ayı bir kez açtıysa ikinci açışta DB'ye gidilmez."
+"""
+
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+from datetime import date, datetime
+from decimal import Decimal
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+from pydantic import BaseModel
+
+from app.cache.lru import LRUTTLCache
+from app.core.config import settings
+from app.models import domain
+
+logger = logging.getLogger(__name__)
+
+# Geçersiz kılma bu kanala bildirilir (payload: "rapor_tipi|gün_id", boş alan = hepsi)
+REPORT_CACHE_CHANNEL = "mycafe_report_cache"
+
+# (değer, ilgili gün ID'leri); gün ID'leri None ise tarih aralığı raporudur
+_Entry = Tuple[Any, Optional[FrozenSet[int]]]
+
+# Tarih aralığı raporlarının dosya adındaki gün alanı
+_RANGE_SPAN = "range"
+
+
+def _span_of(day_ids: Optional[FrozenSet[int]]) -> str:
+    """Dosya adındaki gün alanı: 'd12+57' veya 'range'"""
+    if day_ids is None:
+        return _RANGE_SPAN
+    return "d" + "+".join(str(day_id) for day_id in sorted(day_ids))
+
+
+def _digest(key: Tuple) -> str:
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+
+
+def _encode_value(value: Any) -> Any:
+    """json.dump'ın tanımadığı tipleri etiketli sözlüğe çevirir"""
+    if isinstance(value, BaseModel):
+        return {"__model__": type(value).__name__, "data": value.model_dump()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Cannot spill value of type {type(value).__name__}")
+
+
+def _decode_value(obj: Dict[str, Any]) -> Any:
+    """_encode_value'nun tersi (json.load object_hook'u)"""
+    if "__model__" in obj:
+        return getattr(domain, obj["__model__"]).model_validate(obj["data"])
+    if "__decimal__" in obj:
+        return Decimal(obj["__decimal__"])
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def _name_matches(name: str, report_type: Optional[str], day_id: Optional[int]) -> bool:
+    """Dosya adı geçersiz kılmayla eşleşiyor mu? (ad çözülemezse eşleşir)"""
+    parts = name.split(".")
+    if len(parts) != 4:
+        return True
+    stored_type, span = parts[0], parts[1]
+    if report_type is not None and stored_type != report_type:
+        return False
+    if day_id is not None and span != _RANGE_SPAN:
+        return str(day_id) in span[1:].split("+")
+    return True
+
+
+class ClosedDayReportCache:
+    """
+    Süresiz rapor önbelleği (süreç geneli, opsiyonel disk taşması)
+
+    Args:
+        maxsize: Bellekte tutulacak en fazla rapor
+        spill_dir: Disk dizini (None: sadece bellek)
+        spill_max_files: Diskte tutulacak en fazla rapor
+
+    Not:
+        - Diskten dönen rapor bellekteki ile aynı tiptedir (app.models.domain
+          modelleri, Decimal, date / datetime etiketlenerek yazılır)
+        - Disk işlemleri tek kilitle sırayla yapılır; okuma / yazma sürerken
+          geçersiz kılma olduysa (`_epoch` değiştiyse) sonuç kullanılmaz
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        spill_dir: Optional[str] = None,
+        spill_max_files: int = 1024
+    ):
+        self._memory = LRUTTLCache(maxsize=maxsize, ttl=None, on_evict=self._spill)
+        self.spill_dir = spill_dir
+        self.spill_max_files = spill_max_files
+        self._epoch = 0
+        self._disk_lock = asyncio.Lock()
+        self._pending: Set[asyncio.Task] = set()
+        self.disk_hits = 0
+        self.spilled = 0
+        self.invalidations = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    # ---- disk (thread'de çalışır) ----
+
+    def _file_name(self, key: Tuple, day_ids: Optional[FrozenSet[int]]) -> str:
+        return f"{key[0]}.{_span_of(day_ids)}.{_digest(key)}.json"
+
+    def _write_disk(self, key: Tuple, entry: _Entry) -> None:
+        path = os.path.join(self.spill_dir, self._file_name(key, entry[1]))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            payload = {
+                "key": repr(key),
+                "day_ids": sorted(entry[1]) if entry[1] is not None else None,
+                "value": entry[0]
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=_encode_value)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not spill report {key}: {e}")
+            return
+        self._enforce_file_limit()
+
+    def _enforce_file_limit(self) -> None:
+        names = [n for n in os.listdir(self.spill_dir) if n.endswith(".json")]
+        excess = len(names) - self.spill_max_files
+        if excess <= 0:
+            return
+        paths = []
+        for name in names:
+            path = os.path.join(self.spill_dir, name)
+            try:
+                paths.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                pass
+        for _, path in sorted(paths)[:excess]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _take_from_disk(self, key: Tuple) -> Optional[_Entry]:
+        """Girdiyi diskten okur ve siler (artık bellekte tutulacak)"""
+        prefix, suffix = f"{key[0]}.", f".{_digest(key)}.json"
+        for name in os.listdir(self.spill_dir):
+            if not (name.startswith(prefix) and name.endswith(suffix)):
+                continue
+            path = os.path.join(self.spill_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f, object_hook=_decode_value)
+                os.remove(path)
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"Could not read spilled report {key}: {e}")
+                return None
+            if payload.get("key") != repr(key):
+                return None
+            day_ids = payload.get("day_ids")
+            return payload.get("value"), frozenset(day_ids) if day_ids is not None else None
+        return None
+
+    def _delete_matching(self, report_type: Optional[str], day_id: Optional[int]) -> int:
+        removed = 0
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith(".json") or not _name_matches(name, report_type, day_id):
+                continue
+            try:
+                os.remove(os.path.join(self.spill_dir, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    # ---- disk (event loop tarafı) ----
+
+    def _schedule(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _spill(self, key: Hashable, entry: _Entry) -> None:
+        """LRU'dan atılan girdiyi diske yazdırır (beklemeden)"""
+        if self.spill_dir:
+            self._schedule(self._spill_async(key, entry, self._epoch))
+
+    async def _spill_async(self, key: Tuple, entry: _Entry, epoch: int) -> None:
+        async with self._disk_lock:
+            if epoch != self._epoch:
+                return  # atılmadan sonra geçersiz kılındı
+            await asyncio.to_thread(self._write_disk, key, entry)
+            self.spilled += 1
+
+    async def _delete_async(self, report_type: Optional[str], day_id: Optional[int]) -> None:
+        async with self._disk_lock:
+            try:
+                await asyncio.to_thread(self._delete_matching, report_type, day_id)
+            except Exception as e:
+                logger.warning(f"Could not remove spilled reports: {e}")
+
+    # ---- API ----
+
+    async def get(self, key: Tuple) -> Any:
+        """Raporu döner (önce bellek, sonra disk), yoksa None"""
+        entry = self._memory.get(key)
+        if entry is None and self.spill_dir:
+            epoch = self._epoch
+            async with self._disk_lock:
+                entry = await asyncio.to_thread(self._take_from_disk, key)
+            if entry is not None and epoch != self._epoch:
+                entry = None  # okuma sürerken geçersiz kılındı
+            if entry is not None:
+                self.disk_hits += 1
+                self._memory.set(key, entry)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: Tuple, value: Any, day_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Raporu belleğe yazar (bellekten atılınca diske taşar).
+
+        Args:
+            day_ids: Raporun dayandığı günler (gün bazlı geçersiz kılma için);
+                None ise tarih aralığı raporudur ve her gün geçersiz kılmasında silinir
+        """
+        entry = (value, frozenset(day_ids) if day_ids is not None else None)
+        self._memory.set(key, entry)
+
+    @staticmethod
+    def _matches(
+        key: Tuple,
+        day_ids: Optional[FrozenSet[int]],
+        report_type: Optional[str],
+        day_id: Optional[int]
+    ) -> bool:
+        if report_type is not None and key[0] != report_type:
+            return False
+        if day_id is not None and day_ids is not None and day_id not in day_ids:
+            return False
+        return True
+
+    def invalidate(self, report_type: Optional[str] = None, day_id: Optional[int] = None) -> int:
+        """
+        Eşleşen raporları bellekten siler, diskten silmeyi başlatır.
+
+        Args:
+            report_type: Sadece bu rapor tipi (None: hepsi)
+            day_id: Sadece bu güne dayanan raporlar (aralık raporları her zaman silinir)
+
+        Returns:
+            Bellekten silinen girdi sayısı
+        """
+        self._epoch += 1
+        removed = 0
+        for key in self._memory.keys():
+            entry = self._memory.peek(key)
+            if entry is not None and self._matches(key, entry[1], report_type, day_id):
+                self._memory.pop(key)
+                removed += 1
+        if self.spill_dir:
+            self._schedule(self._delete_async(report_type, day_id))
+        self.invalidations += 1
+        return removed
+
+    def clear(self) -> None:
+        """Bellekteki ve diskteki tüm raporları atar"""
+        self._epoch += 1
+        self._memory.clear()
+        if self.spill_dir:
+            self._schedule(self._delete_async(None, None))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "spilled": self.spilled,
+            "invalidations": self.invalidations,
+            "spill_dir": self.spill_dir
+        }
+
+
+report_cache = ClosedDayReportCache(
+    maxsize=settings.REPORT_CACHE_MAXSIZE,
+    spill_dir=settings.REPORT_CACHE_SPILL_DIR,
+    spill_max_files=settings.REPORT_CACHE_SPILL_MAX_FILES
+)
+
+
+def is_closed_range(end_date: date, current_day: Optional[dict]) -> bool:
+    """
+    Aralığın tamamı kapanmış günlerden mi oluşuyor?
+
+    Args:
+        end_date: Aralığın son günü
+        current_day: Açık gün (DayRepository.get_current_day) veya None
+
+    Not:
+        - Açık gün varsa ondan önceki günler kapalıdır
+        - Açık gün yoksa bugünden önceki günler kapalıdır
+    """
+    boundary = current_day['day_date'] if current_day else date.today()
+    return end_date < boundary
+
+
+def is_closed_day(day: Optional[dict]) -> bool:
+    """Gün kaydı kapanmış mı? (get_day_by_id / get_day_by_date sonucu)"""
+    return bool(day) and day.get('is_open') is False
+
+
+def report_cache_key(report_type: str, *parts: Hashable) -> Tuple:
+    """
+    Örnek:
+        report_cache_key('daily_sales', day_id)
+        report_cache_key('category_sales', start_date, end_date, top_n)
+    """
+    return (report_type,) + tuple(parts)
+
+
+async def get_cached_report(key: Tuple) -> Any:
+    """Önbellekteki raporu döner, yoksa None"""
+    return await report_cache.get(key)
+
+
+def cache_report(key: Tuple, value: Any, day_ids: Optional[Iterable[int]] = None) -> None:
+    """Kapalı gün / kapalı aralık raporunu önbelleğe yazar"""
+    report_cache.set(key, value, day_ids)
+
+
+def invalidate_reports(report_type: Optional[str] = None, day_id: Optional[int] = None) -> int:
+    """Bu süreçteki eşleşen raporları siler (diğer worker'lar için notify_report_invalidation)"""
+    removed = report_cache.invalidate(report_type, day_id)
+    logger.info(
+        f"Report cache invalidated (type={report_type or '*'}, day={day_id or '*'}): "
+        f"{removed} entr{'y' if removed == 1 else 'ies'}"
+    )
+    return removed
+
+
+def build_invalidation_payload(report_type: Optional[str] = None, day_id: Optional[int] = None) -> str:
+    return f"{report_type or ''}|{day_id if day_id is not None else ''}"
+
+
+async def notify_report_invalidation(
+    conn,
+    report_type: Optional[str] = None,
+    day_id: Optional[int] = None
+) -> None:
+    """Geçersiz kılmayı NOTIFY ile tüm worker'lara duyurur"""
+    await conn.execute(
+        "SELECT pg_notify($1, $2)",
+        REPORT_CACHE_CHANNEL,
+        build_invalidation_payload(report_type, day_id)
+    )
+
+
+def _on_report_cache_notify(channel: str, payload: str) -> None:
+    report_type, _, day_id = (payload or "").partition("|")
+    invalidate_reports(
+        report_type or None,
+        int(day_id) if day_id.isdigit() else None
+    )
+
+
+def register_report_cache_listener(listener) -> None:
+    """Rapor önbelleği kanalını dinleyiciye bağlar"""
+    listener.add_handler(REPORT_CACHE_CHANNEL, _on_report_cache_notify)
+    # Kopukken kaçan geçersiz kılma olabilir: girdiler süresiz olduğu için
+    # disk kopyası da atılır, aksi halde bayat rapor diskte kalıcı olur
+    listener.on_reconnect(report_cache.clear)
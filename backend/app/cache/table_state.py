@@ -0,0 +1,278 @@
+"""
+MyCafe - Masa Doluluk İndeksi
+
+Bu modül:
+- Tüm masaları (pasifler dahil) ve açık adisyonlarını süreç belleğinde tutar
+- Açılışta yüklenir; bu süreçteki adisyon açma / ödeme / iptal işlemleri
+  ve diğer worker'lardan gelen DB NOTIFY'ları ile güncellenir
+- Periyodik olarak DB ile karşılaştırılır (uzlaştırma); fark bulunursa
+  loglanır ve indeks DB'deki hale getirilir
+- LISTEN bağlantısı yoksa kısa TTL'e düşer (bkz. day_state)
+
+Kullanıcı dili:
+    "Hangi masa dolu?" sorusu DB'ye gitmeden bellekten cevaplanır.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.core.events import INVOICE_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+class TableStateIndex:
+    """
+    Masa doluluk indeksi (süreç geneli)
+
+    Not:
+        - Satırlar get_tables(include_inactive=True) çıktısıdır
+        - Dinleyici aktifken indeks süresiz geçerlidir, değilse TTL uygulanır
+        - Bilinmeyen masa için bildirim gelirse indeks geçersiz kılınır
+          (yeni masa eklenmiş olabilir); bir sonraki okuma DB'den yükler
+        - Yükleyen `generation`'ı sorgudan önce alır; okuma sürerken
+          güncellenen masalar bellekteki haliyle kalır, araya geçersiz kılma
+          veya daha yeni bir yükleme girdiyse sonuç hiç uygulanmaz
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tables: Dict[int, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        # Son geçersiz kılmanın ve son uygulanan yüklemenin generation'ı
+        self._reset_generation = 0
+        self._loaded_generation = 0
+        # masa_id -> son güncellendiği generation
+        self._touched: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_loads = 0
+        self.reconciliations = 0
+        self.drift_corrections = 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        from app.db.listener import notification_listener
+        if notification_listener.is_active:
+            return True
+        return (time.monotonic() - self._loaded_at) < self.ttl
+
+    @property
+    def is_warm(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def generation(self) -> int:
+        """Her güncellemede artar; DB okumasından önce alınıp load'a verilir"""
+        return self._generation
+
+    # ---- yükleme ----
+
+    def load(self, rows: List[Dict[str, Any]], generation: int) -> Optional[int]:
+        """
+        İndeksi DB'den okunan satırlarla değiştirir.
+
+        Args:
+            rows: fetch_tables(include_inactive=True) çıktısı
+            generation: Okuma başlamadan önce alınan `generation`
+
+        Returns:
+            Önceki indeksten farklı çıkan masa sayısı (uzlaştırma için);
+            sonuç bayat olduğu için uygulanmadıysa None
+        """
+        if generation < self._reset_generation or generation < self._loaded_generation:
+            self.stale_loads += 1
+            return None
+
+        tables = {row['id']: dict(row) for row in rows}
+        # Okuma sürerken güncellenen masalarda bellekteki hal daha yenidir
+        for table_id, touched in self._touched.items():
+            if touched > generation and table_id in self._tables:
+                tables[table_id] = self._tables[table_id]
+
+        drift = 0
+        if self._loaded_at is not None:
+            for table_id in set(tables) | set(self._tables):
+                old = self._tables.get(table_id)
+                new = tables.get(table_id)
+                if (
+                    old is None or new is None
+                    or old['is_occupied'] != new['is_occupied']
+                    or old.get('current_invoice_id') != new.get('current_invoice_id')
+                ):
+                    drift += 1
+        self._tables = tables
+        self._loaded_at = time.monotonic()
+        self._loaded_generation = generation
+        self._touched = {k: v for k, v in self._touched.items() if v > generation}
+        return drift
+
+    def invalidate(self) -> None:
+        """İndeksi boşaltır, sürmekte olan yüklemeler uygulanmaz"""
+        self._tables = {}
+        self._loaded_at = None
+        self._generation += 1
+        self._reset_generation = self._generation
+        self._touched = {}
+        self.invalidations += 1
+
+    # ---- okuma ----
+
+    def _lookup(self) -> Optional[Dict[int, Dict[str, Any]]]:
+        if self._is_fresh():
+            self.hits += 1
+            return self._tables
+        self.misses += 1
+        return None
+
+    def get_tables(self, include_inactive: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Masalar (masa numarasına göre) veya None (DB'den yüklenmeli)"""
+        tables = self._lookup()
+        if tables is None:
+            return None
+        return [
+            dict(t) for t in sorted(tables.values(), key=lambda t: t['table_number'])
+            if include_inactive or t['is_active']
+        ]
+
+    def get_available_tables(self) -> Optional[List[Dict[str, Any]]]:
+        """Boş ve aktif masalar veya None"""
+        tables = self.get_tables()
+        if tables is None:
+            return None
+        return [t for t in tables if not t['is_occupied']]
+
+    def get_table(self, table_id: int) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Returns:
+            (bulundu_mu, masa) - bulunamadıysa DB'den yüklenmelidir;
+            indeks güncel ama masa yoksa (True, None)
+        """
+        tables = self._lookup()
+        if tables is None:
+            return False, None
+        table = tables.get(table_id)
+        return True, dict(table) if table else None
+
+    # ---- güncelleme ----
+
+    def _touch(self, table_id: int) -> None:
+        self._generation += 1
+        self._touched[table_id] = self._generation
+
+    def mark_occupied(self, table_id: int, invoice_id: int) -> None:
+        table = self._tables.get(table_id)
+        if table is None:
+            # Yeni masa veya indeks soğuk: sürmekte olan yükleme bu değişikliği kaçırmış olabilir
+            self.invalidate()
+            return
+        table['is_occupied'] = True
+        table['current_invoice_id'] = invoice_id
+        self._touch(table_id)
+
+    def mark_free(self, table_id: int, invoice_id: Optional[int] = None) -> None:
+        """Masayı boşaltır (invoice_id verilirse sadece o adisyon masadaysa)"""
+        table = self._tables.get(table_id)
+        if table is None:
+            self.invalidate()
+            return
+        if invoice_id is not None and table.get('current_invoice_id') not in (None, invoice_id):
+            return
+        table['is_occupied'] = False
+        table['current_invoice_id'] = None
+        self._touch(table_id)
+
+    def mark_invoice_closed(self, invoice_id: int) -> None:
+        """Adisyonun bulunduğu masayı boşaltır (masa bilinmiyorsa bir şey yapmaz)"""
+        if not self.is_warm:
+            self.invalidate()
+            return
+        for table_id, table in self._tables.items():
+            if table.get('current_invoice_id') == invoice_id:
+                self.mark_free(table_id, invoice_id)
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "warm": self.is_warm,
+            "tables": len(self._tables),
+            "occupied": sum(1 for t in self._tables.values() if t['is_occupied']),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stale_loads": self.stale_loads,
+            "reconciliations": self.reconciliations,
+            "drift_corrections": self.drift_corrections
+        }
+
+
+table_state = TableStateIndex(ttl=settings.TABLE_STATE_CACHE_TTL)
+
+
+def _on_invoice_notify(channel: str, payload: str) -> None:
+    try:
+        data = json.loads(payload)
+    except (TypeError, ValueError):
+        return
+    if data.get("kind") != "invoice":
+        return
+
+    invoice_id = data.get("invoice_id")
+    table_id = data.get("table_id")
+    old_table_id = data.get("old_table_id")
+    if old_table_id is not None and old_table_id != table_id:
+        table_state.mark_free(old_table_id, invoice_id)
+    if table_id is None:
+        return
+    if data.get("status") == "OPEN":
+        table_state.mark_occupied(table_id, invoice_id)
+    else:
+        table_state.mark_free(table_id, invoice_id)
+
+
+def register_table_state_listener(listener) -> None:
+    """Adisyon kanalını masa indeksine bağlar"""
+    listener.add_handler(INVOICE_CHANNEL, _on_invoice_notify)
+    # Kopukken kaçan bildirim olabilir: bir sonraki okuma DB'den yükler
+    listener.on_reconnect(table_state.invalidate)
+
+
+async def reconcile_table_state(pool) -> int:
+    """
+    İndeksi DB'den yeniden yükler ve farkları sayar.
+
+    Returns:
+        Bellekteki halinden farklı çıkan masa sayısı
+        (okuma sürerken indeks geçersiz kılındıysa 0)
+    """
+    from app.db.pool import pooled_connection
+    from app.repositories.invoice_repository import InvoiceRepository
+
+    generation = table_state.generation
+    async with pooled_connection(pool) as conn:
+        rows = await InvoiceRepository(conn).fetch_tables(include_inactive=True)
+    drift = table_state.load(rows, generation)
+    table_state.reconciliations += 1
+    if drift:
+        table_state.drift_corrections += drift
+        logger.warning(f"Table state index drifted from DB on {drift} table(s), corrected")
+    return drift
+
+
+async def run_table_state_reconciler(pool, interval: float) -> None:
+    """Uzlaştırmayı `interval` saniyede bir çalıştırır (iptal edilene kadar)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_table_state(pool)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Table state reconciliation failed: {e}")
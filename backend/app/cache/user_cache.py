@@ -0,0 +1,98 @@
+"""
+MyCafe - Oturum Açmış Kullanıcı Önbelleği
+
+Bu modül:
+- get_current_user'ın app_user/role sorgusunu önbelleğe alır
+- Kullanıcı ID'sine göre sınırlı LRU + TTL önbellek kullanır
+- Rol veya is_active değişince DB NOTIFY ile ya da admin endpoint'i ile temizlenir
+- DB okuması sürerken gelen temizleme kaybolmaz: okuyucu generation'ı
+  sorgudan önce alır, arada temizleme olduysa okunan satır yazılmaz
+
+Kullanıcı dili:
+    "Garson tableti her istekte kim olduğunu DB'ye sormaz."
+"""
+
+from typing import Optional, Dict, Any
+import logging
+
+from app.cache.lru import LRUTTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# app_user / role değişiklikleri bu kanala bildirilir (payload: user_id veya boş)
+USER_CHANNEL = "mycafe_user_changed"
+
+user_cache = LRUTTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL
+)
+
+# Her temizlemede artar (bkz. day_state.DayStateCache.generation)
+_generation = 0
+
+
+def user_cache_generation() -> int:
+    """DB'den kullanıcı okumadan önce alınır, cache_user'a verilir"""
+    return _generation
+
+
+def get_cached_user(user_id: int) -> Optional[Dict[str, Any]]:
+    """Önbellekteki kullanıcıyı döner (kopya), yoksa None"""
+    user = user_cache.get(user_id)
+    return dict(user) if user else None
+
+
+def cache_user(user: Dict[str, Any], generation: int) -> bool:
+    """
+    Kullanıcı satırını önbelleğe yazar.
+
+    Args:
+        generation: Okuma başlamadan önce alınan user_cache_generation()
+
+    Returns:
+        False: okuma sürerken önbellek temizlendi, satır yazılmadı
+    """
+    if generation != _generation:
+        return False
+    user_cache.set(user['id'], dict(user))
+    return True
+
+
+def invalidate_user(user_id: Optional[int] = None) -> None:
+    """
+    Kullanıcıyı önbellekten siler.
+
+    Args:
+        user_id: Kullanıcı ID, None ise tüm önbellek temizlenir
+    """
+    global _generation
+    _generation += 1
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(user_id)
+
+
+async def notify_user_invalidation(conn, user_id: Optional[int] = None) -> None:
+    """Geçersiz kılmayı NOTIFY ile tüm worker'lara duyurur (boş payload = hepsi)"""
+    await conn.execute(
+        "SELECT pg_notify($1, $2)",
+        USER_CHANNEL,
+        str(user_id) if user_id is not None else ""
+    )
+
+
+def _on_user_notify(channel: str, payload: str) -> None:
+    if payload and payload.isdigit():
+        logger.debug(f"User {payload} changed, invalidating cache entry")
+        invalidate_user(int(payload))
+    else:
+        logger.debug("Users/roles changed, clearing user cache")
+        invalidate_user()
+
+
+def register_user_cache_listener(listener) -> None:
+    """Kullanıcı kanalını dinleyiciye bağlar"""
+    listener.add_handler(USER_CHANNEL, _on_user_notify)
+    listener.on_reconnect(invalidate_user)
@@ -0,0 +1,70 @@
+"""
+MyCafe - ETag / Koşullu GET Yardımcıları
+
+Bu modül:
+- JSON gövdesinden içerik tabanlı (zayıf) ETag üretir
+- If-None-Match başlığını ETag ile karşılaştırır
+- Değişmemiş içerik için gövdesiz 304 döner
+
+Kullanımı:
+    return conditional_json_response(request, payload)
+
+Not:
+    ETag gövdeden hesaplandığı için aynı veri her worker'da aynı ETag'i verir;
+    yük dengeleyici isteği başka worker'a gönderse de 304 alınır.
+"""
+
+from typing import Any, Optional
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def compute_etag(content: Any) -> str:
+    """JSON'a çevrilebilir içerikten zayıf ETag üretir"""
+    body = json.dumps(
+        jsonable_encoder(content),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return f'W/"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag'i kapsıyor mu? (zayıf karşılaştırma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    etag: Optional[str] = None
+) -> Response:
+    """
+    İçeriği ETag ile döner; istemcideki kopya güncelse 304 döner.
+
+    Args:
+        request: Gelen istek (If-None-Match okunur)
+        content: JSON'a çevrilebilir gövde
+        etag: Hazır ETag (verilmezse gövdeden hesaplanır)
+    """
+    etag = etag or compute_etag(content)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
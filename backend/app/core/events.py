@@ -0,0 +1,155 @@
+"""
+MyCafe - Canlı Olay Akışı (Fan-out)
+
+Bu modül:
+- Paylaşılan LISTEN bağlantısından gelen adisyon / masa / gün bildirimlerini
+  olaylara çevirir
+- Her olayı bağlı tüm abonelere (SSE bağlantılarına) dağıtır
+- Yavaş aboneyi bekletmez: kuyruğu dolan abone düşürülür, tekrar bağlanır
+
+DB yükü abone sayısından bağımsızdır: süreç başına tek LISTEN bağlantısı
+vardır, tablet sayısı artınca sadece bellekteki kuyruklar artar.
+
+Olaylar:
+    {"type": "invoice", "data": {"invoice_id", "table_id", "status", "total_amount", "line_count"}}
+    {"type": "lines", "data": {"invoice_id"}}
+    {"type": "table", "data": {"table_id", "occupied", "invoice_id"}}
+    {"type": "day_state", "data": {"day_id"}}
+    {"type": "resync", "data": {}}   # bildirim kaçmış olabilir, UI yeniden çeksin
+"""
+
+from typing import Any, Dict, Optional, Set
+import asyncio
+import json
+import logging
+
+from app.cache.day_state import DAY_STATE_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# invoice / invoiceline değişiklikleri bu kanala bildirilir (bkz. 011_invoice_notify.sql)
+INVOICE_CHANNEL = "mycafe_invoice_changed"
+
+# Abone başına bekleyen en fazla olay; dolarsa abone düşürülür
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Kapanışta abonelere gönderilen bitiş işareti
+_CLOSED = None
+
+
+class EventBroker:
+    """Süreç içi yayın/abone dağıtıcısı"""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.published = 0
+        self.dropped_subscribers = 0
+        self.closed = False
+
+    @property
+    def version(self) -> int:
+        """Yayınlanan olay sayısı; değişmediyse izlenen durum da değişmemiştir"""
+        return self.published
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Yeni abone kuyruğu döner (iş bitince unsubscribe çağrılmalı)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.closed:
+            queue.put_nowait(_CLOSED)
+        else:
+            self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Olayı tüm abonelere bırakır (beklemeden)"""
+        event = {"type": event_type, "data": data or {}}
+        self.published += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Yetişemeyen abone: kuyruğunu boşalt, kapat; UI tekrar bağlanıp yeniden çeker
+                self._subscribers.discard(queue)
+                self.dropped_subscribers += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_CLOSED)
+
+    def close(self) -> None:
+        """Tüm akışları bitirir (kapanışta, drain'den önce)"""
+        self.closed = True
+        for queue in list(self._subscribers):
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSED)
+        self._subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers
+        }
+
+
+event_broker = EventBroker()
+
+
+def is_closed_event(event: Optional[Dict[str, Any]]) -> bool:
+    return event is _CLOSED
+
+
+def _on_invoice_notify(channel: str, payload: str) -> None:
+    try:
+        data = json.loads(payload)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring malformed invoice notification: {payload!r}")
+        return
+
+    if data.get("kind") == "lines":
+        event_broker.publish("lines", {"invoice_id": data.get("invoice_id")})
+        return
+
+    status = data.get("status")
+    table_id = data.get("table_id")
+    old_table_id = data.get("old_table_id")
+    event_broker.publish("invoice", {
+        "invoice_id": data.get("invoice_id"),
+        "table_id": table_id,
+        "status": status,
+        "total_amount": data.get("total_amount"),
+        "line_count": data.get("line_count")
+    })
+    # Masa doluluğu adisyonun durumundan çıkar
+    if old_table_id is not None and old_table_id != table_id:
+        event_broker.publish("table", {"table_id": old_table_id, "occupied": False, "invoice_id": None})
+    if table_id is not None:
+        occupied = status == "OPEN"
+        event_broker.publish("table", {
+            "table_id": table_id,
+            "occupied": occupied,
+            "invoice_id": data.get("invoice_id") if occupied else None
+        })
+
+
+def _on_day_state_notify(channel: str, payload: str) -> None:
+    event_broker.publish("day_state", {"day_id": int(payload) if payload and payload.isdigit() else None})
+
+
+def _on_reconnect() -> None:
+    event_broker.publish("resync")
+
+
+def register_event_feed(listener) -> None:
+    """Adisyon ve gün kanallarını canlı akışa bağlar"""
+    listener.add_handler(INVOICE_CHANNEL, _on_invoice_notify)
+    listener.add_handler(DAY_STATE_CHANNEL, _on_day_state_notify)
+    listener.on_reconnect(_on_reconnect)
@@ -7,6 +7,7 @@ Hata tipleri:
 - ResourceNotFound: Kaynak bulunamadı
 - ClosedDayViolation: Gün kapalı hatası
 - ValidationError: Validasyon hataları
+- ServiceUnavailable: Geçici kapasite hataları (havuz dolu vb.)
 """
 
 from fastapi import HTTPException, status
@@ -92,6 +93,17 @@ class DatabaseError(MyCafeException):
         )
 
 
+class ServiceUnavailable(MyCafeException):
+    """Geçici kapasite hatası - Bağlantı havuzu dolu, istemci tekrar denemeli"""
+    def __init__(self, detail: str = "Servis geçici olarak kullanılamıyor", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            error_code="SERVICE_UNAVAILABLE",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 # Exception handler'ları FastAPI'ye eklemek için yardımcı fonksiyon
 def add_exception_handlers(app):
     """FastAPI uygulamasına exception handler'ları ekler"""
@@ -120,5 +132,18 @@ def add_exception_handlers(app):
             }
         )
     
+    @app.exception_handler(ServiceUnavailable)
+    async def service_unavailable_handler(request, exc):
+        from fastapi.responses import JSONResponse
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={
+                "detail": exc.detail,
+                "error_code": exc.error_code,
+                "type": "ServiceUnavailable"
+            },
+            headers=exc.headers
+        )
+    
     # Diğer handler'lar da benzer şekilde eklenebilir
     return app
\ No newline at end of file
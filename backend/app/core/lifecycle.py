@@ -0,0 +1,187 @@
+"""
+MyCafe - Uygulama Yaşam Döngüsü (Isınma ve Kapanış)
+
+Bu modül:
+- Açılışta çalışacak ısınma (warm-up) adımlarını tutar ve çalıştırır
+- Isınma bitene kadar sağlık kontrolünün "hazır değil" demesini sağlar
+- Önbelleklerin ısınmış olup olmadığını sağlık kontrolüne bildirir
+- Devam eden istekleri sayar; kapanışta bitmelerini bekler (drain)
+
+Kullanımı:
+    app.add_middleware(InFlightMiddleware)
+    register_warmup_step("day_state", load_day_state)
+    await run_warmup(pool)
+    ...
+    await wait_for_drain(timeout=10)
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# step(pool) -> None
+WarmupStep = Callable[[Any], Awaitable[None]]
+
+
+class WarmupState:
+    """Isınma durumu (süreç geneli)"""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round(self.finished_at - self.started_at, 3)
+        return {
+            "ready": self.ready,
+            "duration_seconds": duration,
+            "steps": self.steps
+        }
+
+
+warmup_state = WarmupState()
+_warmup_steps: List[Tuple[str, WarmupStep]] = []
+
+
+def register_warmup_step(name: str, step: WarmupStep) -> None:
+    """Açılışta sırayla çalışacak bir ısınma adımı ekler"""
+    _warmup_steps.append((name, step))
+
+
+async def run_warmup(pool) -> WarmupState:
+    """
+    Kayıtlı ısınma adımlarını sırayla çalıştırır.
+
+    Not:
+        - Hata veren adım loglanır ve durumda 'failed' görünür;
+          diğer adımlar yine çalışır (önbellekler ilk istekte kendini doldurur)
+        - Tüm adımlar bitince `ready` True olur
+    """
+    warmup_state.ready = False
+    warmup_state.started_at = time.monotonic()
+    for name, step in _warmup_steps:
+        step_started = time.monotonic()
+        try:
+            await step(pool)
+            status = "ok"
+            error = None
+        except Exception as e:
+            logger.error(f"Warm-up step '{name}' failed: {e}")
+            status = "failed"
+            error = str(e)
+        warmup_state.steps[name] = {
+            "status": status,
+            "duration_seconds": round(time.monotonic() - step_started, 3),
+            "error": error
+        }
+        logger.info(f"Warm-up step '{name}': {status}")
+    warmup_state.finished_at = time.monotonic()
+    warmup_state.ready = True
+    return warmup_state
+
+
+_cache_status: Dict[str, Callable[[], bool]] = {}
+
+
+def register_cache_status(name: str, is_warm: Callable[[], bool]) -> None:
+    """Sağlık kontrolünde 'ısınmış mı?' diye raporlanacak önbelleği ekler"""
+    _cache_status[name] = is_warm
+
+
+def get_cache_status() -> Dict[str, bool]:
+    """Kayıtlı önbelleklerin ısınma durumu"""
+    return {name: bool(is_warm()) for name, is_warm in _cache_status.items()}
+
+
+class InFlightTracker:
+    """Devam eden HTTP isteklerini sayar (kapanışta drain için)"""
+
+    def __init__(self):
+        self.count = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self.count -= 1
+        if self.count <= 0:
+            self.count = 0
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Tüm istekler bitene kadar bekler; süre dolarsa False döner"""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+in_flight = InFlightTracker()
+
+
+class InFlightMiddleware:
+    """
+    Devam eden HTTP isteklerini sayan saf ASGI middleware'i
+
+    Not:
+        - İstek; son gövde parçası (more_body=False) gönderilince, istemci
+          koptuğunda veya uygulama hata verdiğinde biter; böylece drain
+          SSE akışlarını ve dosya dışa aktarımlarını da bekler
+        - @app.middleware("http") (BaseHTTPMiddleware) kullanılmaz: call_next
+          akış yanıtlarında gövde bitmeden döner
+    """
+
+    def __init__(self, app, tracker: Optional[InFlightTracker] = None):
+        self.app = app
+        self.tracker = tracker or in_flight
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.tracker.enter()
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if not finished:
+                finished = True
+                self.tracker.exit()
+
+        async def receive_tracked():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                finish()
+            return message
+
+        async def send_tracked(message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive_tracked, send_tracked)
+        finally:
+            finish()
+
+
+async def wait_for_drain(timeout: float) -> None:
+    """Kapanışta devam eden isteklerin bitmesini bekler"""
+    if in_flight.count:
+        logger.info(f"Waiting for {in_flight.count} in-flight request(s) to finish...")
+    if not await in_flight.wait_idle(timeout):
+        logger.warning(f"Drain timed out with {in_flight.count} request(s) still running")
@@ -0,0 +1,47 @@
+"""
+MyCafe - Keyset (İmleç) Sayfalama Yardımcıları
+
+Bu modül:
+- Sayfanın son satırındaki sıralama anahtarını opak bir imlece çevirir
+- Gelen imleci çözer ve bozuksa ValidationError fırlatır
+
+İmleç UI için anlamsız bir metindir; UI sadece `next_cursor`'ı bir
+sonraki isteğe `cursor` olarak geri gönderir.
+
+Kullanımı:
+    cursor = encode_cursor(last_row['transaction_date'], last_row['id'])
+    after_date, after_id = decode_cursor(cursor)
+"""
+
+from typing import Optional, Tuple
+from datetime import datetime
+import base64
+import json
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """(transaction_date, id) ikilisini URL güvenli opak imlece çevirir"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[int]]:
+    """
+    İmleci (transaction_date, id) ikilisine çözer.
+
+    Returns:
+        İmleç yoksa (None, None)
+
+    Raises:
+        ValidationError: İmleç bozuk veya bu uç noktaya ait değil
+    """
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValidationError("Geçersiz sayfalama imleci")
@@ -0,0 +1,95 @@
+"""
+MyCafe - Tembel (Lazy) Veritabanı Bağlantısı
+
+Bu modül:
+- Havuzdan bağlantıyı ilk SQL çağrısında alır
+- Hiç SQL çalıştırmayan istek (önbellekten cevaplanan, yetkisiz vb.)
+  havuzdan bağlantı harcamaz
+- Repository'ler ve endpoint'ler normal Connection gibi kullanır
+
+Kullanımı:
+    conn = LazyConnection(pool)
+    await conn.fetchrow("SELECT 1")   # bağlantı burada alınır
+    await conn.release()
+"""
+
+from typing import Any, Optional
+import inspect
+from asyncpg import Connection
+from asyncpg.pool import Pool
+
+from app.db.pool import acquire_connection
+
+
+class LazyConnection:
+    """
+    İlk kullanımda havuzdan bağlantı alan proxy.
+
+    Not:
+        - Coroutine metodlar (fetch, fetchrow, execute, prepare...) bağlantıyı
+          otomatik alır
+        - Senkron metodlar (transaction() gibi) için önce `await conn.acquire()`
+          çağrılmalı veya resolve_connection kullanılmalı
+    """
+
+    def __init__(self, pool: Pool):
+        self._pool = pool
+        self._conn: Optional[Connection] = None
+
+    @property
+    def is_acquired(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def pool(self) -> Pool:
+        """Bağlantının alındığı havuz (ek bağlantı gerektiren işler için)"""
+        return self._pool
+
+    async def acquire(self) -> Connection:
+        """
+        Bağlantıyı alır (alınmışsa aynısını döner)
+        
+        Raises:
+            ServiceUnavailable: Havuz süre içinde bağlantı veremezse
+        """
+        if self._conn is None:
+            self._conn = await acquire_connection(self._pool)
+        return self._conn
+
+    async def release(self) -> None:
+        """Bağlantı alınmışsa havuza geri verir"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await self._pool.release(conn)
+
+    def is_in_transaction(self) -> bool:
+        return self._conn is not None and self._conn.is_in_transaction()
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is not None:
+            return getattr(self._conn, name)
+
+        attr = getattr(Connection, name)
+        if not inspect.iscoroutinefunction(attr):
+            raise RuntimeError(
+                f"LazyConnection.{name} bağlantı alınmadan kullanılamaz; "
+                "önce 'await conn.acquire()' çağrılmalı"
+            )
+
+        async def _acquire_and_call(*args, **kwargs):
+            conn = await self.acquire()
+            return await getattr(conn, name)(*args, **kwargs)
+
+        return _acquire_and_call
+
+
+async def resolve_connection(conn) -> Connection:
+    """
+    LazyConnection ise gerçek bağlantıyı alıp döner, değilse olduğu gibi döner.
+
+    Hazır sorgu önbelleği ve transaction gibi bağlantı nesnesine
+    doğrudan erişmesi gereken yerler kullanır.
+    """
+    if isinstance(conn, LazyConnection):
+        return await conn.acquire()
+    return conn
@@ -0,0 +1,126 @@
+"""
+MyCafe - Postgres LISTEN/NOTIFY Dinleyicisi
+
+Bu modül:
+- Tek bir ayrılmış (havuz dışı) bağlantı ile kanalları dinler
+- Gelen bildirimleri kayıtlı handler'lara dağıtır
+- Bağlantı koparsa tekrar bağlanmayı dener
+- Önbellekler bu dinleyici üzerinden geçersiz kılınır
+
+Kullanımı:
+    notification_listener.add_handler('mycafe_day_state', handler)
+    await notification_listener.start()
+"""
+
+from typing import Callable, Dict, List, Optional
+import asyncio
+import asyncpg
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# handler(channel, payload) imzası
+NotificationHandler = Callable[[str, str], None]
+
+
+class NotificationListener:
+    """
+    Süreç başına tek LISTEN bağlantısı.
+
+    Not:
+        - Handler'lar senkron ve hızlı olmalı (sadece önbellek güncellemesi)
+        - Bağlantı yokken `is_active` False döner; önbellekler
+          bu durumda kısa TTL'e düşer
+    """
+
+    def __init__(self, reconnect_delay: float = 5.0):
+        self._handlers: Dict[str, List[NotificationHandler]] = {}
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_delay = reconnect_delay
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._reconnect_callbacks: List[Callable[[], None]] = []
+
+    @property
+    def is_active(self) -> bool:
+        """Dinleyici bağlı ve çalışıyor mu?"""
+        return self._conn is not None and not self._conn.is_closed()
+
+    def add_handler(self, channel: str, handler: NotificationHandler) -> None:
+        """Bir kanala handler ekler (start'tan önce veya sonra çağrılabilir)"""
+        self._handlers.setdefault(channel, []).append(handler)
+        if self.is_active:
+            asyncio.get_event_loop().create_task(
+                self._conn.add_listener(channel, self._dispatch)
+            )
+
+    def on_reconnect(self, callback: Callable[[], None]) -> None:
+        """
+        Yeniden bağlanınca çağrılacak callback ekler.
+
+        Bağlantı koptuğu sürede kaçırılan bildirimler olabilir;
+        önbellekler burada kendilerini geçersiz kılar.
+        """
+        self._reconnect_callbacks.append(callback)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(channel, payload)
+            except Exception as e:
+                logger.error(f"Notification handler failed on {channel}: {e}")
+
+    def _on_termination(self, connection) -> None:
+        logger.warning("Notification listener connection lost")
+        self._conn = None
+        if not self._stopping:
+            self._reconnect_task = asyncio.get_event_loop().create_task(self._reconnect())
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(settings.DATABASE_URL)
+        for channel in self._handlers:
+            await conn.add_listener(channel, self._dispatch)
+        conn.add_termination_listener(self._on_termination)
+        self._conn = conn
+        logger.info(f"Notification listener started: {', '.join(self._handlers) or '-'}")
+
+    async def _reconnect(self) -> None:
+        while not self._stopping and not self.is_active:
+            await asyncio.sleep(self._reconnect_delay)
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.error(f"Notification listener reconnect failed: {e}")
+                continue
+            for callback in self._reconnect_callbacks:
+                callback()
+
+    async def start(self) -> None:
+        """
+        Dinleyiciyi başlatır.
+
+        Bağlanamazsa uygulamayı durdurmaz; arka planda tekrar dener.
+        """
+        self._stopping = False
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"Notification listener could not connect: {e}")
+            self._reconnect_task = asyncio.get_event_loop().create_task(self._reconnect())
+
+    async def stop(self) -> None:
+        """Dinleyiciyi durdurur ve bağlantıyı kapatır"""
+        self._stopping = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+            logger.info("Notification listener stopped")
+
+
+# Süreç geneli tek dinleyici
+notification_listener = NotificationListener()
@@ -0,0 +1,122 @@
+"""
+MyCafe - Veritabanı Bakım Komutları
+
+Bu modül:
+- Özet (rollup) tablolarını ham veriyle karşılaştırır (verify)
+- Günlük özette ayrıca eski get_daily_finance_summary'yi rollup sürümüyle
+  örnek günlerde karşılaştırır
+- Özet tabloları ham veriden yeniden kurar (rebuild)
+- API sürecinden bağımsız, komut satırından çalışır
+
+Kullanımı:
+    python -m app.db.maintenance verify daily-sales
+    python -m app.db.maintenance verify daily-sales --day-id 42
+    python -m app.db.maintenance rebuild daily-sales
+    python -m app.db.maintenance verify invoice-totals
+    python -m app.db.maintenance verify all
+
+Çıkış kodu:
+    0: tutarlı / yeniden kurma başarılı
+    1: verify sırasında fark bulundu
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import logging
+import sys
+
+import asyncpg
+
+from app.core.config import settings
+from app.cache.report_cache import notify_report_invalidation
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.invoice_repository import InvoiceRepository
+
+# rollup adı -> (verify(conn, day_id), rebuild(conn, day_id))
+RollupHandlers = Tuple[
+    Callable[[asyncpg.Connection, Optional[int]], Awaitable[List[Dict]]],
+    Callable[[asyncpg.Connection, Optional[int]], Awaitable[int]]
+]
+
+# verify daily-sales'in eski özetle karşılaştırdığı örnek gün sayısı (son + rastgele)
+SUMMARY_SAMPLE_DAYS = 14
+
+
+async def _verify_daily_sales(conn: asyncpg.Connection, day_id: Optional[int]) -> List[Dict]:
+    """Özet tabloyu ham veriyle, rollup özetini eski özet fonksiyonuyla karşılaştırır"""
+    repo = PaymentRepository(conn)
+    drift = await repo.verify_daily_rollup(day_id)
+    drift += await repo.compare_daily_summary(day_id, SUMMARY_SAMPLE_DAYS)
+    return drift
+
+
+ROLLUPS: Dict[str, RollupHandlers] = {
+    'daily-sales': (
+        _verify_daily_sales,
+        lambda conn, day_id: PaymentRepository(conn).rebuild_daily_rollup(day_id),
+    ),
+    'product-sales': (
+        lambda conn, day_id: InvoiceRepository(conn).verify_product_sales_rollup(day_id),
+        lambda conn, day_id: InvoiceRepository(conn).rebuild_product_sales_rollup(day_id),
+    ),
+    # Sadece açık adisyonlar; --day-id yok sayılır
+    'invoice-totals': (
+        lambda conn, day_id: InvoiceRepository(conn).verify_running_totals(),
+        lambda conn, day_id: InvoiceRepository(conn).rebuild_running_totals(),
+    ),
+}
+
+
+def _print_drift(name: str, rows: List[Dict]) -> None:
+    if not rows:
+        print(f"{name}: OK (fark yok)")
+        return
+    print(f"{name}: {len(rows)} satırda fark bulundu")
+    for row in rows:
+        print("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+
+
+async def run(command: str, rollup_names: List[str], day_id: Optional[int]) -> int:
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    exit_code = 0
+    try:
+        for name in rollup_names:
+            verify, rebuild = ROLLUPS[name]
+            if command == 'verify':
+                drift = await verify(conn, day_id)
+                _print_drift(name, drift)
+                if drift:
+                    exit_code = 1
+            else:
+                async with conn.transaction():
+                    rows = await rebuild(conn, day_id)
+                print(f"{name}: yeniden kuruldu ({rows} özet satırı)")
+                # Çalışan API süreçleri eski raporları önbellekten atsın
+                await notify_report_invalidation(conn, day_id=day_id)
+    finally:
+        await conn.close()
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.db.maintenance",
+        description="MyCafe özet tablo bakımı"
+    )
+    parser.add_argument('command', choices=['verify', 'rebuild'])
+    parser.add_argument(
+        'rollup',
+        choices=sorted(ROLLUPS) + ['all'],
+        help="Özet tablo adı ('all': hepsi)"
+    )
+    parser.add_argument('--day-id', type=int, default=None, help="Sadece bu gün")
+    args = parser.parse_args(argv)
+
+    names = sorted(ROLLUPS) if args.rollup == 'all' else [args.rollup]
+    logging.basicConfig(level=logging.INFO)
+    return asyncio.run(run(args.command, names, args.day_id))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
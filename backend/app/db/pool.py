@@ -0,0 +1,185 @@
+"""
+MyCafe - Veritabanı Bağlantı Havuzu ve Metrikleri
+
+Bu modül:
+- asyncpg havuzunu Settings'teki değerlerle oluşturur
+- Bağlantı alma (acquire) bekleme süresini histogramda tutar
+- Zaman aşımlarını ve bağlantı açılma/kapanma (churn) sayılarını sayar
+- Havuz doluysa isteği command_timeout kadar bekletmez, hızlıca 503 döner
+
+Kullanımı:
+    pool = await create_db_pool()
+    async with pooled_connection(pool) as conn:
+        ...
+"""
+
+from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import time
+import logging
+
+from asyncpg import create_pool
+from asyncpg.pool import Pool
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailable
+from app.db.statements import MyCafeConnection, prepare_hot_statements
+
+logger = logging.getLogger(__name__)
+
+# Bekleme süresi histogramı sınırları (saniye)
+ACQUIRE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolMetrics:
+    """Havuz sayaçları (süreç geneli)"""
+
+    def __init__(self, buckets=ACQUIRE_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts: List[int] = [0] * (len(buckets) + 1)
+        self.acquire_count = 0
+        self.acquire_wait_sum = 0.0
+        self.acquire_timeouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+
+    def observe_acquire(self, seconds: float) -> None:
+        self.acquire_count += 1
+        self.acquire_wait_sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def histogram(self) -> List[Dict[str, Any]]:
+        """Kümülatif histogram ({'le': sınır, 'count': adet})"""
+        result = []
+        running = 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.bucket_counts):
+            running += count
+            result.append({"le": bound, "count": running})
+        return result
+
+
+pool_metrics = PoolMetrics()
+
+
+def _on_connection_closed(conn) -> None:
+    pool_metrics.connections_closed += 1
+
+
+async def _init_connection(conn) -> None:
+    """Havuz yeni fiziksel bağlantı açtığında çağrılır"""
+    pool_metrics.connections_opened += 1
+    conn.add_termination_listener(_on_connection_closed)
+
+
+async def create_db_pool() -> Pool:
+    """Havuzu Settings'teki değerlerle oluşturur"""
+    return await create_pool(
+        settings.DATABASE_URL,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        command_timeout=settings.DB_COMMAND_TIMEOUT,
+        max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+        connection_class=MyCafeConnection,
+        init=_init_connection
+    )
+
+
+async def acquire_connection(pool: Pool, timeout: Optional[float] = None):
+    """
+    Havuzdan süre sınırlı bağlantı alır.
+
+    Args:
+        pool: asyncpg havuzu
+        timeout: Maksimum bekleme (saniye), None ise DB_POOL_ACQUIRE_TIMEOUT
+
+    Raises:
+        ServiceUnavailable: Süre içinde boş bağlantı bulunamazsa (503)
+    """
+    if timeout is None:
+        timeout = settings.DB_POOL_ACQUIRE_TIMEOUT
+    started = time.perf_counter()
+    try:
+        conn = await pool.acquire(timeout=timeout)
+    except asyncio.TimeoutError:
+        pool_metrics.acquire_timeouts += 1
+        logger.warning(f"Pool acquire timed out after {timeout}s")
+        raise ServiceUnavailable("Veritabanı bağlantı havuzu dolu, lütfen tekrar deneyin")
+    pool_metrics.observe_acquire(time.perf_counter() - started)
+    return conn
+
+
+@asynccontextmanager
+async def pooled_connection(pool: Pool, timeout: Optional[float] = None):
+    """acquire_connection'ın context manager hali"""
+    conn = await acquire_connection(pool, timeout)
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+async def warm_pool(pool: Pool) -> None:
+    """
+    Havuzu min_size'a kadar doldurur ve her bağlantıda sıcak sorguları hazırlar.
+
+    Not:
+        min_size kadar bağlantı aynı anda alınır; böylece her fiziksel
+        bağlantı açılmış ve hazır sorgularını edinmiş olur.
+    """
+    conns = await asyncio.gather(
+        *[acquire_connection(pool) for _ in range(pool.get_min_size())]
+    )
+    try:
+        prepared = await asyncio.gather(*[prepare_hot_statements(c) for c in conns])
+        logger.info(
+            f"Pool warmed: {len(conns)} connection(s), {sum(prepared)} statement(s) prepared"
+        )
+    finally:
+        for conn in conns:
+            await pool.release(conn)
+
+
+def get_pool_stats(pool: Optional[Pool]) -> Dict[str, Any]:
+    """
+    Havuz doluluk ve bekleme istatistikleri.
+
+    Returns:
+        {
+            'size': int,            # Açık fiziksel bağlantı
+            'in_use': int,          # Kullanımdaki bağlantı
+            'idle': int,            # Boştaki bağlantı
+            'min_size': int,
+            'max_size': int,
+            'saturation': float,    # in_use / max_size
+            'acquire': {...},       # Bekleme süresi histogramı
+            'churn': {...}          # Açılan/kapanan bağlantılar
+        }
+    """
+    size = pool.get_size() if pool else 0
+    idle = pool.get_idle_size() if pool else 0
+    max_size = pool.get_max_size() if pool else settings.DB_POOL_MAX_SIZE
+    in_use = size - idle
+    return {
+        "size": size,
+        "in_use": in_use,
+        "idle": idle,
+        "min_size": pool.get_min_size() if pool else settings.DB_POOL_MIN_SIZE,
+        "max_size": max_size,
+        "saturation": round(in_use / max_size, 4) if max_size else 0.0,
+        "acquire": {
+            "count": pool_metrics.acquire_count,
+            "wait_seconds_sum": round(pool_metrics.acquire_wait_sum, 6),
+            "timeouts": pool_metrics.acquire_timeouts,
+            "timeout_seconds": settings.DB_POOL_ACQUIRE_TIMEOUT,
+            "histogram": pool_metrics.histogram()
+        },
+        "churn": {
+            "opened": pool_metrics.connections_opened,
+            "closed": pool_metrics.connections_closed
+        }
+    }
@@ -0,0 +1,101 @@
+"""
+MyCafe - Veritabanı Sağlık Sondası
+
+Bu modül:
+- Zaman aşımlı `SELECT 1` ile DB'ye gidiş-dönüş süresini ölçer
+- Sonucu kısa süre önbellekte tutar (yük dengeleyici sık sorsa da DB yorulmaz)
+- Son ölçümlerden gecikme yüzdeliklerini (p50/p95/p99) hesaplar
+"""
+
+from typing import Any, Dict, Optional
+from collections import deque
+import asyncio
+import time
+import logging
+
+from app.core.config import settings
+from app.db.pool import acquire_connection
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values, pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class DatabaseProbe:
+    """
+    Önbellekli DB sondası
+
+    Args:
+        timeout: Sonda zaman aşımı (bağlantı alma + sorgu), saniye
+        cache_seconds: Sonucun tekrar kullanılacağı süre, saniye
+        window: Yüzdelik hesabı için saklanan ölçüm sayısı
+    """
+
+    def __init__(self, timeout: float, cache_seconds: float, window: int = 100):
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self._latencies = deque(maxlen=window)
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_checked: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.failures = 0
+
+    async def _run(self, pool) -> Dict[str, Any]:
+        started = time.perf_counter()
+        conn = None
+        try:
+            conn = await acquire_connection(pool, timeout=self.timeout)
+            await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=self.timeout)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Database probe failed: {e}")
+            return {"ok": False, "error": str(e) or e.__class__.__name__}
+        finally:
+            if conn is not None:
+                await pool.release(conn)
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._latencies.append(latency_ms)
+        return {"ok": True, "latency_ms": round(latency_ms, 3)}
+
+    async def check(self, pool) -> Dict[str, Any]:
+        """
+        Sonda sonucunu döner (önbellek süresi dolmadıysa son sonuç).
+
+        Returns:
+            {'ok': bool, 'latency_ms': float, 'cached': bool, 'error': str?}
+        """
+        if pool is None:
+            return {"ok": False, "error": "Havuz oluşturulmadı", "cached": False}
+
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self._last_result is not None
+                and now - self._last_checked < self.cache_seconds
+            ):
+                return {**self._last_result, "cached": True}
+
+            self._last_result = await self._run(pool)
+            self._last_checked = time.monotonic()
+            return {**self._last_result, "cached": False}
+
+    def latency_percentiles(self) -> Dict[str, Optional[float]]:
+        """Son ölçümlerin gecikme yüzdelikleri (ms)"""
+        values = sorted(self._latencies)
+        return {
+            "samples": len(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99)
+        }
+
+
+database_probe = DatabaseProbe(
+    timeout=settings.HEALTH_PROBE_TIMEOUT,
+    cache_seconds=settings.HEALTH_PROBE_CACHE_SECONDS
+)
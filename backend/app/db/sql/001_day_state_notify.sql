@@ -0,0 +1,23 @@
+-- MyCafe - Gün durumu değişiklik bildirimi
+--
+-- daymarker tablosunda gün açılıp kapandığında 'mycafe_day_state'
+-- kanalına NOTIFY gönderir. API süreçleri bu kanalı dinleyip
+-- gün durumu önbelleğini (app/cache/day_state.py) geçersiz kılar.
+-- Bildirim COMMIT anında teslim edilir; geri alınan işlemler bildirim üretmez.
+
+CREATE OR REPLACE FUNCTION notify_day_state_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('mycafe_day_state', COALESCE(NEW.id, OLD.id)::text);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_daymarker_notify ON daymarker;
+
+CREATE TRIGGER trg_daymarker_notify
+AFTER INSERT OR UPDATE OR DELETE ON daymarker
+FOR EACH ROW
+EXECUTE FUNCTION notify_day_state_changed();
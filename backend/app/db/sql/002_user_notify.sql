@@ -0,0 +1,34 @@
+-- MyCafe - Kullanıcı/rol değişiklik bildirimi
+--
+-- app_user satırında rol veya aktiflik değiştiğinde 'mycafe_user_changed'
+-- kanalına kullanıcı ID'si gönderilir. Rol tablosu değişirse payload boş
+-- gider ve API süreçleri tüm kullanıcı önbelleğini temizler
+-- (app/cache/user_cache.py).
+
+CREATE OR REPLACE FUNCTION notify_user_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'app_user' THEN
+        PERFORM pg_notify('mycafe_user_changed', COALESCE(NEW.id, OLD.id)::text);
+    ELSE
+        PERFORM pg_notify('mycafe_user_changed', '');
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_app_user_notify ON app_user;
+
+CREATE TRIGGER trg_app_user_notify
+AFTER UPDATE OF role_id, is_active, username, full_name OR DELETE ON app_user
+FOR EACH ROW
+EXECUTE FUNCTION notify_user_changed();
+
+DROP TRIGGER IF EXISTS trg_role_notify ON role;
+
+CREATE TRIGGER trg_role_notify
+AFTER UPDATE OR DELETE ON role
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_user_changed();
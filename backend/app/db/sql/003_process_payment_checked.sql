@@ -0,0 +1,81 @@
+-- MyCafe - Tek gidiş-dönüşte kontrollü ödeme
+--
+-- PaymentService.process_payment daha önce ödemeden önce üç ayrı sorgu
+-- yapıyordu (is_day_open, get_invoice, validate_payment_amount) ve
+-- ardından process_payment_atomic çağırıyordu. Bu fonksiyon aynı
+-- kontrolleri aynı prosedürlerle DB içinde yapar ve tek çağrıda döner.
+--
+-- Dönüş 'status' kolonu hatanın nedenini taşır; API katmanı bunu
+-- ClosedDayViolation / ResourceNotFound / BusinessRuleViolation'a çevirir:
+--   OK                -> ödeme yapıldı, diğer kolonlar dolu
+--   DAY_CLOSED        -> gün kapalı
+--   INVOICE_NOT_FOUND -> adisyon yok
+--   INVOICE_NOT_OPEN  -> adisyon OPEN değil (invoice_status dolu)
+--   INVALID_AMOUNT    -> tutar geçersiz (message dolu)
+
+CREATE OR REPLACE FUNCTION process_payment_checked(
+    p_invoice_id      integer,
+    p_payment_method  text,
+    p_amount          numeric,
+    p_processed_by    integer,
+    p_customer_id     integer,
+    p_description     text
+)
+RETURNS TABLE (
+    status               text,
+    message              text,
+    invoice_status       text,
+    transaction_id       bigint,
+    invoice_closed       boolean,
+    table_freed          boolean,
+    billiard_calculated  boolean,
+    new_balance          numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_day_open    boolean;
+    v_invoice     record;
+    v_validation  record;
+    v_payment     record;
+BEGIN
+    SELECT d.is_open INTO v_day_open FROM is_day_open() d;
+    IF NOT COALESCE(v_day_open, false) THEN
+        RETURN QUERY SELECT 'DAY_CLOSED'::text, NULL::text, NULL::text,
+            NULL::bigint, NULL::boolean, NULL::boolean, NULL::boolean, NULL::numeric;
+        RETURN;
+    END IF;
+
+    SELECT * INTO v_invoice FROM get_invoice(p_invoice_id);
+    IF NOT FOUND OR v_invoice.id IS NULL THEN
+        RETURN QUERY SELECT 'INVOICE_NOT_FOUND'::text, NULL::text, NULL::text,
+            NULL::bigint, NULL::boolean, NULL::boolean, NULL::boolean, NULL::numeric;
+        RETURN;
+    END IF;
+
+    IF v_invoice.status <> 'OPEN' THEN
+        RETURN QUERY SELECT 'INVOICE_NOT_OPEN'::text, NULL::text, v_invoice.status::text,
+            NULL::bigint, NULL::boolean, NULL::boolean, NULL::boolean, NULL::numeric;
+        RETURN;
+    END IF;
+
+    SELECT * INTO v_validation FROM validate_payment_amount(p_invoice_id, p_amount);
+    IF NOT COALESCE(v_validation.is_valid, false) THEN
+        RETURN QUERY SELECT 'INVALID_AMOUNT'::text, v_validation.message::text, NULL::text,
+            NULL::bigint, NULL::boolean, NULL::boolean, NULL::boolean, NULL::numeric;
+        RETURN;
+    END IF;
+
+    SELECT * INTO v_payment FROM process_payment_atomic(
+        p_invoice_id, p_payment_method, p_amount,
+        p_processed_by, p_customer_id, p_description
+    );
+
+    RETURN QUERY SELECT 'OK'::text, NULL::text, 'CLOSED'::text,
+        v_payment.transaction_id::bigint,
+        v_payment.invoice_closed::boolean,
+        v_payment.table_freed::boolean,
+        v_payment.billiard_calculated::boolean,
+        v_payment.new_balance::numeric;
+END;
+$$;
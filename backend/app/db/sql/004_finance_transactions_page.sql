@@ -0,0 +1,60 @@
+-- MyCafe - Finans hareketleri için keyset (imleç) sayfalama
+--
+-- get_finance_transactions tüm tarih aralığını döndürüyordu; API katmanı
+-- sonra Python'da offset/limit ile kesiyordu. Bu fonksiyon sayfalamayı
+-- sorguya indirir: (transaction_date, id) ikilisine göre yeniden eskiye
+-- sıralar ve imleçten sonraki en fazla p_limit satırı döner.
+--
+-- İmleç (p_after_date, p_after_id) önceki sayfanın son satırıdır; ilk
+-- sayfada ikisi de NULL verilir. Bileşik indeks sayesinde sayfa ne kadar
+-- derinde olursa olsun maliyet sabittir (OFFSET gibi satır atlamaz).
+
+CREATE INDEX IF NOT EXISTS ix_financetransaction_date_id
+    ON financetransaction (transaction_date DESC, id DESC);
+
+CREATE OR REPLACE FUNCTION get_finance_transactions_page(
+    p_start_date        date,
+    p_end_date          date,
+    p_transaction_type  text,
+    p_after_date        timestamp,
+    p_after_id          integer,
+    p_limit             integer
+)
+RETURNS TABLE (
+    id                integer,
+    transaction_date  timestamp,
+    day_id            integer,
+    invoice_id        integer,
+    transaction_type  text,
+    amount            numeric,
+    payment_method    text,
+    description       text,
+    created_by        integer,
+    created_by_name   text
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        ft.id,
+        ft.transaction_date,
+        ft.day_id,
+        ft.invoice_id,
+        ft.transaction_type::text,
+        ft.amount,
+        ft.payment_method::text,
+        ft.description,
+        ft.created_by,
+        u.full_name::text
+    FROM financetransaction ft
+    LEFT JOIN app_user u ON u.id = ft.created_by
+    WHERE (p_start_date IS NULL OR ft.transaction_date >= p_start_date)
+      AND (p_end_date IS NULL OR ft.transaction_date < p_end_date + 1)
+      AND (p_transaction_type IS NULL OR ft.transaction_type = p_transaction_type)
+      AND (
+          p_after_id IS NULL
+          OR (ft.transaction_date, ft.id) < (p_after_date, p_after_id)
+      )
+    ORDER BY ft.transaction_date DESC, ft.id DESC
+    LIMIT p_limit;
+$$;
@@ -0,0 +1,248 @@
+-- MyCafe - Artımlı günlük satış özeti (rollup)
+--
+-- get_daily_finance_summary her çağrıda günün tüm financetransaction
+-- satırlarını yeniden topluyordu. Bu dosya gün × hareket tipi × ödeme
+-- tipi başına tutar ve adet tutan bir özet tablo ekler.
+--
+-- Tablo financetransaction üzerindeki satır tetikleyicisiyle güncellenir.
+-- process_payment_atomic, pay_customer_debt, process_refund ve
+-- correct_customer_debt hepsi financetransaction'a yazdığı için özet,
+-- hareketle AYNI transaction'da değişir; geri alınan işlem özeti de geri alır.
+--
+-- Bakım:
+--   verify_daily_sales_rollup(day_id)  -> ham veriyle farkları listeler
+--   rebuild_daily_sales_rollup(day_id) -> özeti ham veriden yeniden kurar
+--   compare_daily_finance_summary(day_id, sample)
+--                                       -> eski get_daily_finance_summary ile
+--                                          get_daily_finance_summary_rollup'ı
+--                                          örnek günlerde kolon kolon karşılaştırır
+--   (NULL: tüm günler / örnek günler; bkz. python -m app.db.maintenance)
+--
+-- get_daily_finance_summary ile bilinen (kasıtlı) farklar:
+--   - Hareketsiz gün için rollup sıfırlarla dolu tek satır döner; eski
+--     fonksiyonun NULL dönmesi fark sayılmaz (karşılaştırmada NULL = 0)
+--   - Kolonlar özetteki tip / ödeme tipi gruplarından türetilir:
+--       total_sales       = SALES hareketleri
+--       cash_total        = ödeme tipi CASH olan TÜM hareketler
+--       credit_card_total = ödeme tipi CREDIT_CARD olan TÜM hareketler
+--       debt_created      = DEBT, debt_paid = DEBT_PAYMENT
+--       transaction_count = günün tüm hareketleri
+--     Eski fonksiyon bunlardan birini farklı tanımlıyorsa (ör. cash_total'a
+--     sadece SALES'i katıyorsa) compare_daily_finance_summary farkı gösterir;
+--     o durumda tanım eski fonksiyona uydurulmalıdır.
+
+CREATE TABLE IF NOT EXISTS daily_sales_rollup (
+    day_id             integer   NOT NULL,
+    transaction_type   text      NOT NULL,
+    payment_method     text      NOT NULL DEFAULT '',  -- NULL yerine ''
+    total_amount       numeric   NOT NULL DEFAULT 0,
+    transaction_count  integer   NOT NULL DEFAULT 0,
+    updated_at         timestamp NOT NULL DEFAULT now(),
+    PRIMARY KEY (day_id, transaction_type, payment_method)
+);
+
+
+CREATE OR REPLACE FUNCTION apply_daily_sales_rollup(
+    p_day_id            integer,
+    p_transaction_type  text,
+    p_payment_method    text,
+    p_amount            numeric,
+    p_count             integer
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO daily_sales_rollup AS r
+        (day_id, transaction_type, payment_method, total_amount, transaction_count)
+    VALUES
+        (p_day_id, p_transaction_type, COALESCE(p_payment_method, ''), p_amount, p_count)
+    ON CONFLICT (day_id, transaction_type, payment_method) DO UPDATE
+    SET total_amount = r.total_amount + EXCLUDED.total_amount,
+        transaction_count = r.transaction_count + EXCLUDED.transaction_count,
+        updated_at = now();
+$$;
+
+
+CREATE OR REPLACE FUNCTION financetransaction_rollup_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_daily_sales_rollup(
+            OLD.day_id, OLD.transaction_type::text, OLD.payment_method::text,
+            -OLD.amount, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_daily_sales_rollup(
+            NEW.day_id, NEW.transaction_type::text, NEW.payment_method::text,
+            NEW.amount, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_financetransaction_rollup ON financetransaction;
+
+CREATE TRIGGER trg_financetransaction_rollup
+    AFTER INSERT OR DELETE OR UPDATE OF day_id, transaction_type, payment_method, amount
+    ON financetransaction
+    FOR EACH ROW
+    EXECUTE FUNCTION financetransaction_rollup_trigger();
+
+
+-- get_daily_finance_summary ile aynı kolonlar; ham tablo yerine özetten okur.
+-- Gün başına en fazla (hareket tipi × ödeme tipi) kadar satır okunur.
+CREATE OR REPLACE FUNCTION get_daily_finance_summary_rollup(p_day_id integer)
+RETURNS TABLE (
+    total_sales        numeric,
+    cash_total         numeric,
+    credit_card_total  numeric,
+    debt_created       numeric,
+    debt_paid          numeric,
+    transaction_count  bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'SALES'), 0),
+        COALESCE(SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CASH'), 0),
+        COALESCE(SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CREDIT_CARD'), 0),
+        COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT'), 0),
+        COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT_PAYMENT'), 0),
+        COALESCE(SUM(r.transaction_count), 0)::bigint
+    FROM daily_sales_rollup r
+    WHERE r.day_id = p_day_id;
+$$;
+
+
+-- Özet ile ham veri arasındaki farklar (boş sonuç = tutarlı)
+CREATE OR REPLACE FUNCTION verify_daily_sales_rollup(p_day_id integer)
+RETURNS TABLE (
+    day_id            integer,
+    transaction_type  text,
+    payment_method    text,
+    rollup_amount     numeric,
+    actual_amount     numeric,
+    rollup_count      integer,
+    actual_count      integer
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH actual AS (
+        SELECT ft.day_id,
+               ft.transaction_type::text AS transaction_type,
+               COALESCE(ft.payment_method::text, '') AS payment_method,
+               SUM(ft.amount) AS amount,
+               COUNT(*)::integer AS cnt
+        FROM financetransaction ft
+        WHERE p_day_id IS NULL OR ft.day_id = p_day_id
+        GROUP BY 1, 2, 3
+    ),
+    rollup AS (
+        SELECT r.day_id, r.transaction_type, r.payment_method,
+               r.total_amount AS amount, r.transaction_count AS cnt
+        FROM daily_sales_rollup r
+        WHERE p_day_id IS NULL OR r.day_id = p_day_id
+    )
+    SELECT
+        COALESCE(a.day_id, r.day_id),
+        COALESCE(a.transaction_type, r.transaction_type),
+        COALESCE(a.payment_method, r.payment_method),
+        COALESCE(r.amount, 0),
+        COALESCE(a.amount, 0),
+        COALESCE(r.cnt, 0),
+        COALESCE(a.cnt, 0)
+    FROM actual a
+    FULL JOIN rollup r
+        ON r.day_id = a.day_id
+       AND r.transaction_type = a.transaction_type
+       AND r.payment_method = a.payment_method
+    WHERE COALESCE(r.amount, 0) <> COALESCE(a.amount, 0)
+       OR COALESCE(r.cnt, 0) <> COALESCE(a.cnt, 0)
+    ORDER BY 1, 2, 3;
+$$;
+
+
+-- Özeti ham veriden yeniden kurar; yazılan özet satırı sayısını döner.
+-- Yeniden kurma sürerken yeni finans hareketi yazılmasın diye
+-- financetransaction SHARE kipinde kilitlenir (yazanlar kısa süre bekler).
+CREATE OR REPLACE FUNCTION rebuild_daily_sales_rollup(p_day_id integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows integer;
+BEGIN
+    LOCK TABLE financetransaction IN SHARE MODE;
+
+    DELETE FROM daily_sales_rollup r
+    WHERE p_day_id IS NULL OR r.day_id = p_day_id;
+
+    INSERT INTO daily_sales_rollup
+        (day_id, transaction_type, payment_method, total_amount, transaction_count)
+    SELECT ft.day_id,
+           ft.transaction_type::text,
+           COALESCE(ft.payment_method::text, ''),
+           SUM(ft.amount),
+           COUNT(*)
+    FROM financetransaction ft
+    WHERE p_day_id IS NULL OR ft.day_id = p_day_id
+    GROUP BY 1, 2, 3;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+
+-- Eski (ham veriyi toplayan) özet ile rollup özetini karşılaştırır; boş sonuç = aynı.
+-- p_day_id verilirse sadece o gün, NULL ise son p_sample gün + rastgele p_sample gün.
+CREATE OR REPLACE FUNCTION compare_daily_finance_summary(
+    p_day_id  integer,
+    p_sample  integer DEFAULT 14
+)
+RETURNS TABLE (
+    day_id        integer,
+    column_name   text,
+    legacy_value  numeric,
+    rollup_value  numeric
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH days AS (
+        SELECT d.id FROM daymarker d
+        WHERE p_day_id IS NOT NULL AND d.id = p_day_id
+        UNION
+        (SELECT d.id FROM daymarker d
+         WHERE p_day_id IS NULL
+         ORDER BY d.id DESC LIMIT p_sample)
+        UNION
+        (SELECT d.id FROM daymarker d
+         WHERE p_day_id IS NULL
+         ORDER BY random() LIMIT p_sample)
+    )
+    SELECT days.id, c.column_name, c.legacy_value, c.rollup_value
+    FROM days
+    LEFT JOIN LATERAL get_daily_finance_summary(days.id) l ON true
+    LEFT JOIN LATERAL get_daily_finance_summary_rollup(days.id) r ON true
+    CROSS JOIN LATERAL (VALUES
+        ('total_sales',       COALESCE(l.total_sales, 0)::numeric,       r.total_sales),
+        ('cash_total',        COALESCE(l.cash_total, 0)::numeric,        r.cash_total),
+        ('credit_card_total', COALESCE(l.credit_card_total, 0)::numeric, r.credit_card_total),
+        ('debt_created',      COALESCE(l.debt_created, 0)::numeric,      r.debt_created),
+        ('debt_paid',         COALESCE(l.debt_paid, 0)::numeric,         r.debt_paid),
+        ('transaction_count', COALESCE(l.transaction_count, 0)::numeric, r.transaction_count::numeric)
+    ) AS c(column_name, legacy_value, rollup_value)
+    WHERE c.legacy_value IS DISTINCT FROM c.rollup_value
+    ORDER BY 1, 2;
+$$;
+
+
+-- Kurulumda mevcut veriden ilk doldurma
+SELECT rebuild_daily_sales_rollup(NULL);
@@ -0,0 +1,268 @@
+-- MyCafe - Gün × ürün satış özeti
+--
+-- Ürün bazlı rapor her istekte tüm invoiceline satırlarını taramak yerine
+-- bu özet tablodan okunur: her gün için ürün başına tek satır. Bir tarih
+-- aralığının raporu, ürün başına en fazla gün sayısı kadar satırın
+-- toplamıdır; maliyet ham satır sayısıyla büyümez (çok yıllık aralık da ucuz).
+--
+-- Doldurma:
+--   - Adisyon OPEN -> CLOSED olduğunda tetikleyici satırlarını özete ekler
+--     (ödemeyle aynı transaction'da)
+--   - Kapalı adisyonda bir satır silinir / geri alınırsa (is_deleted değişirse)
+--     satırın miktarı ve tutarı özetten düşülür / özete geri eklenir
+--   - rebuild_daily_product_sales(day_id) özeti ham veriden yeniden kurar
+--   - verify_daily_product_sales(day_id) farkları listeler
+--   (NULL: tüm günler; bkz. python -m app.db.maintenance)
+--
+-- Sadece ürüne bağlı satırlar (product_id dolu) özetlenir. Silinmiş
+-- (soft delete, remove_invoice_line) satırlar satış sayılmaz; kural
+-- invoiceline_counts(is_deleted) içinde tek yerde tanımlıdır ve yürüyen
+-- adisyon toplamı (012) da aynı fonksiyonu kullanır. Ürün adı ve
+-- kategori okuma anında product / category tablolarından alınır.
+
+CREATE TABLE IF NOT EXISTS daily_product_sales (
+    day_id        integer   NOT NULL,
+    day_date      date      NOT NULL,
+    product_id    integer   NOT NULL,
+    quantity      numeric   NOT NULL DEFAULT 0,
+    total_amount  numeric   NOT NULL DEFAULT 0,
+    line_count    integer   NOT NULL DEFAULT 0,
+    updated_at    timestamp NOT NULL DEFAULT now(),
+    PRIMARY KEY (day_id, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_daily_product_sales_date
+    ON daily_product_sales (day_date, product_id);
+
+
+-- Satır satışa / adisyon toplamına dahil mi? (soft delete kuralı burada)
+CREATE OR REPLACE FUNCTION invoiceline_counts(p_is_deleted boolean)
+RETURNS boolean
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT NOT COALESCE(p_is_deleted, false);
+$$;
+
+
+CREATE OR REPLACE FUNCTION apply_daily_product_sales(
+    p_day_id      integer,
+    p_product_id  integer,
+    p_quantity    numeric,
+    p_amount      numeric,
+    p_count       integer
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO daily_product_sales AS s
+        (day_id, day_date, product_id, quantity, total_amount, line_count)
+    SELECT p_day_id, d.day_date, p_product_id, p_quantity, p_amount, p_count
+    FROM daymarker d
+    WHERE d.id = p_day_id
+    ON CONFLICT (day_id, product_id) DO UPDATE
+    SET quantity = s.quantity + EXCLUDED.quantity,
+        total_amount = s.total_amount + EXCLUDED.total_amount,
+        line_count = s.line_count + EXCLUDED.line_count,
+        updated_at = now();
+$$;
+
+
+CREATE OR REPLACE FUNCTION invoice_product_sales_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO daily_product_sales AS s
+        (day_id, day_date, product_id, quantity, total_amount, line_count)
+    SELECT NEW.day_id, d.day_date, il.product_id,
+           SUM(il.quantity), SUM(il.line_total), COUNT(*)
+    FROM invoiceline il
+    JOIN daymarker d ON d.id = NEW.day_id
+    WHERE il.invoice_id = NEW.id
+      AND il.product_id IS NOT NULL
+      AND invoiceline_counts(il.is_deleted)
+    GROUP BY d.day_date, il.product_id
+    ON CONFLICT (day_id, product_id) DO UPDATE
+    SET quantity = s.quantity + EXCLUDED.quantity,
+        total_amount = s.total_amount + EXCLUDED.total_amount,
+        line_count = s.line_count + EXCLUDED.line_count,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_invoice_product_sales ON invoice;
+
+CREATE TRIGGER trg_invoice_product_sales
+    AFTER UPDATE OF status ON invoice
+    FOR EACH ROW
+    WHEN (OLD.status = 'OPEN' AND NEW.status = 'CLOSED')
+    EXECUTE FUNCTION invoice_product_sales_trigger();
+
+
+-- Kapalı adisyonda satır silinir / geri alınırsa özeti düzeltir.
+-- Açık adisyonun satırları özete henüz girmediği için dokunulmaz.
+CREATE OR REPLACE FUNCTION invoiceline_product_sales_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_day_id integer;
+    v_sign   integer;
+BEGIN
+    IF NEW.product_id IS NULL
+       OR invoiceline_counts(OLD.is_deleted) = invoiceline_counts(NEW.is_deleted) THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT i.day_id INTO v_day_id
+    FROM invoice i
+    WHERE i.id = NEW.invoice_id
+      AND i.status = 'CLOSED';
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    v_sign := CASE WHEN invoiceline_counts(NEW.is_deleted) THEN 1 ELSE -1 END;
+    PERFORM apply_daily_product_sales(
+        v_day_id, NEW.product_id,
+        v_sign * NEW.quantity, v_sign * NEW.line_total, v_sign
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_invoiceline_product_sales ON invoiceline;
+
+CREATE TRIGGER trg_invoiceline_product_sales
+    AFTER UPDATE OF is_deleted ON invoiceline
+    FOR EACH ROW
+    WHEN (OLD.is_deleted IS DISTINCT FROM NEW.is_deleted)
+    EXECUTE FUNCTION invoiceline_product_sales_trigger();
+
+
+-- Tarih aralığında ürün bazlı satış (kategori filtresi opsiyonel)
+CREATE OR REPLACE FUNCTION get_product_sales_range(
+    p_start_date   date,
+    p_end_date     date,
+    p_category_id  integer
+)
+RETURNS TABLE (
+    product_id     integer,
+    product_name   text,
+    category_id    integer,
+    category_name  text,
+    quantity       numeric,
+    total_amount   numeric,
+    line_count     bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.product_id,
+           p.name::text,
+           p.category_id,
+           COALESCE(c.name::text, 'Diğer'),
+           SUM(s.quantity),
+           SUM(s.total_amount),
+           SUM(s.line_count)::bigint
+    FROM daily_product_sales s
+    JOIN product p ON p.id = s.product_id
+    LEFT JOIN category c ON c.id = p.category_id
+    WHERE s.day_date BETWEEN p_start_date AND p_end_date
+      AND (p_category_id IS NULL OR p.category_id = p_category_id)
+    GROUP BY s.product_id, p.name, p.category_id, c.name
+    ORDER BY SUM(s.total_amount) DESC, s.product_id;
+$$;
+
+
+-- Kapalı adisyonlardan beklenen özet (rebuild / verify ortak kaynağı)
+CREATE OR REPLACE FUNCTION compute_daily_product_sales(p_day_id integer)
+RETURNS TABLE (
+    day_id        integer,
+    day_date      date,
+    product_id    integer,
+    quantity      numeric,
+    total_amount  numeric,
+    line_count    integer
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT i.day_id, d.day_date, il.product_id,
+           SUM(il.quantity), SUM(il.line_total), COUNT(*)::integer
+    FROM invoice i
+    JOIN daymarker d ON d.id = i.day_id
+    JOIN invoiceline il ON il.invoice_id = i.id
+    WHERE i.status = 'CLOSED'
+      AND il.product_id IS NOT NULL
+      AND invoiceline_counts(il.is_deleted)
+      AND (p_day_id IS NULL OR i.day_id = p_day_id)
+    GROUP BY i.day_id, d.day_date, il.product_id;
+$$;
+
+
+CREATE OR REPLACE FUNCTION verify_daily_product_sales(p_day_id integer)
+RETURNS TABLE (
+    day_id           integer,
+    product_id       integer,
+    rollup_quantity  numeric,
+    actual_quantity  numeric,
+    rollup_amount    numeric,
+    actual_amount    numeric
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH actual AS (
+        SELECT * FROM compute_daily_product_sales(p_day_id)
+    ),
+    rollup AS (
+        SELECT s.day_id, s.product_id, s.quantity, s.total_amount
+        FROM daily_product_sales s
+        WHERE p_day_id IS NULL OR s.day_id = p_day_id
+    )
+    SELECT COALESCE(a.day_id, r.day_id),
+           COALESCE(a.product_id, r.product_id),
+           COALESCE(r.quantity, 0),
+           COALESCE(a.quantity, 0),
+           COALESCE(r.total_amount, 0),
+           COALESCE(a.total_amount, 0)
+    FROM actual a
+    FULL JOIN rollup r
+        ON r.day_id = a.day_id
+       AND r.product_id = a.product_id
+    WHERE COALESCE(r.quantity, 0) <> COALESCE(a.quantity, 0)
+       OR COALESCE(r.total_amount, 0) <> COALESCE(a.total_amount, 0)
+    ORDER BY 1, 2;
+$$;
+
+
+-- Özeti yeniden kurar; yazılan satır sayısını döner.
+-- Yeniden kurma sürerken adisyon kapanmasın diye invoice kilitlenir.
+CREATE OR REPLACE FUNCTION rebuild_daily_product_sales(p_day_id integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows integer;
+BEGIN
+    LOCK TABLE invoice IN SHARE MODE;
+
+    DELETE FROM daily_product_sales s
+    WHERE p_day_id IS NULL OR s.day_id = p_day_id;
+
+    INSERT INTO daily_product_sales
+        (day_id, day_date, product_id, quantity, total_amount, line_count)
+    SELECT * FROM compute_daily_product_sales(p_day_id);
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+
+-- Kurulumda mevcut kapalı adisyonlardan ilk doldurma
+-- (önceki sürüm silinmiş satırları da saydığı için yeniden kurmak düzeltir)
+SELECT rebuild_daily_product_sales(NULL);
@@ -0,0 +1,64 @@
+-- MyCafe - Kategori bazlı satış raporu (tek sorgu)
+--
+-- daily_product_sales özetinden (bkz. 006) kategori toplamlarını, ürün
+-- sayısını ve her kategorinin en çok ciro yapan ilk N ürününü tek
+-- geçişte hesaplar. Ham invoiceline satırlarına dokunmaz.
+
+CREATE OR REPLACE FUNCTION get_category_sales_range(
+    p_start_date  date,
+    p_end_date    date,
+    p_top_n       integer
+)
+RETURNS TABLE (
+    category_id     integer,
+    category_name   text,
+    total_quantity  numeric,
+    total_amount    numeric,
+    product_count   bigint,
+    top_products    jsonb
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH per_product AS (
+        SELECT p.category_id,
+               COALESCE(c.name::text, 'Diğer') AS category_name,
+               s.product_id,
+               p.name::text AS product_name,
+               SUM(s.quantity) AS quantity,
+               SUM(s.total_amount) AS total_amount
+        FROM daily_product_sales s
+        JOIN product p ON p.id = s.product_id
+        LEFT JOIN category c ON c.id = p.category_id
+        WHERE s.day_date BETWEEN p_start_date AND p_end_date
+        GROUP BY p.category_id, c.name, s.product_id, p.name
+    ),
+    ranked AS (
+        SELECT pp.*,
+               ROW_NUMBER() OVER (
+                   PARTITION BY pp.category_id
+                   ORDER BY pp.total_amount DESC, pp.product_id
+               ) AS rank_in_category
+        FROM per_product pp
+    )
+    SELECT r.category_id,
+           r.category_name,
+           SUM(r.quantity),
+           SUM(r.total_amount),
+           COUNT(*),
+           COALESCE(
+               jsonb_agg(
+                   jsonb_build_object(
+                       'product_id', r.product_id,
+                       'product_name', r.product_name,
+                       'quantity', r.quantity,
+                       'total_amount', r.total_amount
+                   )
+                   ORDER BY r.rank_in_category
+               ) FILTER (WHERE r.rank_in_category <= p_top_n),
+               '[]'::jsonb
+           )
+    FROM ranked r
+    GROUP BY r.category_id, r.category_name
+    ORDER BY SUM(r.total_amount) DESC, r.category_id;
+$$;
@@ -0,0 +1,55 @@
+-- MyCafe - Tarih aralığı için gün gün satış özeti (tek sorgu)
+--
+-- Haftalık / aylık / serbest aralık raporları için her gün ayrı ayrı
+-- get_daily_finance_summary çağırmak yerine aralığın tamamı tek sorguda
+-- daily_sales_rollup özetinden (bkz. 005) okunur.
+--
+-- generate_series ile aralıktaki her tarih üretilir; hiç açılmamış
+-- günler sıfır satırı olarak döner. Aynı tarihte birden fazla gün
+-- kaydı varsa toplanır.
+--
+-- invoice_count: günün SALES hareketi sayısı (kapanan adisyon başına bir)
+
+CREATE OR REPLACE FUNCTION get_daily_sales_range(
+    p_start_date  date,
+    p_end_date    date
+)
+RETURNS TABLE (
+    day_date           date,
+    total_sales        numeric,
+    cash_total         numeric,
+    credit_card_total  numeric,
+    debt_created       numeric,
+    debt_paid          numeric,
+    invoice_count      bigint,
+    transaction_count  bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH per_day AS (
+        SELECT d.day_date,
+               SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'SALES') AS total_sales,
+               SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CASH') AS cash_total,
+               SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CREDIT_CARD') AS credit_card_total,
+               SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT') AS debt_created,
+               SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT_PAYMENT') AS debt_paid,
+               SUM(r.transaction_count) FILTER (WHERE r.transaction_type = 'SALES') AS invoice_count,
+               SUM(r.transaction_count) AS transaction_count
+        FROM daymarker d
+        JOIN daily_sales_rollup r ON r.day_id = d.id
+        WHERE d.day_date BETWEEN p_start_date AND p_end_date
+        GROUP BY d.day_date
+    )
+    SELECT g.day::date,
+           COALESCE(p.total_sales, 0),
+           COALESCE(p.cash_total, 0),
+           COALESCE(p.credit_card_total, 0),
+           COALESCE(p.debt_created, 0),
+           COALESCE(p.debt_paid, 0),
+           COALESCE(p.invoice_count, 0)::bigint,
+           COALESCE(p.transaction_count, 0)::bigint
+    FROM generate_series(p_start_date, p_end_date, interval '1 day') AS g(day)
+    LEFT JOIN per_day p ON p.day_date = g.day::date
+    ORDER BY g.day;
+$$;
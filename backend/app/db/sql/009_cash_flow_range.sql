@@ -0,0 +1,55 @@
+-- MyCafe - Nakit akış raporu (günlük kırılım + yürüyen bakiye)
+--
+-- daily_sales_rollup özetinden (bkz. 005) aralıktaki her gün için giren,
+-- çıkan ve net nakdi hesaplar; yürüyen bakiye pencere fonksiyonuyla aynı
+-- geçişte bulunur. Hiç açılmamış günler sıfır satırı olarak döner.
+--
+-- Kural:
+--   cash_in  : ödeme tipi CASH olan, REFUND/EXPENSE dışındaki hareketler
+--   cash_out : REFUND ve EXPENSE hareketleri (nakit veya ödeme tipi boş),
+--              mutlak değer olarak
+
+CREATE OR REPLACE FUNCTION get_cash_flow_range(
+    p_start_date  date,
+    p_end_date    date
+)
+RETURNS TABLE (
+    day_date         date,
+    cash_in          numeric,
+    cash_out         numeric,
+    net_cash_flow    numeric,
+    running_balance  numeric
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH per_day AS (
+        SELECT d.day_date,
+               SUM(r.total_amount) FILTER (
+                   WHERE r.payment_method = 'CASH'
+                     AND r.transaction_type NOT IN ('REFUND', 'EXPENSE')
+               ) AS cash_in,
+               ABS(SUM(r.total_amount) FILTER (
+                   WHERE r.transaction_type IN ('REFUND', 'EXPENSE')
+                     AND r.payment_method IN ('CASH', '')
+               )) AS cash_out
+        FROM daymarker d
+        JOIN daily_sales_rollup r ON r.day_id = d.id
+        WHERE d.day_date BETWEEN p_start_date AND p_end_date
+        GROUP BY d.day_date
+    ),
+    filled AS (
+        SELECT g.day::date AS day_date,
+               COALESCE(p.cash_in, 0) AS cash_in,
+               COALESCE(p.cash_out, 0) AS cash_out
+        FROM generate_series(p_start_date, p_end_date, interval '1 day') AS g(day)
+        LEFT JOIN per_day p ON p.day_date = g.day::date
+    )
+    SELECT f.day_date,
+           f.cash_in,
+           f.cash_out,
+           f.cash_in - f.cash_out,
+           SUM(f.cash_in - f.cash_out) OVER (ORDER BY f.day_date)
+    FROM filled f
+    ORDER BY f.day_date;
+$$;
@@ -0,0 +1,98 @@
+-- MyCafe - Dönem özeti (tek sorgu)
+--
+-- Toplamlar, ortalama günlük satış, en yoğun gün ve en çok satan ilk N
+-- ürün tek ifadede hesaplanır. Ham financetransaction / invoiceline
+-- yerine günlük özetler okunur:
+--   daily_sales_rollup   (bkz. 005) -> para toplamları, gün bazında satış
+--   daily_product_sales  (bkz. 006) -> ürün toplamları
+--
+-- average_daily_sales: toplam satış / aralıkta açılmış gün sayısı
+
+CREATE OR REPLACE FUNCTION get_period_summary(
+    p_start_date  date,
+    p_end_date    date,
+    p_top_n       integer
+)
+RETURNS TABLE (
+    total_sales          numeric,
+    total_cash           numeric,
+    total_credit         numeric,
+    total_debt_created   numeric,
+    total_debt_paid      numeric,
+    open_day_count       bigint,
+    average_daily_sales  numeric,
+    busiest_day_date     date,
+    busiest_day_sales    numeric,
+    top_products         jsonb
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH days AS (
+        SELECT d.id, d.day_date
+        FROM daymarker d
+        WHERE d.day_date BETWEEN p_start_date AND p_end_date
+    ),
+    per_day AS (
+        SELECT dy.day_date,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'SALES'), 0) AS sales,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CASH'), 0) AS cash,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.payment_method = 'CREDIT_CARD'), 0) AS credit,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT'), 0) AS debt_created,
+               COALESCE(SUM(r.total_amount) FILTER (WHERE r.transaction_type = 'DEBT_PAYMENT'), 0) AS debt_paid
+        FROM days dy
+        LEFT JOIN daily_sales_rollup r ON r.day_id = dy.id
+        GROUP BY dy.day_date
+    ),
+    totals AS (
+        SELECT COALESCE(SUM(sales), 0) AS sales,
+               COALESCE(SUM(cash), 0) AS cash,
+               COALESCE(SUM(credit), 0) AS credit,
+               COALESCE(SUM(debt_created), 0) AS debt_created,
+               COALESCE(SUM(debt_paid), 0) AS debt_paid,
+               COUNT(*) AS day_count
+        FROM per_day
+    ),
+    busiest AS (
+        SELECT day_date, sales
+        FROM per_day
+        ORDER BY sales DESC, day_date
+        LIMIT 1
+    ),
+    products AS (
+        SELECT s.product_id,
+               p.name::text AS product_name,
+               SUM(s.quantity) AS quantity,
+               SUM(s.total_amount) AS total_amount
+        FROM daily_product_sales s
+        JOIN product p ON p.id = s.product_id
+        WHERE s.day_date BETWEEN p_start_date AND p_end_date
+        GROUP BY s.product_id, p.name
+        ORDER BY SUM(s.total_amount) DESC, s.product_id
+        LIMIT p_top_n
+    )
+    SELECT t.sales,
+           t.cash,
+           t.credit,
+           t.debt_created,
+           t.debt_paid,
+           t.day_count,
+           CASE WHEN t.day_count > 0 THEN ROUND(t.sales / t.day_count, 2) ELSE 0 END,
+           b.day_date,
+           b.sales,
+           COALESCE(
+               (SELECT jsonb_agg(
+                           jsonb_build_object(
+                               'product_id', pr.product_id,
+                               'product_name', pr.product_name,
+                               'quantity', pr.quantity,
+                               'total_amount', pr.total_amount
+                           )
+                           ORDER BY pr.total_amount DESC, pr.product_id
+                       )
+                FROM products pr),
+               '[]'::jsonb
+           )
+    FROM totals t
+    LEFT JOIN busiest b ON true;
+$$;
@@ -0,0 +1,51 @@
+-- MyCafe - Adisyon / masa değişiklik bildirimi
+--
+-- Adisyon açılınca, kapanınca, iptal edilince veya masası değişince
+-- ve adisyon satırları eklenip silinince 'mycafe_invoice_changed'
+-- kanalına JSON bildirim gönderir. API süreçleri bu kanalı tek LISTEN
+-- bağlantısından dinler ve canlı akışa (/events/stream) dağıtır; UI'nın
+-- masaları / adisyonları periyodik sorgulaması gerekmez.
+--
+-- Payload:
+--   adisyon: {"kind": "invoice", "invoice_id", "table_id", "old_table_id", "status"}
+--   satır:   {"kind": "lines", "invoice_id"}
+--
+-- Aynı transaction'da aynı payload tek bildirime indirgenir (PostgreSQL),
+-- bu yüzden toplu satır eklemek tek "lines" bildirimi üretir.
+
+CREATE OR REPLACE FUNCTION notify_invoice_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'invoiceline' THEN
+        PERFORM pg_notify('mycafe_invoice_changed', json_build_object(
+            'kind', 'lines',
+            'invoice_id', COALESCE(NEW.invoice_id, OLD.invoice_id)
+        )::text);
+    ELSE
+        PERFORM pg_notify('mycafe_invoice_changed', json_build_object(
+            'kind', 'invoice',
+            'invoice_id', NEW.id,
+            'table_id', NEW.table_id,
+            'old_table_id', CASE WHEN TG_OP = 'UPDATE' THEN OLD.table_id END,
+            'status', NEW.status
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_invoice_notify ON invoice;
+
+CREATE TRIGGER trg_invoice_notify
+    AFTER INSERT OR UPDATE OF status, table_id ON invoice
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_invoice_changed();
+
+DROP TRIGGER IF EXISTS trg_invoiceline_notify ON invoiceline;
+
+CREATE TRIGGER trg_invoiceline_notify
+    AFTER INSERT OR UPDATE OR DELETE ON invoiceline
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_invoice_changed();
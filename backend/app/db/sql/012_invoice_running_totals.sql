@@ -0,0 +1,194 @@
+-- MyCafe - Adisyon üzerinde yürüyen toplam
+--
+-- get_open_invoices her çağrıda açık adisyonların invoiceline satırlarını
+-- topluyordu. Bu dosya invoice tablosuna yürüyen toplam ve satır sayısı
+-- ekler; açık adisyon listesi satır toplamadan, invoice üzerinden okunur.
+--
+-- Güncelleme: invoiceline üzerindeki satır tetikleyicisi (005/006 gibi).
+-- add_invoice_line, remove_invoice_line, ödeme prosedürünün eklediği bilardo
+-- satırı, iade veya elle düzeltme - invoiceline'a kim yazarsa yazsın toplam
+-- satırla AYNI transaction'da değişir; API ek sorgu göndermez.
+--
+-- Satırın toplama girip girmediği tek yerde tanımlıdır:
+-- invoiceline_counts(is_deleted) - silinmiş (soft delete) satır sayılmaz
+-- (006_daily_product_sales.sql'de tanımlıdır; ürün satış özeti de kullanır).
+-- Beklenen kolonlar: invoiceline(invoice_id, line_total, is_deleted).
+--
+-- Tutarlılık kontrolü referans olarak mevcut get_open_invoices prosedürünü
+-- kullanır:
+--   verify_invoice_running_totals()  -> açık adisyonlarda farkları listeler
+--   rebuild_invoice_running_totals() -> açık adisyonları yeniden hesaplar
+--   (bkz. python -m app.db.maintenance verify invoice-totals)
+-- Kontrol, invoiceline_counts'taki silinme kuralının prosedürlerle aynı
+-- olduğunu da doğrular.
+
+ALTER TABLE invoice
+    ADD COLUMN IF NOT EXISTS running_total numeric NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS running_line_count integer NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_invoice_open
+    ON invoice (opened_at)
+    WHERE status = 'OPEN';
+
+
+CREATE OR REPLACE FUNCTION invoiceline_running_total_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_old_counts boolean := TG_OP <> 'INSERT' AND invoiceline_counts(OLD.is_deleted);
+    v_new_counts boolean := TG_OP <> 'DELETE' AND invoiceline_counts(NEW.is_deleted);
+BEGIN
+    -- Aynı adisyonda kalan satır: tek UPDATE ile fark uygulanır
+    IF TG_OP = 'UPDATE' AND OLD.invoice_id = NEW.invoice_id THEN
+        IF v_old_counts OR v_new_counts THEN
+            UPDATE invoice
+            SET running_total = running_total
+                    - CASE WHEN v_old_counts THEN OLD.line_total ELSE 0 END
+                    + CASE WHEN v_new_counts THEN NEW.line_total ELSE 0 END,
+                running_line_count = running_line_count
+                    - v_old_counts::integer
+                    + v_new_counts::integer
+            WHERE id = NEW.invoice_id;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF v_old_counts THEN
+        UPDATE invoice
+        SET running_total = running_total - OLD.line_total,
+            running_line_count = running_line_count - 1
+        WHERE id = OLD.invoice_id;
+    END IF;
+    IF v_new_counts THEN
+        UPDATE invoice
+        SET running_total = running_total + NEW.line_total,
+            running_line_count = running_line_count + 1
+        WHERE id = NEW.invoice_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_invoiceline_running_total ON invoiceline;
+
+CREATE TRIGGER trg_invoiceline_running_total
+    AFTER INSERT OR DELETE OR UPDATE OF invoice_id, line_total, is_deleted ON invoiceline
+    FOR EACH ROW
+    EXECUTE FUNCTION invoiceline_running_total_trigger();
+
+
+-- Açık adisyonlar (get_open_invoices ile aynı kolonlar, toplama yok)
+CREATE OR REPLACE FUNCTION get_open_invoices_running()
+RETURNS TABLE (
+    id             integer,
+    table_number   integer,
+    status         text,
+    opened_at      timestamp,
+    total_amount   numeric,
+    line_count     integer,
+    customer_name  text
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT i.id,
+           t.table_number,
+           i.status::text,
+           i.opened_at,
+           i.running_total,
+           i.running_line_count,
+           c.full_name::text
+    FROM invoice i
+    JOIN restaurant_table t ON t.id = i.table_id
+    LEFT JOIN customer c ON c.id = i.customer_id
+    WHERE i.status = 'OPEN'
+    ORDER BY i.opened_at;
+$$;
+
+
+CREATE OR REPLACE FUNCTION verify_invoice_running_totals()
+RETURNS TABLE (
+    invoice_id          integer,
+    running_total       numeric,
+    actual_total        numeric,
+    running_line_count  integer,
+    actual_line_count   integer
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT i.id,
+           i.running_total,
+           COALESCE(o.total_amount, 0),
+           i.running_line_count,
+           COALESCE(o.line_count, 0)::integer
+    FROM invoice i
+    JOIN get_open_invoices() o ON o.id = i.id
+    WHERE i.running_total <> COALESCE(o.total_amount, 0)
+       OR i.running_line_count <> COALESCE(o.line_count, 0)
+    ORDER BY i.id;
+$$;
+
+
+-- Açık adisyonların yürüyen toplamını yeniden hesaplar; düzeltilen adisyon sayısını döner
+CREATE OR REPLACE FUNCTION rebuild_invoice_running_totals()
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows integer;
+BEGIN
+    -- Yeniden hesaplama sürerken satır eklenip silinmesin
+    LOCK TABLE invoiceline IN SHARE MODE;
+
+    UPDATE invoice i
+    SET running_total = COALESCE(o.total_amount, 0),
+        running_line_count = COALESCE(o.line_count, 0)
+    FROM get_open_invoices() o
+    WHERE o.id = i.id
+      AND (i.running_total <> COALESCE(o.total_amount, 0)
+           OR i.running_line_count <> COALESCE(o.line_count, 0));
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+
+-- Adisyon bildirimi yürüyen toplamı da taşır (011_invoice_notify.sql'in yerine geçer)
+CREATE OR REPLACE FUNCTION notify_invoice_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'invoiceline' THEN
+        PERFORM pg_notify('mycafe_invoice_changed', json_build_object(
+            'kind', 'lines',
+            'invoice_id', COALESCE(NEW.invoice_id, OLD.invoice_id)
+        )::text);
+    ELSE
+        PERFORM pg_notify('mycafe_invoice_changed', json_build_object(
+            'kind', 'invoice',
+            'invoice_id', NEW.id,
+            'table_id', NEW.table_id,
+            'old_table_id', CASE WHEN TG_OP = 'UPDATE' THEN OLD.table_id END,
+            'status', NEW.status,
+            'total_amount', NEW.running_total,
+            'line_count', NEW.running_line_count
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_invoice_notify ON invoice;
+
+CREATE TRIGGER trg_invoice_notify
+    AFTER INSERT OR UPDATE OF status, table_id, running_total ON invoice
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_invoice_changed();
+
+
+-- Kurulumda mevcut açık adisyonlar için ilk doldurma
+SELECT rebuild_invoice_running_totals();
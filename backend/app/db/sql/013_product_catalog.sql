@@ -0,0 +1,109 @@
+-- MyCafe - Ürün kataloğu ve katalog sürümü
+--
+-- Sipariş ekranı ürün / fiyat / kategori listesini her açılışta yeniden
+-- yüklüyordu. API süreçleri kataloğu bellekte tutar; bu dosya:
+--   - tek satırlık catalog_version tablosunu ekler: katalog kolonları
+--     (ad, kategori, fiyat, satış durumu) değiştiğinde veya ürün / kategori
+--     eklenip silindiğinde sürüm bir artar (tüm worker'lar için aynı, azalmaz)
+--   - stok gibi katalog dışı kolonların güncellenmesi sürümü ARTIRMAZ:
+--     ödeme kapanışındaki stok düşümü (auto_stock_reduction) her satışta
+--     catalog_version satırını kilitleyip tüm önbellekleri boşaltmasın
+--   - değişikliği 'mycafe_catalog' kanalına yeni sürümle bildirir
+--   - kataloğu okuyan prosedürleri ekler
+--
+-- Sürüm istemciye ETag olarak verilir (W/"catalog-<sürüm>"); sürüm
+-- değişmediyse katalog yeniden gönderilmez (304).
+--
+-- Beklenen kolonlar: product(id, name, category_id, sale_price, is_active),
+-- category(id, name).
+
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id          integer   PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version     bigint    NOT NULL DEFAULT 1,
+    updated_at  timestamp NOT NULL DEFAULT now()
+);
+
+INSERT INTO catalog_version (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+
+CREATE OR REPLACE FUNCTION bump_catalog_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_version bigint;
+BEGIN
+    UPDATE catalog_version
+    SET version = version + 1,
+        updated_at = now()
+    WHERE id = 1
+    RETURNING version INTO v_version;
+
+    PERFORM pg_notify('mycafe_catalog', v_version::text);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_product_catalog_version ON product;
+
+CREATE TRIGGER trg_product_catalog_version
+    AFTER INSERT OR DELETE OR TRUNCATE
+       OR UPDATE OF name, category_id, sale_price, is_active ON product
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_catalog_version();
+
+DROP TRIGGER IF EXISTS trg_category_catalog_version ON category;
+
+CREATE TRIGGER trg_category_catalog_version
+    AFTER INSERT OR DELETE OR TRUNCATE
+       OR UPDATE OF name ON category
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_catalog_version();
+
+
+CREATE OR REPLACE FUNCTION get_catalog_version()
+RETURNS TABLE (version bigint)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT v.version FROM catalog_version v WHERE v.id = 1;
+$$;
+
+
+-- Tüm ürünler (pasifler dahil; satışa kapalı ürün is_active = false)
+CREATE OR REPLACE FUNCTION get_product_catalog()
+RETURNS TABLE (
+    id             integer,
+    product_name   text,
+    category_id    integer,
+    category_name  text,
+    sale_price     numeric,
+    is_active      boolean
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.id,
+           p.name::text,
+           p.category_id,
+           COALESCE(c.name::text, 'Diğer'),
+           p.sale_price,
+           p.is_active
+    FROM product p
+    LEFT JOIN category c ON c.id = p.category_id
+    ORDER BY c.name NULLS LAST, p.name, p.id;
+$$;
+
+
+CREATE OR REPLACE FUNCTION get_category_catalog()
+RETURNS TABLE (
+    id             integer,
+    category_name  text
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.id, c.name::text
+    FROM category c
+    ORDER BY c.name, c.id;
+$$;
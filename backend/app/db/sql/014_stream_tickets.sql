@@ -0,0 +1,66 @@
+-- MyCafe - Canlı akış biletleri (stream ticket)
+--
+-- Tarayıcının EventSource'u Authorization başlığı gönderemez. JWT'yi
+-- URL'de (?access_token=) taşımak onu proxy / erişim loglarına ve tarayıcı
+-- geçmişine yazar. Bunun yerine istemci başlıkla doğrulanmış
+-- POST /events/ticket çağrısıyla kısa ömürlü, tek kullanımlık bir bilet
+-- alır ve /events/stream?ticket= ile bağlanır.
+--
+-- Biletler DB'de tutulur; böylece bileti hangi worker verirse versin,
+-- akışı hangi worker açarsa açsın bilet bir kez kullanılabilir
+-- (consume_stream_ticket satırı silerek döner).
+--
+-- Tabloda biletin kendisi değil SHA-256 özeti saklanır.
+
+CREATE TABLE IF NOT EXISTS stream_ticket (
+    ticket_hash  text        PRIMARY KEY,
+    user_id      integer     NOT NULL,
+    role         text,
+    expires_at   timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_stream_ticket_expires ON stream_ticket (expires_at);
+
+
+-- Bileti kaydeder (süresi geçmiş biletleri de temizler); bitiş zamanını döner
+CREATE OR REPLACE FUNCTION issue_stream_ticket(
+    p_ticket_hash  text,
+    p_user_id      integer,
+    p_role         text,
+    p_ttl_seconds  integer
+)
+RETURNS timestamptz
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_expires_at timestamptz;
+BEGIN
+    DELETE FROM stream_ticket WHERE expires_at < now();
+
+    INSERT INTO stream_ticket (ticket_hash, user_id, role, expires_at)
+    VALUES (p_ticket_hash, p_user_id, p_role, now() + make_interval(secs => p_ttl_seconds))
+    RETURNING expires_at INTO v_expires_at;
+
+    RETURN v_expires_at;
+END;
+$$;
+
+
+-- Bileti tüketir: geçerliyse sahibini döner, her durumda bileti siler.
+-- Süresi geçmiş veya daha önce kullanılmış bilet için satır dönmez.
+CREATE OR REPLACE FUNCTION consume_stream_ticket(p_ticket_hash text)
+RETURNS TABLE (
+    user_id  integer,
+    role     text
+)
+LANGUAGE sql
+AS $$
+    WITH consumed AS (
+        DELETE FROM stream_ticket t
+        WHERE t.ticket_hash = p_ticket_hash
+        RETURNING t.user_id, t.role, t.expires_at
+    )
+    SELECT c.user_id, c.role
+    FROM consumed c
+    WHERE c.expires_at >= now();
+$$;
@@ -0,0 +1,173 @@
+"""
+MyCafe - Hazır Sorgu (Prepared Statement) Önbelleği
+
+Bu modül:
+- Her DB bağlantısı için prosedür sorgularını bir kez hazırlar (prepare)
+- Hazırlanan sorguları prosedür adı + parametre sayısına göre saklar
+- Havuz bağlantıyı yenilediğinde önbellek bağlantıyla birlikte yok olur
+- Hit/miss sayaçları ile parse işinin gerçekten azaldığını gösterir
+
+Neden asyncpg'nin kendi önbelleği (statement_cache_size) yetmiyor:
+- asyncpg sorguyu ancak ilk çalıştırmada hazırlar; HOT_PROCEDURES
+  burada bağlantı açılırken (warm_pool) önceden hazırlanır, böylece
+  açılıştan sonraki ilk istek parse/plan maliyetini ödemez
+- asyncpg'nin önbelleği dışarıdan sayılamaz; hit/miss sayaçları
+  /system istatistiklerinde bu kayıt defterinden gelir
+- Prosedür yeniden tanımlanınca yalnızca ilgili kayıt düşürülür ve
+  transaction dışındaysa sorgu bir kez yeniden denenir
+
+Kullanımı:
+    BaseRepository._execute_procedure otomatik kullanır.
+    Havuz `connection_class=MyCafeConnection` ile oluşturulmalıdır.
+"""
+
+from typing import Dict, Any, Tuple, Optional
+from asyncpg import Connection
+from asyncpg.prepared_stmt import PreparedStatement
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MyCafeConnection(Connection):
+    """
+    Hazır sorgu kayıt defteri taşıyan asyncpg bağlantısı.
+
+    Not:
+        - Kayıt defteri bağlantı nesnesinin üzerinde durur
+        - Havuz eski bağlantıyı kapatıp yenisini açtığında
+          yeni bağlantı boş bir kayıt defteriyle başlar
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._mycafe_statements: Dict[Tuple[str, int], PreparedStatement] = {}
+
+
+class StatementCacheStats:
+    """Süreç geneli hazır sorgu sayaçları"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.uncached = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "uncached": self.uncached,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.uncached = 0
+
+
+statement_stats = StatementCacheStats()
+
+
+def build_procedure_query(proc_name: str, arity: int) -> str:
+    """`SELECT * FROM proc($1, ..., $n)` sorgusunu üretir"""
+    placeholders = ', '.join([f'${i+1}' for i in range(arity)])
+    return f"SELECT * FROM {proc_name}({placeholders})"
+
+
+def _get_registry(conn) -> Optional[Dict[Tuple[str, int], PreparedStatement]]:
+    """
+    Bağlantının kayıt defterini döner.
+
+    Havuz bağlantıları PoolConnectionProxy olarak gelir; proxy bilinmeyen
+    özellikleri asıl bağlantıya yönlendirdiği için getattr yeterlidir.
+    MyCafeConnection değilse None döner (önbelleksiz çalışılır).
+    """
+    return getattr(conn, '_mycafe_statements', None)
+
+
+async def get_procedure_statement(conn, proc_name: str, arity: int) -> Optional[PreparedStatement]:
+    """
+    Prosedür için hazır sorguyu döner, yoksa hazırlayıp kaydeder.
+
+    Args:
+        conn: asyncpg bağlantısı (veya havuz proxy'si)
+        proc_name: Prosedür adı
+        arity: Parametre sayısı
+
+    Returns:
+        PreparedStatement veya None (bağlantı önbellek desteklemiyorsa)
+    """
+    registry = _get_registry(conn)
+    if registry is None:
+        statement_stats.uncached += 1
+        return None
+
+    key = (proc_name, arity)
+    stmt = registry.get(key)
+    if stmt is not None:
+        statement_stats.hits += 1
+        return stmt
+
+    statement_stats.misses += 1
+    stmt = await conn.prepare(build_procedure_query(proc_name, arity))
+    registry[key] = stmt
+    logger.debug(f"Prepared statement cached: {proc_name}/{arity}")
+    return stmt
+
+
+def invalidate_procedure_statement(conn, proc_name: str, arity: int) -> None:
+    """
+    Tek bir hazır sorguyu kayıt defterinden çıkarır.
+
+    Prosedür yeniden oluşturulduğunda (şema değişikliği)
+    InvalidCachedStatementError sonrası çağrılır.
+    """
+    registry = _get_registry(conn)
+    if registry is not None and registry.pop((proc_name, arity), None) is not None:
+        statement_stats.invalidations += 1
+
+
+# Açılışta her bağlantıda önceden hazırlanan sıcak prosedürler (ad, parametre sayısı)
+HOT_PROCEDURES = (
+    ('get_current_day', 0),
+    ('get_tables', 1),
+    ('get_open_invoices_running', 0),
+    ('get_invoice', 1),
+    ('get_invoice_with_lines', 1),
+    ('add_invoice_line', 7),
+    ('remove_invoice_line', 2),
+    ('process_payment_atomic', 6),
+    ('process_payment_checked', 6),
+    ('get_daily_finance_summary_rollup', 1),
+)
+
+
+async def prepare_hot_statements(conn) -> int:
+    """
+    Sıcak prosedürleri bağlantıda önceden hazırlar.
+
+    Returns:
+        Hazırlanan sorgu sayısı (önbellekte olanlar sayılmaz)
+    """
+    prepared = 0
+    for proc_name, arity in HOT_PROCEDURES:
+        registry = _get_registry(conn)
+        if registry is not None and (proc_name, arity) in registry:
+            continue
+        try:
+            await get_procedure_statement(conn, proc_name, arity)
+            prepared += 1
+        except Exception as e:
+            # Prosedür bu şemada yoksa açılışı durdurma
+            logger.warning(f"Could not prepare {proc_name}/{arity}: {e}")
+    return prepared
+
+
+def get_statement_cache_stats() -> Dict[str, Any]:
+    """Hit/miss sayaçlarını döner (admin/metrik endpoint'leri için)"""
+    return statement_stats.as_dict()
@@ -100,6 +100,28 @@ class InvoiceResponse(BaseResponse):
     lines: List[InvoiceLineResponse] = []
 
 
+class InvoiceLineRequest(BaseModel):
+    """Toplu sipariş satırı - Request modeli"""
+    product_id: Optional[int] = None  # NORMAL için zorunlu
+    quantity: Decimal = Field(..., gt=0)
+    line_type: str = "NORMAL"  # NORMAL, SIPARIS_YEMEK, BILARDO
+    unit_price: Optional[Decimal] = None  # SIPARIS_YEMEK için zorunlu
+    note: Optional[str] = None
+
+
+class InvoiceLinesBatchRequest(BaseModel):
+    """Toplu sipariş ekleme isteği - Request modeli"""
+    lines: List[InvoiceLineRequest] = Field(..., min_length=1, max_length=100)
+
+
+class InvoiceLinesBatchResponse(BaseResponse):
+    """Toplu sipariş ekleme sonucu"""
+    invoice_id: int
+    lines: List[InvoiceLineResponse]
+    line_count: int
+    total_amount: Decimal
+
+
 class InvoiceSummaryResponse(BaseResponse):
     """Adisyon özeti - listeleme için"""
     id: int
@@ -127,6 +149,13 @@ class FinanceTransactionResponse(BaseResponse):
     created_by_name: str
 
 
+class FinanceTransactionPageResponse(BaseResponse):
+    """Finans hareketleri sayfası (keyset sayfalama)"""
+    items: List[FinanceTransactionResponse]
+    next_cursor: Optional[str] = None  # Son sayfada None
+    has_more: bool
+
+
 # ==================== MÜŞTERİ MODELLERİ ====================
 
 class CustomerResponse(BaseResponse):
@@ -208,7 +237,27 @@ class ProductSalesReportResponse(BaseResponse):
     """Ürün bazlı satış raporu"""
     product_id: int
     product_name: str
+    category_id: Optional[int] = None
     category_name: str
     quantity: Decimal
     total_amount: Decimal
-    day_date: date
\ No newline at end of file
+    line_count: int = 0
+    day_date: Optional[date] = None  # Aralık raporlarında None
+
+
+class CategoryTopProduct(BaseResponse):
+    """Kategori raporunda en çok satan ürün"""
+    product_id: int
+    product_name: str
+    quantity: Decimal
+    total_amount: Decimal
+
+
+class CategorySalesReportResponse(BaseResponse):
+    """Kategori bazlı satış raporu"""
+    category_id: Optional[int] = None
+    category_name: str
+    total_quantity: Decimal
+    total_amount: Decimal
+    product_count: int
+    top_products: List[CategoryTopProduct] = []
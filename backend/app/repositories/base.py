@@ -7,12 +7,18 @@ Tüm repository'ler bu sınıftan türer:
 - Prosedür çağrıları için yardımcı metodlar
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from asyncpg import Connection, Record
-from asyncpg.exceptions import PostgresError
+from asyncpg.exceptions import PostgresError, InvalidCachedStatementError
 import logging
 
 from app.core.exceptions import DatabaseError, BusinessRuleViolation
+from app.db.lazy import resolve_connection
+from app.db.statements import (
+    build_procedure_query,
+    get_procedure_statement,
+    invalidate_procedure_statement
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +31,17 @@ class BaseRepository:
     - __init__'de connection alır
     - _execute_procedure ile prosedür çağırır
     - _fetchone/_fetchall ile kayıtları döner
+    
+    Transaction:
+    - Tek çağrılar kendi başına (autocommit) çalışır
+    - Çok adımlı işlemler service'te unit_of_work / read_only_snapshot
+      ile tek transaction'a alınır (bkz. app.repositories.unit_of_work)
     """
     
     def __init__(self, conn: Connection):
         """
         Args:
-            conn: AsyncPG connection (transaction yönetimi için)
+            conn: AsyncPG connection veya LazyConnection (transaction yönetimi için)
         """
         self.conn = conn
     
@@ -60,39 +71,115 @@ class BaseRepository:
             DatabaseError: Diğer DB hataları
         """
         try:
-            # Parametreleri SQL formatına çevir
-            placeholders = ', '.join([f'${i+1}' for i in range(len(args))])
-            query = f"SELECT * FROM {proc_name}({placeholders})"
-            
             logger.debug(f"Executing procedure: {proc_name} with args: {args}")
             
-            if fetch:
-                # Çoklu kayıt dönen prosedürler (raporlar gibi)
-                result = await self.conn.fetch(query, *args)
-                return result
-            elif fetch_one:
-                # Tek kayıt dönen prosedürler
-                result = await self.conn.fetchrow(query, *args)
-                return result
-            else:
-                # Hiç kayıt dönmeyen prosedürler (insert/update)
-                await self.conn.execute(query, *args)
-                return None
+            try:
+                return await self._run_procedure(proc_name, args, fetch, fetch_one)
+            except InvalidCachedStatementError:
+                # Prosedür yeniden oluşturulmuş (şema değişti), hazır sorgu geçersiz
+                invalidate_procedure_statement(self.conn, proc_name, len(args))
+                if self.conn.is_in_transaction():
+                    raise
+                return await self._run_procedure(proc_name, args, fetch, fetch_one)
                 
         except PostgresError as e:
-            # PostgreSQL hatalarını yakala
-            error_msg = str(e)
-            logger.error(f"Database error in {proc_name}: {error_msg}")
-            
-            # İş kuralı ihlalleri (RAISE EXCEPTION ile fırlatılanlar)
-            if "RAISE_EXCEPTION" in error_msg or "P0001" in error_msg:
-                # Hata mesajını temizle
-                clean_msg = error_msg.split('CONTEXT:')[0].strip()
-                clean_msg = clean_msg.replace('ERROR: ', '').replace('P0001: ', '')
-                raise BusinessRuleViolation(detail=clean_msg)
+            self._raise_procedure_error(proc_name, e)
+    
+    def _raise_procedure_error(self, proc_name: str, e: PostgresError) -> None:
+        """PostgreSQL hatasını BusinessRuleViolation / DatabaseError'a çevirir"""
+        error_msg = str(e)
+        logger.error(f"Database error in {proc_name}: {error_msg}")
+        
+        # İş kuralı ihlalleri (RAISE EXCEPTION ile fırlatılanlar)
+        if "RAISE_EXCEPTION" in error_msg or "P0001" in error_msg:
+            # Hata mesajını temizle
+            clean_msg = error_msg.split('CONTEXT:')[0].strip()
+            clean_msg = clean_msg.replace('ERROR: ', '').replace('P0001: ', '')
+            raise BusinessRuleViolation(detail=clean_msg)
+        
+        # Diğer DB hataları
+        raise DatabaseError(detail=f"Procedure {proc_name} failed: {error_msg}")
+    
+    async def _fetch_procedure_query(self, proc_name: str, query: str, *args) -> List[Record]:
+        """
+        Prosedürü saran özel bir sorgu çalıştırır (ör. dizi parametreli toplu çağrı).
+        
+        Not:
+            - Hatalar _execute_procedure ile aynı şekilde çevrilir
+            - asyncpg'nin bağlantı başına sorgu önbelleği kullanılır
+        """
+        conn = await resolve_connection(self.conn)
+        try:
+            logger.debug(f"Executing batched procedure: {proc_name} with args: {args}")
+            return await conn.fetch(query, *args)
+        except PostgresError as e:
+            self._raise_procedure_error(proc_name, e)
+    
+    async def _run_procedure(
+        self,
+        proc_name: str,
+        args: Tuple,
+        fetch: bool,
+        fetch_one: bool
+    ) -> Any:
+        """
+        Prosedürü bağlantıya ait hazır sorgu üzerinden çalıştırır.
+        
+        Not:
+            - Sorgu bağlantı başına bir kez hazırlanır (bkz. app.db.statements)
+            - Bağlantı önbellek desteklemiyorsa düz sorguya düşer
+            - LazyConnection ise bağlantı burada havuzdan alınır
+        """
+        conn = await resolve_connection(self.conn)
+        stmt = await get_procedure_statement(conn, proc_name, len(args))
+        
+        if stmt is None:
+            query = build_procedure_query(proc_name, len(args))
+            if fetch:
+                return await conn.fetch(query, *args)
+            elif fetch_one:
+                return await conn.fetchrow(query, *args)
+            await conn.execute(query, *args)
+            return None
+        
+        if fetch:
+            # Çoklu kayıt dönen prosedürler (raporlar gibi)
+            return await stmt.fetch(*args)
+        elif fetch_one:
+            # Tek kayıt dönen prosedürler
+            return await stmt.fetchrow(*args)
+        else:
+            # Hiç kayıt dönmeyen prosedürler (insert/update)
+            await stmt.fetch(*args)
+            return None
+    
+    async def _stream_procedure(
+        self,
+        proc_name: str,
+        *args,
+        prefetch: int = 500
+    ) -> AsyncIterator[Record]:
+        """
+        Prosedür sonucunu sunucu taraflı imleçle (server-side cursor) satır satır döner.
+        
+        Args:
+            proc_name: Prosedür adı
+            *args: Prosedüre gönderilecek parametreler
+            prefetch: DB'den tek seferde çekilecek satır sayısı
             
-            # Diğer DB hataları
-            raise DatabaseError(detail=f"Procedure {proc_name} failed: {error_msg}")
+        Not:
+            - Bellekte en fazla `prefetch` kadar satır tutulur
+            - asyncpg imleçleri transaction içinde çalışır; çağıran taraf
+              read_only_snapshot / unit_of_work açmalıdır
+        """
+        conn = await resolve_connection(self.conn)
+        query = build_procedure_query(proc_name, len(args))
+        try:
+            async for record in conn.cursor(query, *args, prefetch=prefetch):
+                yield record
+        except PostgresError as e:
+            logger.error(f"Database error while streaming {proc_name}: {e}")
+            raise DatabaseError(detail=f"Procedure {proc_name} failed: {e}")
     
     async def _fetchval(self, query: str, *args) -> Any:
         """Tek bir değer döndüren sorgular için"""
@@ -110,6 +197,18 @@ class BaseRepository:
             logger.error(f"Database error in execute: {e}")
             raise DatabaseError(detail=str(e))
     
+    async def _is_autocommit(self) -> bool:
+        """
+        Son çağrı kendi transaction'ında mı commit edildi?
+        
+        Not:
+            - Dış transaction (unit_of_work) geri alınabilir; süreç içi
+              önbellekler o durumda elle güncellenmez, commit sonrası
+              gelen NOTIFY ile güncellenir
+        """
+        conn = await resolve_connection(self.conn)
+        return not conn.is_in_transaction()
+    
     def _record_to_dict(self, record: Optional[Record]) -> Optional[Dict]:
         """Record objesini dict'e çevir (None-safe)"""
         if record is None:
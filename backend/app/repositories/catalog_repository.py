@@ -0,0 +1,91 @@
+"""
+MyCafe - Ürün Kataloğu Repository'si
+
+Bu repository:
+- Ürün / fiyat / kategori kataloğunu ve katalog sürümünü okur
+- Kataloğu süreç belleğinde tutar (bkz. app/cache/catalog.py); sürüm
+  değişmediği sürece DB'ye gitmez
+- Tüm prosedür çağrıları BaseRepository üzerinden yapılır
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from asyncpg import Connection
+
+from app.repositories.base import BaseRepository
+from app.repositories.unit_of_work import read_only_snapshot
+from app.cache.catalog import catalog_cache, CatalogSnapshot
+
+
+class CatalogRepository(BaseRepository):
+    """
+    Ürün kataloğu repository'si
+    
+    Kullanıcı dili:
+    - Satıştaki ürünler ve fiyatları
+    - Kategoriler
+    - Bu ürün hâlâ satılıyor mu?
+    """
+    
+    def __init__(self, conn: Connection):
+        super().__init__(conn)
+    
+    async def fetch_catalog(self) -> CatalogSnapshot:
+        """
+        Kataloğu DB'den okur ve önbelleğe yazar.
+        
+        Not:
+            - Sürüm, ürünler ve kategoriler aynı anlık görüntüden okunur;
+              sürüm hiçbir zaman içeriğinden yeni olamaz
+        """
+        generation = catalog_cache.generation
+        async with read_only_snapshot(self.conn):
+            version = await self._execute_procedure('get_catalog_version', fetch_one=True)
+            products = await self._execute_procedure('get_product_catalog', fetch=True)
+            categories = await self._execute_procedure('get_category_catalog', fetch=True)
+        
+        return catalog_cache.load(
+            version=version['version'] if version else 0,
+            products=[dict(p) for p in products],
+            categories=[dict(c) for c in categories],
+            generation=generation
+        )
+    
+    async def get_catalog(self) -> CatalogSnapshot:
+        """
+        Kataloğu getirir (önbellekte güncel kopya varsa DB'ye gidilmez).
+        
+        Returns:
+            CatalogSnapshot: version, products, categories
+        """
+        snapshot = catalog_cache.get()
+        if snapshot is None:
+            snapshot = await self.fetch_catalog()
+        return snapshot
+    
+    async def find_unavailable_products(self, product_ids: Iterable[int]) -> List[int]:
+        """
+        Katalogda olmayan veya satışa kapalı ürünleri bulur.
+        
+        Args:
+            product_ids: Kontrol edilecek ürün ID'leri
+            
+        Returns:
+            Satılamayan ürün ID'leri (boş liste = hepsi satılabilir)
+        
+        Not:
+            - Güncel katalogda olmayan ürün satılamaz sayılır; katalog
+              yeniden yüklenmez (hatalı ID gönderen istemci her istekte
+              tüm kataloğu yükletemesin). Yeni ürün, bildirimi gelince
+              (dinleyici kopuksa CATALOG_CACHE_TTL içinde) satılabilir olur.
+        """
+        ids = [pid for pid in product_ids if pid is not None]
+        if not ids:
+            return []
+        
+        snapshot = await self.get_catalog()
+        return [pid for pid in ids if not snapshot.is_available(pid)]
+    
+    async def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Katalogdaki ürünü getirir (yoksa None)"""
+        snapshot = await self.get_catalog()
+        return snapshot.products.get(product_id)
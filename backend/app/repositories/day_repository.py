@@ -13,6 +13,7 @@ from datetime import date
 from asyncpg import Connection
 
 from app.repositories.base import BaseRepository
+from app.cache.day_state import day_state_cache
 from app.core.exceptions import ResourceNotFound
 
 
@@ -52,11 +53,15 @@ class DayRepository(BaseRepository):
         Raises:
             BusinessRuleViolation: Zaten açık bir gün varsa
         """
-        result = await self._execute_procedure(
-            'open_new_day',
-            opened_by,
-            fetch_one=True
-        )
+        try:
+            result = await self._execute_procedure(
+                'open_new_day',
+                opened_by,
+                fetch_one=True
+            )
+        finally:
+            # İşlem commit edilmemiş olabilir; set yerine geçersiz kıl
+            day_state_cache.invalidate()
         return dict(result) if result else None
     
     async def close_day_with_snapshot(self, closed_by: int) -> Dict[str, Any]:
@@ -80,11 +85,14 @@ class DayRepository(BaseRepository):
         Raises:
             BusinessRuleViolation: Açık adisyonlar varsa veya gün zaten kapalıysa
         """
-        result = await self._execute_procedure(
-            'close_day_with_snapshot',
-            closed_by,
-            fetch_one=True
-        )
+        try:
+            result = await self._execute_procedure(
+                'close_day_with_snapshot',
+                closed_by,
+                fetch_one=True
+            )
+        finally:
+            day_state_cache.invalidate()
         return dict(result) if result else None
     
     async def get_current_day(self) -> Optional[Dict[str, Any]]:
@@ -103,12 +111,24 @@ class DayRepository(BaseRepository):
                 'opened_by': int,
                 'opened_by_name': str
             } veya None
+        
+        Not:
+            Sonuç gün durumu önbelleğinden gelir (bkz. app.cache.day_state).
+            Önbellek boşsa veya süresi dolmuşsa DB'den okunup yazılır.
         """
+        found, day = day_state_cache.get()
+        if found:
+            return day
+        
+        # Okuma sürerken gün açılıp kapanırsa eski sonuç önbelleğe yazılmaz
+        generation = day_state_cache.generation
         result = await self._execute_procedure(
             'get_current_day',
             fetch_one=True
         )
-        return dict(result) if result else None
+        day = dict(result) if result else None
+        day_state_cache.set(day, generation)
+        return day
     
     async def is_day_open(self) -> bool:
         """
@@ -120,12 +140,12 @@ class DayRepository(BaseRepository):
         Returns:
             True: Gün açık, işlem yapılabilir
             False: Gün kapalı, işlem yapılamaz
+        
+        Not:
+            Ayrı bir 'is_day_open' çağrısı yapılmaz; açık gün önbellekten okunur.
         """
-        result = await self._execute_procedure(
-            'is_day_open',
-            fetch_one=True
-        )
-        return result['is_open'] if result else False
+        day = await self.get_current_day()
+        return bool(day and day.get('is_open', True))
     
     async def get_day_by_id(self, day_id: int) -> Optional[Dict[str, Any]]:
         """
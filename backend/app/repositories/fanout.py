@@ -0,0 +1,130 @@
+"""
+MyCafe - Ortak Anlık Görüntüde Paralel Sorgular (Fan-out)
+
+Bu modül:
+- Birbirinden bağımsız rapor sorgularını havuzdaki ayrı bağlantılarda
+  aynı anda çalıştırır
+- Tüm bağlantılar aynı REPEATABLE READ anlık görüntüsünü görür
+  (lider bağlantı `pg_export_snapshot()` ile dışa aktarır, diğerleri
+  `SET TRANSACTION SNAPSHOT` ile içe alır)
+- Havuzda boş bağlantı yoksa veya zaten transaction içindeyse
+  sorguları tek bağlantıda sırayla çalıştırır (read_only_snapshot)
+
+Kullanımı:
+    payments, summary = await run_in_shared_snapshot(
+        self.payment_repo.conn,
+        lambda conn: PaymentRepository(conn).get_daily_payments(day_id),
+        lambda conn: PaymentRepository(conn).get_daily_summary(day_id),
+    )
+
+Not:
+    Toplam süre sorguların toplamı yerine en yavaş sorguya yaklaşır.
+"""
+
+from typing import Any, Awaitable, Callable, List, Optional
+from contextlib import AsyncExitStack
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailable
+from app.db.lazy import resolve_connection
+from app.db.pool import acquire_connection
+from app.repositories.unit_of_work import read_only_snapshot
+
+logger = logging.getLogger(__name__)
+
+# task(conn) -> sonuç
+SnapshotTask = Callable[[Any], Awaitable[Any]]
+
+
+async def _run_sequential(conn, tasks) -> List[Any]:
+    async with read_only_snapshot(conn):
+        return [await task(conn) for task in tasks]
+
+
+async def _join_snapshot(helper, snapshot_id: str):
+    """Yardımcı bağlantıda transaction açıp liderin anlık görüntüsünü içe alır"""
+    tx = helper.transaction(isolation='repeatable_read', readonly=True)
+    await tx.start()
+    try:
+        # Transaction'daki ilk komut olmalı; parametre kabul etmez
+        await helper.execute(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+    except BaseException:
+        await tx.rollback()
+        raise
+    return tx
+
+
+def _first_error(results) -> Optional[BaseException]:
+    return next((r for r in results if isinstance(r, BaseException)), None)
+
+
+async def run_in_shared_snapshot(conn, *tasks: SnapshotTask) -> List[Any]:
+    """
+    Görevleri ortak bir salt okunur anlık görüntüde paralel çalıştırır.
+
+    Args:
+        conn: İsteğin bağlantısı (LazyConnection ise ek bağlantılar onun havuzundan alınır)
+        *tasks: Bağlantı alıp sorgu çalıştıran coroutine fonksiyonları
+
+    Returns:
+        Görev sonuçları, verilen sırayla
+
+    Raises:
+        Görevlerden birinin fırlattığı ilk hata (diğerleri bitmeden bağlantılar bırakılmaz)
+    """
+    pool = getattr(conn, 'pool', None)
+    leader = await resolve_connection(conn)
+
+    if pool is None or len(tasks) < 2 or leader.is_in_transaction():
+        return await _run_sequential(conn, tasks)
+
+    # Ek bağlantılar aynı anda istenir
+    acquired = await asyncio.gather(
+        *(
+            acquire_connection(pool, timeout=settings.REPORT_FANOUT_ACQUIRE_TIMEOUT)
+            for _ in range(len(tasks) - 1)
+        ),
+        return_exceptions=True
+    )
+    helpers = [c for c in acquired if not isinstance(c, BaseException)]
+    error = _first_error(acquired)
+    if error is not None:
+        await asyncio.gather(*(pool.release(helper) for helper in helpers))
+        if not isinstance(error, ServiceUnavailable):
+            raise error
+        # Havuz dolu: ek bağlantı için bekleme, sırayla çalıştır
+        logger.debug("Report fan-out fell back to sequential (pool busy)")
+        return await _run_sequential(conn, tasks)
+
+    try:
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(
+                leader.transaction(isolation='repeatable_read', readonly=True)
+            )
+            snapshot_id = await leader.fetchval("SELECT pg_export_snapshot()")
+
+            # Yardımcılar anlık görüntüye aynı anda katılır
+            joined = await asyncio.gather(
+                *(_join_snapshot(helper, snapshot_id) for helper in helpers),
+                return_exceptions=True
+            )
+            for tx in joined:
+                if not isinstance(tx, BaseException):
+                    stack.push_async_callback(tx.rollback)
+            error = _first_error(joined)
+            if error is not None:
+                raise error
+
+            results = await asyncio.gather(
+                *(task(c) for task, c in zip(tasks, [leader] + helpers)),
+                return_exceptions=True
+            )
+    finally:
+        await asyncio.gather(*(pool.release(helper) for helper in helpers))
+
+    error = _first_error(results)
+    if error is not None:
+        raise error
+    return list(results)
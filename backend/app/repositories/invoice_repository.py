@@ -4,15 +4,31 @@ MyCafe - Adisyon Yönetimi Repository'si
 Bu repository:
 - Adisyon açma/kapama
 - Sipariş ekleme/çıkarma
-- Masa durumu sorgulama
+- Masa durumu sorgulama (bellekteki masa indeksinden, bkz. app/cache/table_state.py)
+- Ürün satış özeti (gün × ürün) okuma ve bakımı
 - Tüm prosedür çağrıları BaseRepository üzerinden yapılır
 """
 
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
+from datetime import date
+import json
 from asyncpg import Connection
 
 from app.repositories.base import BaseRepository
+from app.cache.table_state import table_state
+
+
+# Satırları dizi olarak alıp add_invoice_line'ı satır sırasıyla tek sorguda çağırır
+ADD_INVOICE_LINES_QUERY = """
+SELECT r.*
+FROM unnest($2::int[], $3::numeric[], $4::text[], $5::numeric[], $6::text[])
+     WITH ORDINALITY AS l(product_id, quantity, line_type, unit_price, note, ord)
+CROSS JOIN LATERAL add_invoice_line(
+    $1, l.product_id, l.quantity, l.line_type, l.unit_price, l.note, $7
+) AS r
+ORDER BY l.ord
+"""
 
 
 class InvoiceRepository(BaseRepository):
@@ -72,6 +88,8 @@ class InvoiceRepository(BaseRepository):
             customer_id,
             fetch_one=True
         )
+        if result and await self._is_autocommit():
+            table_state.mark_occupied(result['table_id'], result['id'])
         return dict(result) if result else None
     
     async def get_invoice(self, invoice_id: int) -> Optional[Dict[str, Any]]:
@@ -138,9 +156,13 @@ class InvoiceRepository(BaseRepository):
                     'line_count': int
                 }
             ]
+        
+        Not:
+            - Satırlar toplanmaz; invoice üzerindeki yürüyen toplam okunur
+              (bkz. app/db/sql/012_invoice_running_totals.sql)
         """
         results = await self._execute_procedure(
-            'get_open_invoices',
+            'get_open_invoices_running',
             fetch=True
         )
         return [dict(r) for r in results]
@@ -154,7 +176,14 @@ class InvoiceRepository(BaseRepository):
             
         Returns:
             Adisyon bilgisi veya None (masa boşsa)
+        
+        Not:
+            - Masa indeksi boş diyorsa DB'ye gidilmez
         """
+        found, table = table_state.get_table(table_id)
+        if found and (table is None or not table['is_occupied']):
+            return None
+        
         result = await self._execute_procedure(
             'get_table_open_invoice',
             table_id,
@@ -162,6 +191,18 @@ class InvoiceRepository(BaseRepository):
         )
         return dict(result) if result else None
     
+    async def get_table_open_invoice_id(self, table_id: int) -> Optional[int]:
+        """
+        Bir masanın açık adisyonunun ID'sini getirir (masa indeksinden).
+        
+        Returns:
+            Adisyon ID'si veya None (masa boşsa)
+        """
+        table = await self.get_table(table_id)
+        if not table or not table['is_occupied']:
+            return None
+        return table['current_invoice_id']
+    
     async def is_table_occupied(self, table_id: int) -> bool:
         """
         Masa dolu mu kontrolü.
@@ -172,13 +213,12 @@ class InvoiceRepository(BaseRepository):
         Returns:
             True: Masa dolu (açık adisyon var)
             False: Masa boş
+        
+        Not:
+            - Masa indeksinden cevaplanır; indeks soğuksa DB'den yüklenir
         """
-        result = await self._execute_procedure(
-            'is_table_occupied',
-            table_id,
-            fetch_one=True
-        )
-        return result['is_occupied'] if result else False
+        table = await self.get_table(table_id)
+        return bool(table and table['is_occupied'])
     
     # ==================== SİPARİŞ SATIRLARI ====================
     
@@ -234,6 +274,72 @@ class InvoiceRepository(BaseRepository):
         )
         return dict(result) if result else None
     
+    async def add_invoice_lines(
+        self,
+        invoice_id: int,
+        lines: List[Dict[str, Any]],
+        created_by: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Adisyona birden fazla sipariş satırını tek sorguda ekler.
+        
+        Kullanıcıya anlatımı:
+            "Garsonun siparişindeki tüm ürünleri tek seferde ekliyorum.
+            Biri eklenemezse hiçbiri eklenmez."
+        
+        Args:
+            invoice_id: Adisyon ID'si
+            lines: [
+                {
+                    'product_id': Optional[int],
+                    'quantity': Decimal,
+                    'line_type': str,
+                    'unit_price': Optional[Decimal],
+                    'note': Optional[str]
+                }
+            ]
+            created_by: Ekleyen kullanıcı
+            
+        Returns:
+            {
+                'lines': [...],            # add_invoice_line çıktıları (sırasıyla)
+                'total_amount': Decimal    # Adisyonun yeni toplamı
+            }
+            
+        Raises:
+            BusinessRuleViolation: Herhangi bir satır eklenemezse
+                (tek sorgu olduğu için hiçbir satır eklenmez)
+        
+        Not:
+            - Satırlar dizi parametre olarak gider; add_invoice_line her satır
+              için sunucuda, satır sırasıyla çağrılır (ADD_INVOICE_LINES_QUERY)
+            - İki gidiş-dönüş: satırları ekleyen sorgu + yeni toplam (get_invoice);
+              toplam, satırları ekleyen sorgudan sonra çalışan trigger'la güncellenir
+            - Tek SQL komutu kendi başına atomiktir; ayrıca transaction açılmaz
+        """
+        results = await self._fetch_procedure_query(
+            'add_invoice_line',
+            ADD_INVOICE_LINES_QUERY,
+            invoice_id,
+            [line.get('product_id') for line in lines],
+            [line['quantity'] for line in lines],
+            [line['line_type'] for line in lines],
+            [line.get('unit_price') for line in lines],
+            [line.get('note') for line in lines],
+            created_by
+        )
+        
+        invoice = await self._execute_procedure(
+            'get_invoice',
+            invoice_id,
+            fetch_one=True
+        )
+        
+        return {
+            'lines': [dict(r) for r in results],
+            'total_amount': invoice['total_amount'] if invoice else None
+        }
+    
     async def remove_invoice_line(
         self,
         line_id: int,
@@ -357,10 +463,39 @@ class InvoiceRepository(BaseRepository):
             reason,
             fetch_one=True
         )
+        if result and result['success'] and await self._is_autocommit():
+            table_state.mark_invoice_closed(invoice_id)
         return dict(result) if result else None
     
     # ==================== MASA İŞLEMLERİ ====================
     
+    async def fetch_tables(self, include_inactive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Masaları doğrudan DB'den getirir (masa indeksini yüklemek için).
+        
+        Args:
+            include_inactive: Pasif masaları da getir
+        """
+        results = await self._execute_procedure(
+            'get_tables',
+            include_inactive,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def _load_table_state(self) -> List[Dict[str, Any]]:
+        """
+        Masa indeksini DB'den doldurur (soğuksa veya süresi dolmuşsa).
+        
+        Returns:
+            Okunan satırlar (pasifler dahil); okuma sürerken indeks
+            geçersiz kılındıysa indeks boş kalır, çağıran bunları kullanır
+        """
+        generation = table_state.generation
+        rows = await self.fetch_tables(include_inactive=True)
+        table_state.load(rows, generation)
+        return rows
+    
     async def get_tables(self, include_inactive: bool = False) -> List[Dict[str, Any]]:
         """
         Tüm masaları getirir.
@@ -379,37 +514,195 @@ class InvoiceRepository(BaseRepository):
                     'current_invoice_id': Optional[int]
                 }
             ]
+        
+        Not:
+            - Masa indeksinden cevaplanır; indeks soğuksa DB'den yüklenir
+        """
+        tables = table_state.get_tables(include_inactive)
+        if tables is None:
+            rows = await self._load_table_state()
+            tables = table_state.get_tables(include_inactive)
+            if tables is None:
+                tables = [r for r in rows if include_inactive or r['is_active']]
+        return tables
+    
+    async def get_table(self, table_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Masa detayını getirir.
+        
+        Args:
+            table_id: Masa ID'si
+        """
+        found, table = table_state.get_table(table_id)
+        if not found:
+            rows = await self._load_table_state()
+            found, table = table_state.get_table(table_id)
+            if not found:
+                table = next((r for r in rows if r['id'] == table_id), None)
+        return table
+    
+    async def get_available_tables(self) -> List[Dict[str, Any]]:
+        """
+        Boş masaları getirir.
+        
+        Returns:
+            Boş ve aktif masalar
+        """
+        tables = table_state.get_available_tables()
+        if tables is None:
+            rows = await self._load_table_state()
+            tables = table_state.get_available_tables()
+            if tables is None:
+                tables = [r for r in rows if r['is_active'] and not r['is_occupied']]
+        return tables
+    
+    # ==================== ÜRÜN SATIŞ ÖZETİ ====================
+    
+    async def get_product_sales(
+        self,
+        start_date: date,
+        end_date: date,
+        category_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tarih aralığında ürün bazlı satışları getirir.
+        
+        Args:
+            start_date: Başlangıç tarihi (dahil)
+            end_date: Bitiş tarihi (dahil)
+            category_id: Kategori filtresi (opsiyonel)
+            
+        Returns:
+            Ciroya göre büyükten küçüğe:
+            [
+                {
+                    'product_id': int,
+                    'product_name': str,
+                    'category_id': Optional[int],
+                    'category_name': str,
+                    'quantity': Decimal,
+                    'total_amount': Decimal,
+                    'line_count': int
+                }
+            ]
+        
+        Not:
+            - Kapalı adisyonlardan beslenen daily_product_sales özetinden okunur
+              (bkz. app/db/sql/006_daily_product_sales.sql)
         """
         results = await self._execute_procedure(
-            'get_tables',
-            include_inactive,
+            'get_product_sales_range',
+            start_date,
+            end_date,
+            category_id,
             fetch=True
         )
         return [dict(r) for r in results]
     
-    async def get_table(self, table_id: int) -> Optional[Dict[str, Any]]:
+    async def get_category_sales(
+        self,
+        start_date: date,
+        end_date: date,
+        top_n: int = 5
+    ) -> List[Dict[str, Any]]:
         """
-        Masa detayını getirir.
+        Tarih aralığında kategori bazlı satışları getirir (tek sorgu).
         
         Args:
-            table_id: Masa ID'si
+            start_date: Başlangıç tarihi (dahil)
+            end_date: Bitiş tarihi (dahil)
+            top_n: Kategori başına döndürülecek en çok satan ürün sayısı
+            
+        Returns:
+            Ciroya göre büyükten küçüğe:
+            [
+                {
+                    'category_id': Optional[int],
+                    'category_name': str,
+                    'total_quantity': Decimal,
+                    'total_amount': Decimal,
+                    'product_count': int,
+                    'top_products': [
+                        {'product_id': int, 'product_name': str,
+                         'quantity': Decimal, 'total_amount': Decimal}
+                    ]
+                }
+            ]
+        """
+        results = await self._execute_procedure(
+            'get_category_sales_range',
+            start_date,
+            end_date,
+            top_n,
+            fetch=True
+        )
+        rows = []
+        for r in results:
+            row = dict(r)
+            # jsonb asyncpg'den metin olarak gelir
+            if isinstance(row['top_products'], str):
+                row['top_products'] = json.loads(row['top_products'], parse_float=Decimal)
+            rows.append(row)
+        return rows
+    
+    async def verify_product_sales_rollup(
+        self,
+        day_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Gün × ürün özetini kapalı adisyon satırlarıyla karşılaştırır.
+        
+        Returns:
+            Farklı olan (day_id, product_id) satırları (boş liste = tutarlı)
+        """
+        results = await self._execute_procedure(
+            'verify_daily_product_sales',
+            day_id,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def rebuild_product_sales_rollup(
+        self,
+        day_id: Optional[int] = None
+    ) -> int:
+        """
+        Gün × ürün özetini kapalı adisyon satırlarından yeniden kurar.
+        
+        Returns:
+            Yazılan özet satırı sayısı
         """
         result = await self._execute_procedure(
-            'get_table',
-            table_id,
+            'rebuild_daily_product_sales',
+            day_id,
             fetch_one=True
         )
-        return dict(result) if result else None
+        return result[0] if result else 0
     
-    async def get_available_tables(self) -> List[Dict[str, Any]]:
+    # ==================== YÜRÜYEN TOPLAM BAKIMI ====================
+    
+    async def verify_running_totals(self) -> List[Dict[str, Any]]:
         """
-        Boş masaları getirir.
+        Açık adisyonların yürüyen toplamını satırlardan hesaplananla karşılaştırır.
         
         Returns:
-            Boş ve aktif masalar
+            Farklı olan adisyonlar (boş liste = tutarlı)
         """
         results = await self._execute_procedure(
-            'get_available_tables',
+            'verify_invoice_running_totals',
             fetch=True
         )
-        return [dict(r) for r in results]
\ No newline at end of file
+        return [dict(r) for r in results]
+    
+    async def rebuild_running_totals(self) -> int:
+        """
+        Açık adisyonların yürüyen toplamını satırlardan yeniden hesaplar.
+        
+        Returns:
+            Düzeltilen adisyon sayısı
+        """
+        result = await self._execute_procedure(
+            'rebuild_invoice_running_totals',
+            fetch_one=True
+        )
+        return result[0] if result else 0
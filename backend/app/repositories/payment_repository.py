@@ -10,12 +10,14 @@ Bu repository:
 NOT: Ödeme işlemleri atomiktir. Ya hep ya hiç!
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from decimal import Decimal
 from datetime import date, datetime
 from asyncpg import Connection
+import json
 
 from app.repositories.base import BaseRepository
+from app.cache.table_state import table_state
 
 
 class PaymentRepository(BaseRepository):
@@ -88,6 +90,57 @@ class PaymentRepository(BaseRepository):
             description,
             fetch_one=True
         )
+        if result and result['table_freed'] and await self._is_autocommit():
+            table_state.mark_invoice_closed(invoice_id)
+        return dict(result) if result else None
+    
+    async def process_payment_checked(
+        self,
+        invoice_id: int,
+        payment_method: str,
+        amount: Decimal,
+        processed_by: int,
+        customer_id: Optional[int] = None,
+        description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Ön kontrolleri ve atomik ödemeyi tek DB çağrısında yapar.
+        
+        Kullanıcıya anlatımı:
+            "Gün açık mı, adisyon açık mı, tutar doğru mu - hepsine DB tek
+            seferde bakıyor, uygunsa ödemeyi de aynı çağrıda alıyor."
+        
+        Args:
+            process_payment_atomic ile aynı
+            
+        Returns:
+            {
+                'status': str,                # OK, DAY_CLOSED, INVOICE_NOT_FOUND,
+                                              # INVOICE_NOT_OPEN, INVALID_AMOUNT
+                'message': Optional[str],     # INVALID_AMOUNT açıklaması
+                'invoice_status': Optional[str],
+                'transaction_id': Optional[int],
+                'invoice_closed': Optional[bool],
+                'table_freed': Optional[bool],
+                'billiard_calculated': Optional[bool],
+                'new_balance': Optional[Decimal]
+            }
+        
+        Not:
+            Prosedür: app/db/sql/003_process_payment_checked.sql
+        """
+        result = await self._execute_procedure(
+            'process_payment_checked',
+            invoice_id,
+            payment_method,
+            amount,
+            processed_by,
+            customer_id,
+            description,
+            fetch_one=True
+        )
+        if result and result['table_freed'] and await self._is_autocommit():
+            table_state.mark_invoice_closed(invoice_id)
         return dict(result) if result else None
     
     # ==================== ÖDEME SORGULAMA ====================
@@ -193,7 +246,73 @@ class PaymentRepository(BaseRepository):
             fetch=True
         )
         return [dict(r) for r in results]
-    
+
+    async def get_finance_transactions_page(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        after_date: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Finans hareketlerinin bir sayfasını getirir (keyset sayfalama).
+
+        Args:
+            start_date: Başlangıç tarihi
+            end_date: Bitiş tarihi
+            transaction_type: Hareket tipi (SALES, PAYMENT, DEBT, EXPENSE)
+            after_date: Önceki sayfanın son satırının transaction_date'i
+            after_id: Önceki sayfanın son satırının id'si
+            limit: Döndürülecek en fazla satır
+
+        Returns:
+            get_finance_transactions ile aynı satırlar,
+            (transaction_date, id) sırasıyla yeniden eskiye
+
+        Not:
+            - Sıralama ve limit DB'de uygulanır; sadece istenen sayfa taşınır
+        """
+        results = await self._execute_procedure(
+            'get_finance_transactions_page',
+            start_date,
+            end_date,
+            transaction_type,
+            after_date,
+            after_id,
+            limit,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+
+    async def stream_finance_transactions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        prefetch: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Filtreye uyan tüm finans hareketlerini satır satır döner (dışa aktarım için).
+
+        Not:
+            - get_finance_transactions_page limitsiz çağrılır; satırlar
+              sunucu taraflı imleçle `prefetch`'er adet çekilir
+            - Transaction içinde çağrılmalıdır (bkz. read_only_snapshot)
+        """
+        async for record in self._stream_procedure(
+            'get_finance_transactions_page',
+            start_date,
+            end_date,
+            transaction_type,
+            None,
+            None,
+            None,
+            prefetch=prefetch
+        ):
+            yield dict(record)
+
     async def get_daily_summary(
         self,
         day_id: int
@@ -213,14 +332,196 @@ class PaymentRepository(BaseRepository):
                 'debt_paid': Decimal,               # Ödenen borçlar
                 'transaction_count': int            # İşlem sayısı
             }
+        
+        Not:
+            - Ham hareketler yerine daily_sales_rollup özet tablosundan okunur
+              (bkz. app/db/sql/005_daily_sales_rollup.sql)
         """
         result = await self._execute_procedure(
-            'get_daily_finance_summary',
+            'get_daily_finance_summary_rollup',
             day_id,
             fetch_one=True
         )
         return dict(result) if result else None
     
+    async def get_daily_summaries(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Tarih aralığındaki her gün için finans özetini tek sorguda getirir.
+        
+        Args:
+            start_date: Başlangıç tarihi (dahil)
+            end_date: Bitiş tarihi (dahil)
+            
+        Returns:
+            Aralıktaki her tarih için bir satır (açılmamış günler sıfır):
+            [
+                {
+                    'day_date': date,
+                    'total_sales': Decimal,
+                    'cash_total': Decimal,
+                    'credit_card_total': Decimal,
+                    'debt_created': Decimal,
+                    'debt_paid': Decimal,
+                    'invoice_count': int,
+                    'transaction_count': int
+                }
+            ]
+        """
+        results = await self._execute_procedure(
+            'get_daily_sales_range',
+            start_date,
+            end_date,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def get_cash_flow(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Tarih aralığında gün gün nakit akışını getirir (tek sorgu).
+        
+        Returns:
+            Aralıktaki her tarih için bir satır (açılmamış günler sıfır):
+            [
+                {
+                    'day_date': date,
+                    'cash_in': Decimal,          # Giren nakit
+                    'cash_out': Decimal,         # Çıkan nakit (iade, gider)
+                    'net_cash_flow': Decimal,
+                    'running_balance': Decimal   # Dönem başından bu güne net
+                }
+            ]
+        """
+        results = await self._execute_procedure(
+            'get_cash_flow_range',
+            start_date,
+            end_date,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def get_period_summary(
+        self,
+        start_date: date,
+        end_date: date,
+        top_n: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Dönem özetini tek sorguda getirir.
+        
+        Returns:
+            {
+                'total_sales': Decimal,
+                'total_cash': Decimal,
+                'total_credit': Decimal,
+                'total_debt_created': Decimal,
+                'total_debt_paid': Decimal,
+                'open_day_count': int,           # Aralıkta açılmış gün
+                'average_daily_sales': Decimal,   # total_sales / open_day_count
+                'busiest_day_date': Optional[date],
+                'busiest_day_sales': Optional[Decimal],
+                'top_products': [{'product_id', 'product_name', 'quantity', 'total_amount'}]
+            }
+        """
+        result = await self._execute_procedure(
+            'get_period_summary',
+            start_date,
+            end_date,
+            top_n,
+            fetch_one=True
+        )
+        row = dict(result) if result else None
+        # jsonb asyncpg'den metin olarak gelir
+        if row and isinstance(row['top_products'], str):
+            row['top_products'] = json.loads(row['top_products'], parse_float=Decimal)
+        return row
+    
+    async def verify_daily_rollup(
+        self,
+        day_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Günlük özet tabloyu ham finans hareketleriyle karşılaştırır.
+        
+        Args:
+            day_id: Belirli bir gün (None: tüm günler)
+            
+        Returns:
+            Farklı olan satırlar (boş liste = tutarlı):
+            [
+                {
+                    'day_id': int,
+                    'transaction_type': str,
+                    'payment_method': str,
+                    'rollup_amount': Decimal,
+                    'actual_amount': Decimal,
+                    'rollup_count': int,
+                    'actual_count': int
+                }
+            ]
+        """
+        results = await self._execute_procedure(
+            'verify_daily_sales_rollup',
+            day_id,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def compare_daily_summary(
+        self,
+        day_id: Optional[int] = None,
+        sample: int = 14
+    ) -> List[Dict[str, Any]]:
+        """
+        Eski get_daily_finance_summary ile rollup özetini karşılaştırır.
+        
+        Args:
+            day_id: Belirli bir gün (None: son `sample` gün + rastgele `sample` gün)
+            sample: Örnek gün sayısı
+            
+        Returns:
+            Farklı çıkan kolonlar (boş liste = aynı):
+            [
+                {
+                    'day_id': int,
+                    'column_name': str,
+                    'legacy_value': Decimal,
+                    'rollup_value': Decimal
+                }
+            ]
+        """
+        results = await self._execute_procedure(
+            'compare_daily_finance_summary',
+            day_id,
+            sample,
+            fetch=True
+        )
+        return [dict(r) for r in results]
+    
+    async def rebuild_daily_rollup(
+        self,
+        day_id: Optional[int] = None
+    ) -> int:
+        """
+        Günlük özet tabloyu ham finans hareketlerinden yeniden kurar.
+        
+        Returns:
+            Yazılan özet satırı sayısı
+        """
+        result = await self._execute_procedure(
+            'rebuild_daily_sales_rollup',
+            day_id,
+            fetch_one=True
+        )
+        return result[0] if result else 0
+    
     # ==================== İADE İŞLEMLERİ ====================
     
     async def process_refund(
@@ -0,0 +1,97 @@
+"""
+MyCafe - Unit of Work (Açık Transaction Kapsamı)
+
+Bu modül:
+- Service'lerin çok adımlı işlemleri tek transaction'da yapmasını sağlar
+- Raporlar için salt okunur (READ ONLY) ve tutarlı anlık görüntü
+  (REPEATABLE READ / SERIALIZABLE DEFERRABLE) kipleri sunar
+- Zaten transaction içindeyse dıştaki transaction'a katılır
+
+Kullanımı:
+    async with unit_of_work(self.customer_repo.conn):
+        customer = await self.customer_repo.get_customer(customer_id)
+        ...
+        await self.customer_repo.create_debt(...)
+
+    async with read_only_snapshot(self.payment_repo.conn):
+        ...  # tüm sorgular aynı anlık görüntüyü görür
+
+Not:
+    Aynı istekteki tüm repository'ler aynı bağlantıyı paylaştığı için
+    transaction hepsini kapsar.
+"""
+
+from typing import Optional
+import logging
+
+from app.db.lazy import resolve_connection
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """
+    Transaction kapsamı
+
+    Args:
+        conn: Connection veya LazyConnection
+        isolation: 'read_committed', 'repeatable_read', 'serializable' (None: DB varsayılanı)
+        readonly: READ ONLY transaction
+        deferrable: DEFERRABLE (sadece serializable + readonly ile anlamlı)
+    """
+
+    def __init__(
+        self,
+        conn,
+        isolation: Optional[str] = None,
+        readonly: bool = False,
+        deferrable: bool = False
+    ):
+        self._conn = conn
+        self._isolation = isolation
+        self._readonly = readonly
+        self._deferrable = deferrable
+        self._tx = None
+
+    async def __aenter__(self):
+        conn = await resolve_connection(self._conn)
+
+        # Dıştaki unit of work'e katıl (savepoint açma, kipleri değiştirme)
+        if conn.is_in_transaction():
+            return conn
+
+        self._tx = conn.transaction(
+            isolation=self._isolation,
+            readonly=self._readonly,
+            deferrable=self._deferrable
+        )
+        await self._tx.start()
+        return conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._tx is None:
+            return False
+        tx, self._tx = self._tx, None
+        if exc_type is None:
+            await tx.commit()
+        else:
+            await tx.rollback()
+        return False
+
+
+def unit_of_work(conn) -> UnitOfWork:
+    """Okuma + yazma adımlarını tek transaction'da toplar"""
+    return UnitOfWork(conn)
+
+
+def read_only_snapshot(conn, deferrable: bool = False) -> UnitOfWork:
+    """
+    Raporlar için salt okunur, tutarlı anlık görüntü.
+
+    Args:
+        deferrable: True ise SERIALIZABLE READ ONLY DEFERRABLE kullanılır
+            (uzun raporlar için; serileştirme hatası riski olmadan bekler)
+    """
+    if deferrable:
+        return UnitOfWork(conn, isolation='serializable', readonly=True, deferrable=True)
+    return UnitOfWork(conn, isolation='repeatable_read', readonly=True)
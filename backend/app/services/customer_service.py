@@ -23,6 +23,7 @@ from app.core.exceptions import (
     BusinessRuleViolation
 )
 from app.core.security import check_permission
+from app.repositories.unit_of_work import unit_of_work
 
 
 class CustomerService:
@@ -206,37 +207,39 @@ class CustomerService:
         if not check_permission(current_user_role, ['GARSON', 'ADMIN', 'SYS']):
             raise PermissionDenied("Borç yazma yetkiniz yok.")
         
-        # Gün kontrolü
-        await self._validate_day_open("Borç yazma")
-        
-        # Müşteri kontrolü
-        customer = await self.customer_repo.get_customer(customer_id)
-        if not customer:
-            raise ResourceNotFound("Müşteri", customer_id)
-        
-        if not customer['is_active']:
-            raise BusinessRuleViolation("Pasif müşteriye borç yazılamaz.")
-        
-        # Adisyon kontrolü
-        invoice = await self.invoice_repo.get_invoice(invoice_id)
-        if not invoice:
-            raise ResourceNotFound("Adisyon", invoice_id)
-        
-        if invoice['status'] != 'OPEN':
-            raise BusinessRuleViolation(
-                f"Sadece açık adisyonlara borç yazılabilir. "
-                f"Adisyon durumu: {invoice['status']}"
+        # Kontroller ve yazma tek transaction'da
+        async with unit_of_work(self.customer_repo.conn):
+            # Gün kontrolü
+            await self._validate_day_open("Borç yazma")
+            
+            # Müşteri kontrolü
+            customer = await self.customer_repo.get_customer(customer_id)
+            if not customer:
+                raise ResourceNotFound("Müşteri", customer_id)
+            
+            if not customer['is_active']:
+                raise BusinessRuleViolation("Pasif müşteriye borç yazılamaz.")
+            
+            # Adisyon kontrolü
+            invoice = await self.invoice_repo.get_invoice(invoice_id)
+            if not invoice:
+                raise ResourceNotFound("Adisyon", invoice_id)
+            
+            if invoice['status'] != 'OPEN':
+                raise BusinessRuleViolation(
+                    f"Sadece açık adisyonlara borç yazılabilir. "
+                    f"Adisyon durumu: {invoice['status']}"
+                )
+            
+            # Borç yaz
+            result = await self.customer_repo.create_debt(
+                customer_id=customer_id,
+                invoice_id=invoice_id,
+                amount=amount,
+                created_by=current_user_id,
+                description=description
             )
         
-        # Borç yaz
-        result = await self.customer_repo.create_debt(
-            customer_id=customer_id,
-            invoice_id=invoice_id,
-            amount=amount,
-            created_by=current_user_id,
-            description=description
-        )
-        
         # Response oluştur
         return DebtResponse(
             id=result['debt_id'],
@@ -276,30 +279,32 @@ class CustomerService:
         if not check_permission(current_user_role, ['GARSON', 'ADMIN', 'SYS']):
             raise PermissionDenied("Borç ödemesi alma yetkiniz yok.")
         
-        # Gün kontrolü
-        await self._validate_day_open("Borç ödemesi")
-        
-        # Müşteri kontrolü
-        customer = await self.customer_repo.get_customer(customer_id)
-        if not customer:
-            raise ResourceNotFound("Müşteri", customer_id)
-        
-        # Borç kontrolü
-        balance = await self.customer_repo.get_customer_balance(customer_id)
-        if amount > balance['current_balance']:
-            raise BusinessRuleViolation(
-                f"Ödeme tutarı ({amount} TL) borçtan ({balance['current_balance']} TL) büyük olamaz."
+        # Kontroller ve yazma tek transaction'da
+        async with unit_of_work(self.customer_repo.conn):
+            # Gün kontrolü
+            await self._validate_day_open("Borç ödemesi")
+            
+            # Müşteri kontrolü
+            customer = await self.customer_repo.get_customer(customer_id)
+            if not customer:
+                raise ResourceNotFound("Müşteri", customer_id)
+            
+            # Borç kontrolü
+            balance = await self.customer_repo.get_customer_balance(customer_id)
+            if amount > balance['current_balance']:
+                raise BusinessRuleViolation(
+                    f"Ödeme tutarı ({amount} TL) borçtan ({balance['current_balance']} TL) büyük olamaz."
+                )
+            
+            # Ödemeyi al
+            result = await self.customer_repo.pay_debt(
+                customer_id=customer_id,
+                amount=amount,
+                payment_method=payment_method,
+                created_by=current_user_id,
+                description=description
             )
         
-        # Ödemeyi al
-        result = await self.customer_repo.pay_debt(
-            customer_id=customer_id,
-            amount=amount,
-            payment_method=payment_method,
-            created_by=current_user_id,
-            description=description
-        )
-        
         # Response oluştur
         return DebtResponse(
             id=result['payment_id'],
@@ -431,18 +436,20 @@ class CustomerService:
         if not check_permission(current_user_role, ['ADMIN', 'SYS']):
             raise PermissionDenied("Borç düzeltmesi sadece ADMIN'ler tarafından yapılabilir.")
         
-        # Gün kontrolü
-        await self._validate_day_open("Borç düzeltme")
-        
-        # Müşteri kontrolü
-        customer = await self.customer_repo.get_customer(customer_id)
-        if not customer:
-            raise ResourceNotFound("Müşteri", customer_id)
-        
-        # Düzeltme yap
-        return await self.customer_repo.correct_debt(
-            customer_id=customer_id,
-            correction_amount=correction_amount,
-            reason=reason,
-            corrected_by=current_user_id
-        )
\ No newline at end of file
+        # Kontroller ve yazma tek transaction'da
+        async with unit_of_work(self.customer_repo.conn):
+            # Gün kontrolü
+            await self._validate_day_open("Borç düzeltme")
+            
+            # Müşteri kontrolü
+            customer = await self.customer_repo.get_customer(customer_id)
+            if not customer:
+                raise ResourceNotFound("Müşteri", customer_id)
+            
+            # Düzeltme yap
+            return await self.customer_repo.correct_debt(
+                customer_id=customer_id,
+                correction_amount=correction_amount,
+                reason=reason,
+                corrected_by=current_user_id
+            )
\ No newline at end of file
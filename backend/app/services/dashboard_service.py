@@ -0,0 +1,90 @@
+"""
+MyCafe - Ana Ekran (Dashboard) Service'i
+
+Bu service:
+- Ana ekranın ihtiyaç duyduğu gün durumu, masalar, açık adisyonlar ve
+  bugünün özetini tek seferde toplar
+- Gün durumunu ve masaları bellekten, kalanını tek anlık görüntüde paralel okur
+- Son sonucu canlı olay sürümüyle önbellekte tutar; değişiklik yoksa DB'ye gitmez
+- Bugünün finans özetini sadece ADMIN / SYS'e gösterir
+
+Kullanıcı dili:
+    "Ana ekran dört ayrı istek yerine tek istekle yenilenir."
+"""
+
+from typing import Any, Dict
+
+from app.repositories.day_repository import DayRepository
+from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.fanout import run_in_shared_snapshot
+from app.services.day_service import DayService
+from app.models.domain import TableResponse, InvoiceSummaryResponse
+from app.core.events import event_broker
+from app.core.security import check_permission
+from app.cache.dashboard_cache import dashboard_cache
+
+
+class DashboardService:
+    """
+    Ana ekran service'i
+
+    Kullanıcı dili:
+    - Gün açık mı?
+    - Hangi masalar dolu?
+    - Açık adisyonlar ve tutarları
+    - Bugün ne kadar satıldı? (sadece ADMIN)
+    """
+
+    def __init__(self, day_repo: DayRepository):
+        self.day_repo = day_repo
+
+    async def _load(self) -> Dict[str, Any]:
+        day_status = await DayService(self.day_repo).get_day_status()
+        current_day = await self.day_repo.get_current_day()
+
+        # Masalar bellekteki indeksten gelir; ek bağlantı gerektirmez
+        tables = await InvoiceRepository(self.day_repo.conn).get_tables()
+
+        # Bağımsız sorgular aynı anlık görüntüde paralel çalışır
+        tasks = [
+            lambda c: InvoiceRepository(c).get_open_invoices(),
+        ]
+        if current_day:
+            tasks.append(lambda c: PaymentRepository(c).get_daily_summary(current_day['id']))
+
+        open_invoices, *rest = await run_in_shared_snapshot(self.day_repo.conn, *tasks)
+        summary = rest[0] if rest else None
+
+        return {
+            "day": day_status.model_dump(),
+            "tables": [TableResponse(**t).model_dump() for t in tables],
+            "open_invoices": [InvoiceSummaryResponse(**i).model_dump() for i in open_invoices],
+            "summary": dict(summary) if summary else None
+        }
+
+    async def get_dashboard(self, current_user_role: str) -> Dict[str, Any]:
+        """
+        Ana ekran verisini getirir.
+
+        Returns:
+            {
+                "day": {...},              # DayStatusResponse
+                "tables": [...],           # TableResponse listesi
+                "open_invoices": [...],    # InvoiceSummaryResponse listesi
+                "summary": {...} | None    # Bugünün özeti (gün kapalıysa veya yetki yoksa None)
+            }
+
+        Not:
+            - Sürüm okunduktan sonra gelen bildirim sürümü artırır;
+              yarışta kaybeden istek eski sürümle yazar, bir sonraki istek yeniden yükler
+        """
+        version = event_broker.version
+        dashboard = dashboard_cache.get(version)
+        if dashboard is None:
+            dashboard = await self._load()
+            dashboard_cache.set(version, dashboard)
+
+        if check_permission(current_user_role, ['ADMIN', 'SYS']):
+            return dashboard
+        return {**dashboard, "summary": None}
@@ -0,0 +1,152 @@
+"""
+MyCafe - Dışa Aktarım (Export) Service'i
+
+Bu service:
+- Finans hareketlerini CSV veya NDJSON olarak parça parça üretir
+- Satırları DB'den sunucu taraflı imleçle okur (bellek kullanımı sabit)
+- Tüm okuma tek salt okunur transaction'da yapılır (tutarlı anlık görüntü)
+- İstenirse çıktıyı akış halinde gzip'ler
+
+Kullanımı:
+    service = ExportService(payment_repo)
+    async for chunk in service.stream_finance_transactions(fmt='csv'):
+        ...  # StreamingResponse'a verilir
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import date, timedelta
+import csv
+import io
+import json
+import zlib
+
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.unit_of_work import read_only_snapshot
+
+# Dışa aktarılan kolonlar (FinanceTransactionResponse ile aynı sıra)
+FINANCE_EXPORT_COLUMNS = (
+    'id',
+    'transaction_date',
+    'day_id',
+    'invoice_id',
+    'transaction_type',
+    'amount',
+    'payment_method',
+    'description',
+    'created_by',
+    'created_by_name',
+)
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Bu boyuta ulaşan tampon istemciye gönderilir
+_CHUNK_SIZE = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    """Decimal / datetime gibi tipleri JSON'a çevirir"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class ExportService:
+    """
+    Dışa aktarım service'i
+
+    Kullanıcı dili:
+    - Finans hareketlerini muhasebe için indir (CSV / NDJSON)
+    """
+
+    def __init__(self, payment_repo: PaymentRepository):
+        self.payment_repo = payment_repo
+
+    def _format_rows(self, fmt: str, rows: List[Dict[str, Any]]) -> str:
+        if fmt == 'ndjson':
+            return ''.join(
+                json.dumps(
+                    {col: row.get(col) for col in FINANCE_EXPORT_COLUMNS},
+                    default=_json_default,
+                    ensure_ascii=False
+                ) + '\n'
+                for row in rows
+            )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                '' if row.get(col) is None else row.get(col)
+                for col in FINANCE_EXPORT_COLUMNS
+            ])
+        return buffer.getvalue()
+
+    def _header(self, fmt: str) -> str:
+        if fmt != 'csv':
+            return ''
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(FINANCE_EXPORT_COLUMNS)
+        return buffer.getvalue()
+
+    async def stream_finance_transactions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        fmt: str = 'csv',
+        compress: bool = False,
+        batch_size: int = 500
+    ) -> AsyncIterator[bytes]:
+        """
+        Finans hareketlerini dışa aktarım formatında parça parça üretir.
+
+        Args:
+            start_date / end_date / transaction_type:
+                ReportService.get_finance_transactions ile aynı filtreler
+                (tarih verilmezse son 30 gün)
+            fmt: 'csv' veya 'ndjson'
+            compress: True ise çıktı gzip akışıdır
+            batch_size: DB'den tek seferde çekilecek ve birlikte
+                biçimlendirilecek satır sayısı
+
+        Yields:
+            bytes parçaları (en fazla ~64 KB, gzip'te daha küçük)
+        """
+        if not start_date:
+            end_date = date.today()
+            start_date = end_date - timedelta(days=30)
+
+        # wbits=31: zlib yerine gzip başlığı/sonu üret
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(text: str) -> bytes:
+            data = text.encode('utf-8')
+            return compressor.compress(data) if compressor else data
+
+        pending = encode(self._header(fmt))
+        rows: List[Dict[str, Any]] = []
+
+        async with read_only_snapshot(self.payment_repo.conn):
+            async for row in self.payment_repo.stream_finance_transactions(
+                start_date=start_date,
+                end_date=end_date,
+                transaction_type=transaction_type,
+                prefetch=batch_size
+            ):
+                rows.append(row)
+                if len(rows) < batch_size:
+                    continue
+                pending += encode(self._format_rows(fmt, rows))
+                rows = []
+                if len(pending) >= _CHUNK_SIZE:
+                    yield pending
+                    pending = b''
+
+        if rows:
+            pending += encode(self._format_rows(fmt, rows))
+        if compressor:
+            pending += compressor.flush()
+        if pending:
+            yield pending
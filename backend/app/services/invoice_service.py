@@ -6,13 +6,21 @@ from decimal import Decimal
 
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.day_repository import DayRepository
+from app.repositories.catalog_repository import CatalogRepository
 from app.models.domain import (
     InvoiceResponse, 
     InvoiceLineResponse, 
     TableResponse,
-    InvoiceSummaryResponse
+    InvoiceSummaryResponse,
+    InvoiceLineRequest,
+    InvoiceLinesBatchResponse
+)
+from app.core.exceptions import (
+    PermissionDenied,
+    ResourceNotFound,
+    ClosedDayViolation,
+    BusinessRuleViolation
 )
-from app.core.exceptions import PermissionDenied, ResourceNotFound, ClosedDayViolation
 from app.core.security import check_permission
 
 
@@ -21,9 +29,15 @@ class InvoiceService:
     Adisyon yönetimi service'i
     """
     
-    def __init__(self, invoice_repo: InvoiceRepository, day_repo: DayRepository):
+    def __init__(
+        self,
+        invoice_repo: InvoiceRepository,
+        day_repo: DayRepository,
+        catalog_repo: CatalogRepository
+    ):
         self.invoice_repo = invoice_repo
         self.day_repo = day_repo
+        self.catalog_repo = catalog_repo
     
     async def _validate_day_open(self, operation: str):
         """Günün açık olduğunu doğrular"""
@@ -31,6 +45,24 @@ class InvoiceService:
         if not is_open:
             raise ClosedDayViolation(operation)
     
+    async def _validate_products(self, product_ids: List[Optional[int]]):
+        """
+        Ürünlerin katalogda olduğunu ve satışa açık olduğunu doğrular.
+        
+        Not:
+            - Bellekteki katalogdan kontrol edilir; geçersiz ürün DB'ye gitmeden reddedilir
+            - Birden fazla ürün verilirse mesajda satır numarası yer alır
+        """
+        unavailable = set(await self.catalog_repo.find_unavailable_products(product_ids))
+        if not unavailable:
+            return
+        for index, product_id in enumerate(product_ids, start=1):
+            if product_id in unavailable:
+                message = f"Ürün {product_id} bulunamadı veya satışa kapalı."
+                if len(product_ids) > 1:
+                    message = f"Satır {index}: {message}"
+                raise BusinessRuleViolation(message)
+    
     # ==================== ADİSYON İŞLEMLERİ ====================
     
     async def create_invoice(
@@ -86,12 +118,12 @@ class InvoiceService:
         table_id: int, 
         current_user_role: str
     ) -> Optional[InvoiceResponse]:
-        """Bir masanın açık adisyonunu getirir"""
-        invoice = await self.invoice_repo.get_table_open_invoice(table_id)
-        if not invoice:
+        """Bir masanın açık adisyonunu getirir (masa boşsa DB'ye gidilmez)"""
+        invoice_id = await self.invoice_repo.get_table_open_invoice_id(table_id)
+        if not invoice_id:
             return None
         
-        return await self.get_invoice(invoice['id'], current_user_role)
+        return await self.get_invoice(invoice_id, current_user_role)
     
     # ==================== SİPARİŞ SATIRLARI ====================
     
@@ -114,6 +146,9 @@ class InvoiceService:
         # Gün kontrolü
         await self._validate_day_open("Sipariş ekleme")
         
+        # Ürün kontrolü (katalog önbelleğinden)
+        await self._validate_products([product_id])
+        
         # Önce adisyonun var olduğunu kontrol et
         invoice = await self.invoice_repo.get_invoice(invoice_id)
         if not invoice:
@@ -132,6 +167,56 @@ class InvoiceService:
         
         return InvoiceLineResponse(**result)
     
+    async def add_lines(
+        self,
+        invoice_id: int,
+        lines: List[InvoiceLineRequest],
+        current_user_id: int,
+        current_user_role: str
+    ) -> InvoiceLinesBatchResponse:
+        """
+        Adisyona birden fazla sipariş satırını tek seferde ekler.
+        
+        Kontroller (bir kez yapılır):
+            - Yetki
+            - Gün açık mı?
+            - Ürünler katalogda ve satışta mı? (DB'ye gitmeden)
+            - Adisyon var ve açık mı?
+        """
+        # Yetki kontrolü
+        if not check_permission(current_user_role, ['GARSON', 'ADMIN', 'SYS']):
+            raise PermissionDenied("Sipariş ekleme yetkiniz yok.")
+        
+        # Gün kontrolü
+        await self._validate_day_open("Sipariş ekleme")
+        
+        # Ürün kontrolü (katalog önbelleğinden)
+        await self._validate_products([line.product_id for line in lines])
+        
+        # Adisyon kontrolü
+        invoice = await self.invoice_repo.get_invoice(invoice_id)
+        if not invoice:
+            raise ResourceNotFound("Adisyon", invoice_id)
+        if invoice['status'] != 'OPEN':
+            raise BusinessRuleViolation(
+                f"Adisyon {invoice_id} zaten {invoice['status']} durumunda. "
+                "Sadece açık adisyonlara sipariş eklenebilir."
+            )
+        
+        # Satırları tek sorguda ekle
+        result = await self.invoice_repo.add_invoice_lines(
+            invoice_id=invoice_id,
+            lines=[line.model_dump() for line in lines],
+            created_by=current_user_id
+        )
+        
+        return InvoiceLinesBatchResponse(
+            invoice_id=invoice_id,
+            lines=[InvoiceLineResponse(**r) for r in result['lines']],
+            line_count=len(result['lines']),
+            total_amount=result['total_amount']
+        )
+    
     async def remove_line(
         self,
         line_id: int,
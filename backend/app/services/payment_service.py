@@ -71,6 +71,27 @@ class PaymentService:
         
         return invoice
     
+    def _raise_for_payment_status(self, invoice_id: int, result: Optional[dict]):
+        """process_payment_checked durumunu eski hata tiplerine çevirir"""
+        status = result['status'] if result else None
+        
+        if status == 'OK':
+            return
+        if status == 'DAY_CLOSED':
+            raise ClosedDayViolation("Ödeme alma")
+        if status == 'INVOICE_NOT_FOUND':
+            raise ResourceNotFound("Adisyon", invoice_id)
+        if status == 'INVOICE_NOT_OPEN':
+            raise BusinessRuleViolation(
+                f"Adisyon {invoice_id} zaten {result['invoice_status']} durumunda. "
+                "Sadece açık adisyonlara ödeme alınabilir."
+            )
+        if status == 'INVALID_AMOUNT':
+            raise BusinessRuleViolation(
+                f"Geçersiz ödeme tutarı: {result['message']}"
+            )
+        raise BusinessRuleViolation(f"Ödeme tamamlanamadı: {status}")
+    
     # ==================== ÖDEME İŞLEMLERİ ====================
     
     async def process_payment(
@@ -98,32 +119,23 @@ class PaymentService:
             - Adisyon açık mı?
             - Ödeme tutarı geçerli mi? (fazla/eksik ödeme yok)
             - DEBT için müşteri var mı?
+        
+        Not:
+            DEBT kontrolü dışındaki kontroller ve ödemenin kendisi
+            process_payment_checked ile tek DB çağrısında yapılır.
         """
         # Yetki kontrolü
         if not check_permission(current_user_role, ['GARSON', 'ADMIN', 'SYS']):
             raise PermissionDenied("Ödeme alma yetkiniz yok.")
         
-        # Gün kontrolü
-        await self._validate_day_open("Ödeme alma")
-        
-        # Adisyon kontrolü
-        await self._validate_invoice_open(invoice_id)
-        
-        # Ödeme tutarını validate et
-        validation = await self.payment_repo.validate_payment_amount(invoice_id, amount)
-        if not validation['is_valid']:
-            raise BusinessRuleViolation(
-                f"Geçersiz ödeme tutarı: {validation['message']}"
-            )
-        
-        # DEBT kontrolü
+        # DEBT kontrolü (DB'ye gitmeden)
         if payment_method == 'DEBT' and not customer_id:
             raise BusinessRuleViolation(
                 "Borç ödemesi için müşteri seçilmelidir."
             )
         
-        # Ödeme işlemini yap
-        result = await self.payment_repo.process_payment_atomic(
+        # Gün, adisyon ve tutar kontrolleri + ödeme: tek DB çağrısı
+        result = await self.payment_repo.process_payment_checked(
             invoice_id=invoice_id,
             payment_method=payment_method,
             amount=amount,
@@ -131,6 +143,7 @@ class PaymentService:
             customer_id=customer_id,
             description=description
         )
+        self._raise_for_payment_status(invoice_id, result)
         
         return PaymentResponse(
             success=True,
@@ -22,10 +22,25 @@ from app.repositories.customer_repository import CustomerRepository
 from app.models.domain import (
     DailySalesReportResponse,
     ProductSalesReportResponse,
-    FinanceTransactionResponse
+    FinanceTransactionResponse,
+    FinanceTransactionPageResponse,
+    CategorySalesReportResponse
 )
-from app.core.exceptions import PermissionDenied, ResourceNotFound
+from app.core.exceptions import PermissionDenied, ResourceNotFound, ValidationError
 from app.core.security import check_permission
+from app.core.pagination import encode_cursor, decode_cursor
+from app.repositories.fanout import run_in_shared_snapshot
+from app.cache.report_cache import (
+    is_closed_range,
+    is_closed_day,
+    report_cache_key,
+    get_cached_report,
+    cache_report
+)
+
+# Gün gün aralık ve nakit akış raporlarında izin verilen en uzun aralık (gün);
+# bir yıl (artık yıl dahil). Daha uzun dönemler için period-summary kullanılır.
+MAX_RANGE_DAYS = 366
 
 
 class ReportService:
@@ -147,10 +162,16 @@ class ReportService:
             target_day_id = day['id']
             target_date = day['day_date']
         
+        # Kapanmış günün raporu değişmez: ilk hesaplamadan sonra önbellekten
+        key = report_cache_key('daily_sales', target_day_id)
+        cached = await get_cached_report(key)
+        if cached is not None:
+            return cached
+        
         # Özet bilgileri getir
         summary = await self.payment_repo.get_daily_summary(target_day_id)
         
-        return DailySalesReportResponse(
+        report = DailySalesReportResponse(
             day_date=target_date,
             total_sales=summary['total_sales'],
             cash_payments=summary['cash_total'],
@@ -160,6 +181,58 @@ class ReportService:
             invoice_count=summary.get('invoice_count', 0),
             transaction_count=summary['transaction_count']
         )
+        if is_closed_day(day):
+            cache_report(key, report, day_ids=[target_day_id])
+        return report
+    
+    async def get_daily_sales_range(
+        self,
+        user_role: str,
+        start_date: date,
+        end_date: date
+    ) -> List[DailySalesReportResponse]:
+        """
+        Tarih aralığındaki her gün için satış raporu (tek sorgu).
+        
+        Kullanıcıya anlatımı:
+            "Seçtiğin aralıktaki her günün satışlarını tek listede getiriyorum.
+            O gün dükkan açılmadıysa satırı sıfır görünür."
+        
+        Args:
+            user_role: Kullanıcı rolü
+            start_date: Başlangıç tarihi (dahil)
+            end_date: Bitiş tarihi (dahil)
+            
+        Returns:
+            Aralıktaki her gün için bir DailySalesReportResponse (tarih sırasıyla)
+        
+        Raises:
+            ValidationError: Aralık MAX_RANGE_DAYS'ten (366 gün) uzunsa
+        """
+        # Yetki kontrolü
+        await self._validate_report_access(user_role)
+        
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            raise ValidationError(f"Gün gün rapor en fazla {MAX_RANGE_DAYS} gün olabilir")
+        
+        rows = await self.payment_repo.get_daily_summaries(start_date, end_date)
+        
+        return [
+            DailySalesReportResponse(
+                day_date=r['day_date'],
+                total_sales=r['total_sales'],
+                cash_payments=r['cash_total'],
+                credit_card_payments=r['credit_card_total'],
+                debt_created=r['debt_created'],
+                debt_paid=r['debt_paid'],
+                invoice_count=r['invoice_count'],
+                transaction_count=r['transaction_count']
+            )
+            for r in rows
+        ]
     
     async def get_detailed_daily_report(
         self,
@@ -183,20 +256,23 @@ class ReportService:
         
         # Günü bul
         day = await self._get_day_or_current(day_id)
-        
-        # Tüm verileri topla
-        payments = await self.payment_repo.get_daily_payments(day['id'])
-        
-        # Finans transaction'ları
-        transactions = await self.payment_repo.get_finance_transactions(day_id=day['id'])
-        
-        # Borç özeti
-        debt_summary = await self.customer_repo.get_debt_summary(day_id=day['id'])
-        
+        target_day_id = day['id']
+        
+        # Bağımsız sorgular ayrı bağlantılarda, aynı anlık görüntüde paralel çalışır
+        tasks = [
+            lambda c: PaymentRepository(c).get_daily_payments(target_day_id),
+            lambda c: PaymentRepository(c).get_finance_transactions(day_id=target_day_id),
+            lambda c: CustomerRepository(c).get_debt_summary(day_id=target_day_id),
+            lambda c: PaymentRepository(c).get_daily_summary(target_day_id),
+        ]
         # Açık adisyonlar varsa (gün açıksa)
-        open_invoices = []
         if day['is_open']:
-            open_invoices = await self.invoice_repo.get_open_invoices()
+            tasks.append(lambda c: InvoiceRepository(c).get_open_invoices())
+        
+        payments, transactions, debt_summary, summary, *rest = await run_in_shared_snapshot(
+            self.payment_repo.conn, *tasks
+        )
+        open_invoices = rest[0] if rest else []
         
         return {
             "day_info": {
@@ -210,7 +286,7 @@ class ReportService:
             "payments": [dict(p) for p in payments],
             "open_invoices": open_invoices,
             "debt_summary": debt_summary,
-            "summary": await self.payment_repo.get_daily_summary(day['id'])
+            "summary": summary
         }
     
     # ==================== ÜRÜN RAPORLARI ====================
@@ -243,58 +319,70 @@ class ReportService:
         if start_date > end_date:
             start_date, end_date = end_date, start_date
         
-        # Maksimum 1 yıllık rapor
-        if (end_date - start_date) > timedelta(days=365):
-            end_date = start_date + timedelta(days=365)
-        
-        # Raporu getir (DB'de view veya prosedür olacak)
-        # Şimdilik mock veri dönüyoruz, gerçekte DB'den gelecek
-        # TODO: DB'den gerçek veriyi çek
+        # Gün × ürün özetinden okunur; maliyet aralık uzunluğuyla değil
+        # ürün × gün sayısıyla büyür, bu yüzden aralık sınırı yok
+        rows = await self.invoice_repo.get_product_sales(
+            start_date=start_date,
+            end_date=end_date,
+            category_id=category_id
+        )
         
-        # Mock veri
-        return [
-            ProductSalesReportResponse(
-                product_id=1,
-                product_name="Türk Kahvesi",
-                category_name="İçecek",
-                quantity=Decimal('45'),
-                total_amount=Decimal('1350'),
-                day_date=date.today()
-            ),
-            ProductSalesReportResponse(
-                product_id=2,
-                product_name="Limonata",
-                category_name="İçecek",
-                quantity=Decimal('30'),
-                total_amount=Decimal('900'),
-                day_date=date.today()
-            )
-        ]
+        return [ProductSalesReportResponse(**r) for r in rows]
     
     async def get_category_sales_report(
         self,
         user_role: str,
         start_date: date,
-        end_date: date
-    ) -> List[Dict[str, Any]]:
+        end_date: date,
+        top_n: int = 5
+    ) -> List[CategorySalesReportResponse]:
         """
         Kategori bazlı satış raporu.
         
+        Kullanıcıya anlatımı:
+            "Kategori bazlı satış raporunu getiriyorum:
+            - Her kategorinin toplam satışı ve kaç farklı ürün satıldığı
+            - Her kategoride en çok satan ilk N ürün"
+        
         Returns:
             [
                 {
                     "category_name": "İçecek",
                     "total_quantity": 75,
                     "total_amount": 2250,
-                    "product_count": 2
+                    "product_count": 2,
+                    "top_products": [{"product_name": "Türk Kahvesi", ...}]
                 }
             ]
+        
+        Not:
+            - Gün × ürün özetinden tek sorguda hesaplanır
+            - Aralık tamamen kapanmış günlerdense sonuç önbellekte tutulur
         """
         # Yetki kontrolü
         await self._validate_report_access(user_role)
         
-        # TODO: DB'den gerçek veriyi çek
-        return []
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
+        current_day = await self.day_repo.get_current_day()
+        cacheable = is_closed_range(end_date, current_day)
+        key = report_cache_key('category_sales', start_date, end_date, top_n)
+        if cacheable:
+            cached = await get_cached_report(key)
+            if cached is not None:
+                return cached
+        
+        rows = await self.invoice_repo.get_category_sales(
+            start_date=start_date,
+            end_date=end_date,
+            top_n=top_n
+        )
+        report = [CategorySalesReportResponse(**r) for r in rows]
+        
+        if cacheable:
+            cache_report(key, report)
+        return report
     
     # ==================== FİNANS RAPORLARI ====================
     
@@ -305,10 +393,10 @@ class ReportService:
         end_date: Optional[date] = None,
         transaction_type: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[FinanceTransactionResponse]:
+        cursor: Optional[str] = None
+    ) -> FinanceTransactionPageResponse:
         """
-        Finans hareketlerini getirir.
+        Finans hareketlerini sayfa sayfa getirir.
         
         Kullanıcıya anlatımı:
             "Tüm finans hareketlerini getiriyorum:
@@ -316,6 +404,10 @@ class ReportService:
             - Ödemeler
             - Borçlar
             - Giderler"
+        
+        Not:
+            - Sayfalama (transaction_date, id) üzerinden DB'de yapılır;
+              bir sonraki sayfa için `next_cursor` geri gönderilir
         """
         # Yetki kontrolü
         await self._validate_report_access(user_role)
@@ -325,18 +417,30 @@ class ReportService:
             end_date = date.today()
             start_date = end_date - timedelta(days=30)
         
-        # Transaction'ları getir
-        transactions = await self.payment_repo.get_finance_transactions(
-            day_id=None,
+        after_date, after_id = decode_cursor(cursor)
+        
+        # Bir fazla satır iste: sonraki sayfa var mı?
+        rows = await self.payment_repo.get_finance_transactions_page(
             start_date=start_date,
             end_date=end_date,
-            transaction_type=transaction_type
+            transaction_type=transaction_type,
+            after_date=after_date,
+            after_id=after_id,
+            limit=limit + 1
         )
         
-        # Sayfalama
-        paginated = transactions[offset:offset + limit]
-        
-        return [FinanceTransactionResponse(**t) for t in paginated]
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last['transaction_date'], last['id'])
+        
+        return FinanceTransactionPageResponse(
+            items=[FinanceTransactionResponse(**t) for t in rows],
+            next_cursor=next_cursor,
+            has_more=has_more
+        )
     
     async def get_cash_flow_report(
         self,
@@ -354,21 +458,53 @@ class ReportService:
                 "cash_in": Decimal,      # Giren nakit
                 "cash_out": Decimal,      # Çıkan nakit (iade, gider)
                 "net_cash_flow": Decimal, # Net nakit akışı
-                "daily_breakdown": [...]   # Günlük detay
+                "daily_breakdown": [       # Günlük detay (açılmamış günler sıfır)
+                    {"day_date", "cash_in", "cash_out", "net_cash_flow", "running_balance"}
+                ]
             }
+        
+        Raises:
+            ValidationError: Aralık MAX_RANGE_DAYS'ten (366 gün) uzunsa
+        
+        Not:
+            - daily_sales_rollup özetinden tek sorguda hesaplanır
+            - Kapanmış günlerden oluşan aralıklar önbellekten döner
         """
         # Yetki kontrolü
         await self._validate_report_access(user_role)
         
-        # TODO: DB'den gerçek veriyi çek
-        return {
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            raise ValidationError(f"Nakit akış raporu en fazla {MAX_RANGE_DAYS} gün olabilir")
+        
+        # Sadece kapanmış günlerden oluşan aralık önbellekten döner
+        current_day = await self.day_repo.get_current_day()
+        cacheable = is_closed_range(end_date, current_day)
+        key = report_cache_key('cash_flow', start_date, end_date)
+        if cacheable:
+            cached = await get_cached_report(key)
+            if cached is not None:
+                return cached
+        
+        # Günlük kırılım ve yürüyen bakiye tek sorguda
+        daily = await self.payment_repo.get_cash_flow(start_date, end_date)
+        
+        cash_in = sum((d['cash_in'] for d in daily), Decimal('0'))
+        cash_out = sum((d['cash_out'] for d in daily), Decimal('0'))
+        report = {
             "period_start": start_date,
             "period_end": end_date,
-            "cash_in": Decimal('5000'),
-            "cash_out": Decimal('500'),
-            "net_cash_flow": Decimal('4500'),
-            "daily_breakdown": []
+            "cash_in": cash_in,
+            "cash_out": cash_out,
+            "net_cash_flow": cash_in - cash_out,
+            "daily_breakdown": daily
         }
+        
+        if cacheable:
+            cache_report(key, report)
+        return report
     
     # ==================== KARŞILAŞTIRMA RAPORLARI ====================
     
@@ -395,18 +531,25 @@ class ReportService:
         # Yetki kontrolü
         await self._validate_report_access(user_role)
         
-        # İki günü de getir
-        day1 = await self.day_repo.get_day_by_id(day_id_1)
-        day2 = await self.day_repo.get_day_by_id(day_id_2)
+        # İki gün de kapalıyken hesaplanmış karşılaştırma önbellekte durur
+        key = report_cache_key('compare_days', day_id_1, day_id_2)
+        cached = await get_cached_report(key)
+        if cached is not None:
+            return cached
+        
+        # Dört sorgu ortak anlık görüntüde paralel
+        day1, day2, summary1, summary2 = await run_in_shared_snapshot(
+            self.payment_repo.conn,
+            lambda c: DayRepository(c).get_day_by_id(day_id_1),
+            lambda c: DayRepository(c).get_day_by_id(day_id_2),
+            lambda c: PaymentRepository(c).get_daily_summary(day_id_1),
+            lambda c: PaymentRepository(c).get_daily_summary(day_id_2)
+        )
         
         if not day1 or not day2:
             raise ResourceNotFound("Gün", "Günlerden biri bulunamadı")
         
-        # Özetleri getir
-        summary1 = await self.payment_repo.get_daily_summary(day_id_1)
-        summary2 = await self.payment_repo.get_daily_summary(day_id_2)
-        
-        return {
+        report = {
             "day1": {
                 "date": day1['day_date'],
                 "summary": summary1
@@ -421,6 +564,9 @@ class ReportService:
                 "invoice_count_diff": summary1.get('invoice_count', 0) - summary2.get('invoice_count', 0)
             }
         }
+        if is_closed_day(day1) and is_closed_day(day2):
+            cache_report(key, report, day_ids=[day_id_1, day_id_2])
+        return report
     
     # ==================== ÖZET RAPORLAR ====================
     
@@ -428,7 +574,8 @@ class ReportService:
         self,
         user_role: str,
         start_date: date,
-        end_date: date
+        end_date: date,
+        top_n: int = 5
     ) -> Dict[str, Any]:
         """
         Dönem özet raporu.
@@ -442,22 +589,50 @@ class ReportService:
                 "total_debt_created": Decimal,
                 "total_debt_paid": Decimal,
                 "average_daily_sales": Decimal,
-                "busiest_day": {...},
+                "busiest_day": {"date": date, "total_sales": Decimal},
                 "top_products": [...]
             }
+        
+        Not:
+            - Günlük özetlerden tek sorguda hesaplanır (ham hareket taranmaz)
+            - Kapanmış dönemler önbellekten döner
         """
         # Yetki kontrolü
         await self._validate_report_access(user_role)
         
-        # TODO: DB'den gerçek veriyi çek
-        return {
-            "period": f"{start_date} - {end_date}",
-            "total_sales": Decimal('15000'),
-            "total_cash": Decimal('10000'),
-            "total_credit": Decimal('5000'),
-            "total_debt_created": Decimal('2000'),
-            "total_debt_paid": Decimal('1500'),
-            "average_daily_sales": Decimal('500'),
-            "busiest_day": {},
-            "top_products": []
-        }
\ No newline at end of file
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
+        current_day = await self.day_repo.get_current_day()
+        cacheable = is_closed_range(end_date, current_day)
+        key = report_cache_key('period_summary', start_date, end_date, top_n)
+        if cacheable:
+            cached = await get_cached_report(key)
+            if cached is not None:
+                return cached
+        
+        summary = await self.payment_repo.get_period_summary(start_date, end_date, top_n)
+        
+        busiest_day = {}
+        if summary['busiest_day_date'] is not None:
+            busiest_day = {
+                "date": summary['busiest_day_date'],
+                "total_sales": summary['busiest_day_sales']
+            }
+        
+        report = {
+            "period": f"{start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}",
+            "total_sales": summary['total_sales'],
+            "total_cash": summary['total_cash'],
+            "total_credit": summary['total_credit'],
+            "total_debt_created": summary['total_debt_created'],
+            "total_debt_paid": summary['total_debt_paid'],
+            "open_day_count": summary['open_day_count'],
+            "average_daily_sales": summary['average_daily_sales'],
+            "busiest_day": busiest_day,
+            "top_products": summary['top_products']
+        }
+        
+        if cacheable:
+            cache_report(key, report)
+        return report
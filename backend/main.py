@@ -4,11 +4,36 @@ MyCafe - Ana Uygulama Dosyası
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.api.router import api_router
+from app.api.deps import get_db_pool, close_db_pool
 from app.core.config import settings
 from app.core.exceptions import add_exception_handlers
+from app.core.lifecycle import (
+    register_warmup_step,
+    register_cache_status,
+    run_warmup,
+    wait_for_drain,
+    InFlightMiddleware
+)
+from app.db.pool import warm_pool, pooled_connection
+from app.db.listener import notification_listener
+from app.cache.day_state import register_day_state_listener, day_state_cache
+from app.cache.user_cache import register_user_cache_listener
+from app.cache.report_cache import register_report_cache_listener
+from app.core.events import register_event_feed, event_broker
+from app.cache.table_state import (
+    register_table_state_listener,
+    reconcile_table_state,
+    run_table_state_reconciler,
+    table_state
+)
+from app.cache.catalog import register_catalog_listener, catalog_cache
+from app.repositories.day_repository import DayRepository
+from app.repositories.catalog_repository import CatalogRepository
 
 # Logging ayarları
 logging.basicConfig(
@@ -16,12 +41,88 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+
+async def _warm_day_state(pool):
+    """Açık günü önbelleğe yükler"""
+    async with pooled_connection(pool) as conn:
+        await DayRepository(conn).get_current_day()
+
+
+async def _warm_catalog(pool):
+    """Ürün kataloğunu önbelleğe yükler"""
+    async with pooled_connection(pool) as conn:
+        await CatalogRepository(conn).fetch_catalog()
+
+
+# Isınma adımları (sırayla çalışır)
+register_warmup_step("pool", warm_pool)
+register_warmup_step("day_state", _warm_day_state)
+register_warmup_step("table_state", reconcile_table_state)
+register_warmup_step("catalog", _warm_catalog)
+
+# /health/ready'de raporlanan önbellekler
+register_cache_status("day_state", lambda: day_state_cache.is_warm)
+register_cache_status("table_state", lambda: table_state.is_warm)
+register_cache_status("catalog", lambda: catalog_cache.is_warm)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Uygulama yaşam döngüsü.
+    
+    Açılış:
+        - Bağlantı havuzu oluşturulur ve min_size'a kadar ısıtılır
+        - Sıcak prosedürler her bağlantıda önceden hazırlanır
+        - Önbellek bildirimleri dinlenmeye başlar
+        - Gün durumu, masa indeksi, ürün kataloğu vb. önbellekler yüklenir
+        - Masa indeksi uzlaştırması arka planda başlar
+        - Hepsi bitince /api/v1/health ve /api/v1/health/ready "hazır" der
+    
+    Kapanış:
+        - Canlı olay akışları (SSE) kapatılır
+        - Devam eden isteklerin bitmesi beklenir
+        - Dinleyici ve havuz kapatılır
+    """
+    logging.info("MyCafe API başlatılıyor...")
+    pool = await get_db_pool()
+    logging.info("Veritabanı bağlantı havuzu oluşturuldu.")
+    
+    # Önbellek geçersiz kılma bildirimlerini dinle
+    register_day_state_listener(notification_listener)
+    register_user_cache_listener(notification_listener)
+    register_report_cache_listener(notification_listener)
+    register_event_feed(notification_listener)
+    register_table_state_listener(notification_listener)
+    register_catalog_listener(notification_listener)
+    await notification_listener.start()
+    
+    await run_warmup(pool)
+    logging.info("Isınma tamamlandı, istek almaya hazır.")
+    
+    # Masa indeksini periyodik olarak DB ile karşılaştır
+    reconciler = asyncio.create_task(
+        run_table_state_reconciler(pool, settings.TABLE_STATE_RECONCILE_INTERVAL)
+    )
+    
+    yield
+    
+    # Açık SSE akışlarını bitir; yoksa drain onları beklerdi
+    event_broker.close()
+    await wait_for_drain(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    reconciler.cancel()
+    await notification_listener.stop()
+    await close_db_pool()
+    logging.info("Veritabanı bağlantı havuzu kapatıldı.")
+
+
 # FastAPI uygulamasını oluştur
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="MyCafe - Tek şubeli kafe/restoran işletme yazılımı",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS ayarları (UI'dan erişim için)
@@ -33,6 +134,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Devam eden istekleri sayar (kapanışta drain için); akış yanıtlarının sonunu da bekler
+app.add_middleware(InFlightMiddleware)
+
+
 # Exception handler'ları ekle
 add_exception_handlers(app)
 
@@ -47,21 +152,3 @@ async def root():
         "docs": "/docs",
         "health": "/api/v1/health"
     }
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Uygulama başlarken yapılacak işlemler"""
-    from app.api.deps import get_db_pool
-    logging.info("MyCafe API başlatılıyor...")
-    await get_db_pool()
-    logging.info("Veritabanı bağlantı havuzu oluşturuldu.")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Uygulama kapanırken yapılacak işlemler"""
-    from app.api.deps import _db_pool
-    if _db_pool:
-        await _db_pool.close()
-        logging.info("Veritabanı bağlantı havuzu kapatıldı.")
\ No newline at end of file